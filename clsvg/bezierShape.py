@@ -5,16 +5,20 @@ try:
 except ImportError:
     import xml.etree.ElementTree as ET
 
-import copy
-
+import io
 import re
 import math
+import bisect
+import weakref
 import numpy as np
 import numbers
-from functools import reduce
+from xml.sax.saxutils import quoteattr
 
 _re_num = re.compile(r'[+-]?\d+(\.\d*)?')
-_re_args = re.compile(r'[a-zA-Z] *([+-]?\d*(\.\d*)?[ ,]?)+')
+_re_number = re.compile(r'[+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?')
+_re_pathToken = re.compile(r'[\s,]*(?:([MmZzLlHhVvCcSsQqTtAa])|([+-]?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?))')
+_re_pathFlag = re.compile(r'[\s,]*()([01])')
+_re_numberTrim = re.compile(r'\.0(?= )|(?<![\d.])0(?=\.(?!0 ))')
 
 SEMICIRCLE = (4/3)*math.tan(math.pi/8)
 
@@ -32,6 +36,8 @@ def strToNum(str):
         raise ValueError("Str Not number!")
 
 class Point(object):
+    __slots__ = ('_x', '_y')
+
     def __init__(self, x=0, y=0) -> None:
         if isinstance(x, str):
             x = strToNum(x)
@@ -44,25 +50,25 @@ class Point(object):
             raise ValueError('Point Value must be numeric: {} and {}'.format(type(x), type(y)))
 
     def __add__(self, pos):
-        return Point(self._x + pos.x, self._y + pos.y)
+        return _point(self._x + pos._x, self._y + pos._y)
 
     def __sub__(self, pos):
-        return Point(self._x - pos.x, self._y - pos.y)
+        return _point(self._x - pos._x, self._y - pos._y)
 
     def __mul__(self, value):
-        if isinstance(value, numbers.Real):
-            return Point(self._x*value, self.y*value)
+        if isinstance(value, _NUMBER_TYPES) or isinstance(value, numbers.Real):
+            return _point(self._x*value, self._y*value)
         else:
             raise ValueError('Value must be numeric!')
 
     def __truediv__(self, value):
-        if isinstance(value, numbers.Real):
-            return Point(self._x/value, self.y/value)
+        if isinstance(value, _NUMBER_TYPES) or isinstance(value, numbers.Real):
+            return _point(self._x/value, self._y/value)
         else:
             raise ValueError('Value must be numeric!')
 
     def __neg__(self):
-        return Point(-self.x, -self.y)
+        return _point(-self._x, -self._y)
     
     def __eq__(self, other):
         return isinstance(other, Point) and self.x == other.x and self.y == other.y
@@ -108,9 +114,9 @@ class Point(object):
         return self / math.sqrt(math.pow(self._x, 2) + math.pow(self._y, 2)) * len
 
     def perpendicular(self, pos=None):
-        if not pos : pos = Point()
-        v = self - pos
-        return Point(v.y, -v.x)
+        if pos is None:
+            return _point(self._y, -self._x)
+        return _point(self._y - pos._y, pos._x - self._x)
 
     def radian(self, pos=None, negative=True):
         if not pos : pos = Point()
@@ -124,11 +130,13 @@ class Point(object):
             return math.acos(v.x)
 
     def rotate(self, radian, center=None):
-        if not center : center = Point()
-        v = self - center
         cos = math.cos(radian)
         sin = math.sin(radian)
-        return Point(v.x*cos - v.y*sin, v.x*sin + v.y*cos) + center
+        if center is None:
+            return _point(self._x*cos - self._y*sin, self._x*sin + self._y*cos)
+        x = self._x - center._x
+        y = self._y - center._y
+        return _point(x*cos - y*sin + center._x, x*sin + y*cos + center._y)
 
     def mirror(self, p1, p2):
         normal = (p1 - p2).perpendicular()
@@ -157,7 +165,18 @@ class Point(object):
     def dotProduct(self, pos):
         return self.x*pos.x + self.y*pos.y
 
+_NUMBER_TYPES = (int, float)
+_newPoint = object.__new__
+
+def _point(x, y):
+    p = _newPoint(Point)
+    p._x = x
+    p._y = y
+    return p
+
 class Rect(object):
+    __slots__ = ('_lb', '_rt')
+
     def __init__(self, lbPos:Point=Point(), rtPos:Point=Point()):
         self._lb = lbPos
         self._rt = rtPos
@@ -230,6 +249,82 @@ class Rect(object):
     def area(self):
         return self.width * self.height
     
+class Transform(object):
+    __slots__ = ('_matrix',)
+
+    def __init__(self, matrix=None):
+        if matrix is None:
+            matrix = [[1, 0, 0], [0, 1, 0]]
+        self._matrix = np.array(matrix, dtype=np.float64).reshape(2, 3)
+
+    @staticmethod
+    def translation(move:Point):
+        return Transform([[1, 0, move.x], [0, 1, move.y]])
+
+    @staticmethod
+    def rotation(radian, center:Point=None):
+        cos = math.cos(radian)
+        sin = math.sin(radian)
+        transform = Transform([[cos, -sin, 0], [sin, cos, 0]])
+        return transform._around(center)
+
+    @staticmethod
+    def scaling(scale, center:Point=None):
+        if isinstance(scale, Point):
+            transform = Transform([[scale.x, 0, 0], [0, scale.y, 0]])
+        else:
+            transform = Transform([[scale, 0, 0], [0, scale, 0]])
+        return transform._around(center)
+
+    @staticmethod
+    def mirroring(p1:Point, p2:Point):
+        v = (p2 - p1).normalization()
+        if v is None:
+            raise ValueError('Mirror axis requires two different points!')
+        x, y = v.x, v.y
+        transform = Transform([[x*x - y*y, 2*x*y, 0], [2*x*y, y*y - x*x, 0]])
+        return transform._around(p1)
+
+    def _around(self, center):
+        if center is not None and not center.isOrigin():
+            c = np.array([center.x, center.y])
+            self._matrix[:, 2] = c - self._matrix[:, :2] @ c
+        return self
+
+    @property
+    def matrix(self):
+        return self._matrix.copy()
+
+    def compose(self, transform):
+        matrix = transform._matrix[:, :2] @ self._matrix
+        matrix[:, 2] += transform._matrix[:, 2]
+        return Transform(matrix)
+
+    def inverse(self):
+        linear = np.linalg.inv(self._matrix[:, :2])
+        return Transform(np.concatenate([linear, -linear @ self._matrix[:, 2:]], axis=1))
+
+    def determinant(self):
+        return float(np.linalg.det(self._matrix[:, :2]))
+
+    def isIdentity(self):
+        return bool(np.all(self._matrix == [[1, 0, 0], [0, 1, 0]]))
+
+    def apply(self, points):
+        points = np.asarray(points, dtype=np.float64)
+        return points @ self._matrix[:, :2].T + self._matrix[:, 2]
+
+    def applyVectors(self, vectors):
+        return np.asarray(vectors, dtype=np.float64) @ self._matrix[:, :2].T
+
+    def applyPoint(self, pos:Point):
+        (a, b, e), (c, d, f) = self._matrix.tolist()
+        return _point(a*pos.x + b*pos.y + e, c*pos.x + d*pos.y + f)
+
+    def toSvgValue(self):
+        (a, c, e), (b, d, f) = self._matrix.tolist()
+        return 'matrix({})'.format(' '.join(repr(v) for v in (a, b, c, d, e, f)))
+
 def circleCenter(p1, p2, p3):
     midpoint11 = (p2 - p1) / 2 + p1
     midpoint12 = (p2 - p1).perpendicular() + midpoint11
@@ -255,109 +350,382 @@ def intersection(ps1, pe1, ps2, pe2, offset=0.002):
     else:
         return abs(A1*ps2.x + B1*ps2.y + C1) / math.sqrt(A1**2 + B1**2)
 
-def intersectBezier3Bezier3(a1, a2, a3, a4, b1, b2, b3, b4, offset = .001):
-    # Code from http://www.kevlindev.com/geometry/2D/intersections/intersect_bezier3_bezier3.svg
-    
-    a = a1 * -1
-    b = a2 * 3
-    c = a3 * - 3
-    d = a + b + c + a4
-
-    c13 = Point(d.x, d.y)
-    a = a1 * 3
-    b = a2 * -6
-    c = a3 * 3
-    d = a + b + c
-
-    c12 = Point(d.x, d.y)
-    a = a1 * -3
-    b = a2 * 3
-    c = a + b
-
-    c11 = Point(c.x, c.y)
-    c10 = Point(a1.x, a1.y)
-
-    a = b1 * -1
-    b = b2 * 3
-    c = b3 * - 3
-    d = a + b + c + b4
-    c23 = Point(d.x, d.y)
-    a = b1 * 3
-    b = b2 * - 6
-    c = b3 * 3
-    d = a + b + c
-    c22 = Point(d.x, d.y)
-    a = b1 * - 3
-    b = b2 * 3
-    c = a + b
-    c21 = Point(c.x, c.y)
-    c20 = Point(b1.x, b1.y)
-    c10x2 = c10.x * c10.x
-    c10x3 = c10.x * c10.x * c10.x
-    c10y2 = c10.y * c10.y
-    c10y3 = c10.y * c10.y * c10.y
-    c11x2 = c11.x * c11.x
-    c11x3 = c11.x * c11.x * c11.x
-    c11y2 = c11.y * c11.y
-    c11y3 = c11.y * c11.y * c11.y
-    c12x2 = c12.x * c12.x
-    c12x3 = c12.x * c12.x * c12.x
-    c12y2 = c12.y * c12.y
-    c12y3 = c12.y * c12.y * c12.y
-    c13x2 = c13.x * c13.x
-    c13x3 = c13.x * c13.x * c13.x
-    c13y2 = c13.y * c13.y
-    c13y3 = c13.y * c13.y * c13.y
-    c20x2 = c20.x * c20.x
-    c20x3 = c20.x * c20.x * c20.x
-    c20y2 = c20.y * c20.y
-    c20y3 = c20.y * c20.y * c20.y
-    c21x2 = c21.x * c21.x
-    c21x3 = c21.x * c21.x * c21.x
-    c21y2 = c21.y * c21.y
-    c22x2 = c22.x * c22.x
-    c22x3 = c22.x * c22.x * c22.x
-    c22y2 = c22.y * c22.y
-    c23x2 = c23.x * c23.x
-    c23x3 = c23.x * c23.x * c23.x
-    c23y2 = c23.y * c23.y
-    c23y3 = c23.y * c23.y * c23.y
-
-    poly = [ - c13x3 * c23y3 + c13y3 * c23x3 - 3 * c13.x * c13y2 * c23x2 * c23.y + 3 * c13x2 * c13.y * c23.x * c23y2, - 6 * c13.x * c22.x * c13y2 * c23.x * c23.y + 6 * c13x2 * c13.y * c22.y * c23.x * c23.y + 3 * c22.x * c13y3 * c23x2 - 3 * c13x3 * c22.y * c23y2 - 3 * c13.x * c13y2 * c22.y * c23x2 + 3 * c13x2 * c22.x * c13.y * c23y2, - 6 * c21.x * c13.x * c13y2 * c23.x * c23.y - 6 * c13.x * c22.x * c13y2 * c22.y * c23.x + 6 * c13x2 * c22.x * c13.y * c22.y * c23.y + 3 * c21.x * c13y3 * c23x2 + 3 * c22x2 * c13y3 * c23.x + 3 * c21.x * c13x2 * c13.y * c23y2 - 3 * c13.x * c21.y * c13y2 * c23x2 - 3 * c13.x * c22x2 * c13y2 * c23.y + c13x2 * c13.y * c23.x * (6 * c21.y * c23.y + 3 * c22y2) + c13x3 * ( - c21.y * c23y2 - 2 * c22y2 * c23.y - c23.y * (2 * c21.y * c23.y + c22y2)), c11.x * c12.y * c13.x * c13.y * c23.x * c23.y - c11.y * c12.x * c13.x * c13.y * c23.x * c23.y + 6 * c21.x * c22.x * c13y3 * c23.x + 3 * c11.x * c12.x * c13.x * c13.y * c23y2 + 6 * c10.x * c13.x * c13y2 * c23.x * c23.y - 3 * c11.x * c12.x * c13y2 * c23.x * c23.y - 3 * c11.y * c12.y * c13.x * c13.y * c23x2 - 6 * c10.y * c13x2 * c13.y * c23.x * c23.y - 6 * c20.x * c13.x * c13y2 * c23.x * c23.y + 3 * c11.y * c12.y * c13x2 * c23.x * c23.y - 2 * c12.x * c12y2 * c13.x * c23.x * c23.y - 6 * c21.x * c13.x * c22.x * c13y2 * c23.y - 6 * c21.x * c13.x * c13y2 * c22.y * c23.x - 6 * c13.x * c21.y * c22.x * c13y2 * c23.x + 6 * c21.x * c13x2 * c13.y * c22.y * c23.y + 2 * c12x2 * c12.y * c13.y * c23.x * c23.y + c22x3 * c13y3 - 3 * c10.x * c13y3 * c23x2 + 3 * c10.y * c13x3 * c23y2 + 3 * c20.x * c13y3 * c23x2 + c12y3 * c13.x * c23x2 - c12x3 * c13.y * c23y2 - 3 * c10.x * c13x2 * c13.y * c23y2 + 3 * c10.y * c13.x * c13y2 * c23x2 - 2 * c11.x * c12.y * c13x2 * c23y2 + c11.x * c12.y * c13y2 * c23x2 - c11.y * c12.x * c13x2 * c23y2 + 2 * c11.y * c12.x * c13y2 * c23x2 + 3 * c20.x * c13x2 * c13.y * c23y2 - c12.x * c12y2 * c13.y * c23x2 - 3 * c20.y * c13.x * c13y2 * c23x2 + c12x2 * c12.y * c13.x * c23y2 - 3 * c13.x * c22x2 * c13y2 * c22.y + c13x2 * c13.y * c23.x * (6 * c20.y * c23.y + 6 * c21.y * c22.y) + c13x2 * c22.x * c13.y * (6 * c21.y * c23.y + 3 * c22y2) + c13x3 * ( - 2 * c21.y * c22.y * c23.y - c20.y * c23y2 - c22.y * (2 * c21.y * c23.y + c22y2) - c23.y * (2 * c20.y * c23.y + 2 * c21.y * c22.y)), 6 * c11.x * c12.x * c13.x * c13.y * c22.y * c23.y + c11.x * c12.y * c13.x * c22.x * c13.y * c23.y + c11.x * c12.y * c13.x * c13.y * c22.y * c23.x - c11.y * c12.x * c13.x * c22.x * c13.y * c23.y - c11.y * c12.x * c13.x * c13.y * c22.y * c23.x - 6 * c11.y * c12.y * c13.x * c22.x * c13.y * c23.x - 6 * c10.x * c22.x * c13y3 * c23.x + 6 * c20.x * c22.x * c13y3 * c23.x + 6 * c10.y * c13x3 * c22.y * c23.y + 2 * c12y3 * c13.x * c22.x * c23.x - 2 * c12x3 * c13.y * c22.y * c23.y + 6 * c10.x * c13.x * c22.x * c13y2 * c23.y + 6 * c10.x * c13.x * c13y2 * c22.y * c23.x + 6 * c10.y * c13.x * c22.x * c13y2 * c23.x - 3 * c11.x * c12.x * c22.x * c13y2 * c23.y - 3 * c11.x * c12.x * c13y2 * c22.y * c23.x + 2 * c11.x * c12.y * c22.x * c13y2 * c23.x + 4 * c11.y * c12.x * c22.x * c13y2 * c23.x - 6 * c10.x * c13x2 * c13.y * c22.y * c23.y - 6 * c10.y * c13x2 * c22.x * c13.y * c23.y - 6 * c10.y * c13x2 * c13.y * c22.y * c23.x - 4 * c11.x * c12.y * c13x2 * c22.y * c23.y - 6 * c20.x * c13.x * c22.x * c13y2 * c23.y - 6 * c20.x * c13.x * c13y2 * c22.y * c23.x - 2 * c11.y * c12.x * c13x2 * c22.y * c23.y + 3 * c11.y * c12.y * c13x2 * c22.x * c23.y + 3 * c11.y * c12.y * c13x2 * c22.y * c23.x - 2 * c12.x * c12y2 * c13.x * c22.x * c23.y - 2 * c12.x * c12y2 * c13.x * c22.y * c23.x - 2 * c12.x * c12y2 * c22.x * c13.y * c23.x - 6 * c20.y * c13.x * c22.x * c13y2 * c23.x - 6 * c21.x * c13.x * c21.y * c13y2 * c23.x - 6 * c21.x * c13.x * c22.x * c13y2 * c22.y + 6 * c20.x * c13x2 * c13.y * c22.y * c23.y + 2 * c12x2 * c12.y * c13.x * c22.y * c23.y + 2 * c12x2 * c12.y * c22.x * c13.y * c23.y + 2 * c12x2 * c12.y * c13.y * c22.y * c23.x + 3 * c21.x * c22x2 * c13y3 + 3 * c21x2 * c13y3 * c23.x - 3 * c13.x * c21.y * c22x2 * c13y2 - 3 * c21x2 * c13.x * c13y2 * c23.y + c13x2 * c22.x * c13.y * (6 * c20.y * c23.y + 6 * c21.y * c22.y) + c13x2 * c13.y * c23.x * (6 * c20.y * c22.y + 3 * c21y2) + c21.x * c13x2 * c13.y * (6 * c21.y * c23.y + 3 * c22y2) + c13x3 * ( - 2 * c20.y * c22.y * c23.y - c23.y * (2 * c20.y * c22.y + c21y2) - c21.y * (2 * c21.y * c23.y + c22y2) - c22.y * (2 * c20.y * c23.y + 2 * c21.y * c22.y)), c11.x * c21.x * c12.y * c13.x * c13.y * c23.y + c11.x * c12.y * c13.x * c21.y * c13.y * c23.x + c11.x * c12.y * c13.x * c22.x * c13.y * c22.y - c11.y * c12.x * c21.x * c13.x * c13.y * c23.y - c11.y * c12.x * c13.x * c21.y * c13.y * c23.x - c11.y * c12.x * c13.x * c22.x * c13.y * c22.y - 6 * c11.y * c21.x * c12.y * c13.x * c13.y * c23.x - 6 * c10.x * c21.x * c13y3 * c23.x + 6 * c20.x * c21.x * c13y3 * c23.x + 2 * c21.x * c12y3 * c13.x * c23.x + 6 * c10.x * c21.x * c13.x * c13y2 * c23.y + 6 * c10.x * c13.x * c21.y * c13y2 * c23.x + 6 * c10.x * c13.x * c22.x * c13y2 * c22.y + 6 * c10.y * c21.x * c13.x * c13y2 * c23.x - 3 * c11.x * c12.x * c21.x * c13y2 * c23.y - 3 * c11.x * c12.x * c21.y * c13y2 * c23.x - 3 * c11.x * c12.x * c22.x * c13y2 * c22.y + 2 * c11.x * c21.x * c12.y * c13y2 * c23.x + 4 * c11.y * c12.x * c21.x * c13y2 * c23.x - 6 * c10.y * c21.x * c13x2 * c13.y * c23.y - 6 * c10.y * c13x2 * c21.y * c13.y * c23.x - 6 * c10.y * c13x2 * c22.x * c13.y * c22.y - 6 * c20.x * c21.x * c13.x * c13y2 * c23.y - 6 * c20.x * c13.x * c21.y * c13y2 * c23.x - 6 * c20.x * c13.x * c22.x * c13y2 * c22.y + 3 * c11.y * c21.x * c12.y * c13x2 * c23.y - 3 * c11.y * c12.y * c13.x * c22x2 * c13.y + 3 * c11.y * c12.y * c13x2 * c21.y * c23.x + 3 * c11.y * c12.y * c13x2 * c22.x * c22.y - 2 * c12.x * c21.x * c12y2 * c13.x * c23.y - 2 * c12.x * c21.x * c12y2 * c13.y * c23.x - 2 * c12.x * c12y2 * c13.x * c21.y * c23.x - 2 * c12.x * c12y2 * c13.x * c22.x * c22.y - 6 * c20.y * c21.x * c13.x * c13y2 * c23.x - 6 * c21.x * c13.x * c21.y * c22.x * c13y2 + 6 * c20.y * c13x2 * c21.y * c13.y * c23.x + 2 * c12x2 * c21.x * c12.y * c13.y * c23.y + 2 * c12x2 * c12.y * c21.y * c13.y * c23.x + 2 * c12x2 * c12.y * c22.x * c13.y * c22.y - 3 * c10.x * c22x2 * c13y3 + 3 * c20.x * c22x2 * c13y3 + 3 * c21x2 * c22.x * c13y3 + c12y3 * c13.x * c22x2 + 3 * c10.y * c13.x * c22x2 * c13y2 + c11.x * c12.y * c22x2 * c13y2 + 2 * c11.y * c12.x * c22x2 * c13y2 - c12.x * c12y2 * c22x2 * c13.y - 3 * c20.y * c13.x * c22x2 * c13y2 - 3 * c21x2 * c13.x * c13y2 * c22.y + c12x2 * c12.y * c13.x * (2 * c21.y * c23.y + c22y2) + c11.x * c12.x * c13.x * c13.y * (6 * c21.y * c23.y + 3 * c22y2) + c21.x * c13x2 * c13.y * (6 * c20.y * c23.y + 6 * c21.y * c22.y) + c12x3 * c13.y * ( - 2 * c21.y * c23.y - c22y2) + c10.y * c13x3 * (6 * c21.y * c23.y + 3 * c22y2) + c11.y * c12.x * c13x2 * ( - 2 * c21.y * c23.y - c22y2) + c11.x * c12.y * c13x2 * ( - 4 * c21.y * c23.y - 2 * c22y2) + c10.x * c13x2 * c13.y * ( - 6 * c21.y * c23.y - 3 * c22y2) + c13x2 * c22.x * c13.y * (6 * c20.y * c22.y + 3 * c21y2) + c20.x * c13x2 * c13.y * (6 * c21.y * c23.y + 3 * c22y2) + c13x3 * ( - 2 * c20.y * c21.y * c23.y - c22.y * (2 * c20.y * c22.y + c21y2) - c20.y * (2 * c21.y * c23.y + c22y2) - c21.y * (2 * c20.y * c23.y + 2 * c21.y * c22.y)), - c10.x * c11.x * c12.y * c13.x * c13.y * c23.y + c10.x * c11.y * c12.x * c13.x * c13.y * c23.y + 6 * c10.x * c11.y * c12.y * c13.x * c13.y * c23.x - 6 * c10.y * c11.x * c12.x * c13.x * c13.y * c23.y - c10.y * c11.x * c12.y * c13.x * c13.y * c23.x + c10.y * c11.y * c12.x * c13.x * c13.y * c23.x + c11.x * c11.y * c12.x * c12.y * c13.x * c23.y - c11.x * c11.y * c12.x * c12.y * c13.y * c23.x + c11.x * c20.x * c12.y * c13.x * c13.y * c23.y + c11.x * c20.y * c12.y * c13.x * c13.y * c23.x + c11.x * c21.x * c12.y * c13.x * c13.y * c22.y + c11.x * c12.y * c13.x * c21.y * c22.x * c13.y - c20.x * c11.y * c12.x * c13.x * c13.y * c23.y - 6 * c20.x * c11.y * c12.y * c13.x * c13.y * c23.x - c11.y * c12.x * c20.y * c13.x * c13.y * c23.x - c11.y * c12.x * c21.x * c13.x * c13.y * c22.y - c11.y * c12.x * c13.x * c21.y * c22.x * c13.y - 6 * c11.y * c21.x * c12.y * c13.x * c22.x * c13.y - 6 * c10.x * c20.x * c13y3 * c23.x - 6 * c10.x * c21.x * c22.x * c13y3 - 2 * c10.x * c12y3 * c13.x * c23.x + 6 * c20.x * c21.x * c22.x * c13y3 + 2 * c20.x * c12y3 * c13.x * c23.x + 2 * c21.x * c12y3 * c13.x * c22.x + 2 * c10.y * c12x3 * c13.y * c23.y - 6 * c10.x * c10.y * c13.x * c13y2 * c23.x + 3 * c10.x * c11.x * c12.x * c13y2 * c23.y - 2 * c10.x * c11.x * c12.y * c13y2 * c23.x - 4 * c10.x * c11.y * c12.x * c13y2 * c23.x + 3 * c10.y * c11.x * c12.x * c13y2 * c23.x + 6 * c10.x * c10.y * c13x2 * c13.y * c23.y + 6 * c10.x * c20.x * c13.x * c13y2 * c23.y - 3 * c10.x * c11.y * c12.y * c13x2 * c23.y + 2 * c10.x * c12.x * c12y2 * c13.x * c23.y + 2 * c10.x * c12.x * c12y2 * c13.y * c23.x + 6 * c10.x * c20.y * c13.x * c13y2 * c23.x + 6 * c10.x * c21.x * c13.x * c13y2 * c22.y + 6 * c10.x * c13.x * c21.y * c22.x * c13y2 + 4 * c10.y * c11.x * c12.y * c13x2 * c23.y + 6 * c10.y * c20.x * c13.x * c13y2 * c23.x + 2 * c10.y * c11.y * c12.x * c13x2 * c23.y - 3 * c10.y * c11.y * c12.y * c13x2 * c23.x + 2 * c10.y * c12.x * c12y2 * c13.x * c23.x + 6 * c10.y * c21.x * c13.x * c22.x * c13y2 - 3 * c11.x * c20.x * c12.x * c13y2 * c23.y + 2 * c11.x * c20.x * c12.y * c13y2 * c23.x + c11.x * c11.y * c12y2 * c13.x * c23.x - 3 * c11.x * c12.x * c20.y * c13y2 * c23.x - 3 * c11.x * c12.x * c21.x * c13y2 * c22.y - 3 * c11.x * c12.x * c21.y * c22.x * c13y2 + 2 * c11.x * c21.x * c12.y * c22.x * c13y2 + 4 * c20.x * c11.y * c12.x * c13y2 * c23.x + 4 * c11.y * c12.x * c21.x * c22.x * c13y2 - 2 * c10.x * c12x2 * c12.y * c13.y * c23.y - 6 * c10.y * c20.x * c13x2 * c13.y * c23.y - 6 * c10.y * c20.y * c13x2 * c13.y * c23.x - 6 * c10.y * c21.x * c13x2 * c13.y * c22.y - 2 * c10.y * c12x2 * c12.y * c13.x * c23.y - 2 * c10.y * c12x2 * c12.y * c13.y * c23.x - 6 * c10.y * c13x2 * c21.y * c22.x * c13.y - c11.x * c11.y * c12x2 * c13.y * c23.y - 2 * c11.x * c11y2 * c13.x * c13.y * c23.x + 3 * c20.x * c11.y * c12.y * c13x2 * c23.y - 2 * c20.x * c12.x * c12y2 * c13.x * c23.y - 2 * c20.x * c12.x * c12y2 * c13.y * c23.x - 6 * c20.x * c20.y * c13.x * c13y2 * c23.x - 6 * c20.x * c21.x * c13.x * c13y2 * c22.y - 6 * c20.x * c13.x * c21.y * c22.x * c13y2 + 3 * c11.y * c20.y * c12.y * c13x2 * c23.x + 3 * c11.y * c21.x * c12.y * c13x2 * c22.y + 3 * c11.y * c12.y * c13x2 * c21.y * c22.x - 2 * c12.x * c20.y * c12y2 * c13.x * c23.x - 2 * c12.x * c21.x * c12y2 * c13.x * c22.y - 2 * c12.x * c21.x * c12y2 * c22.x * c13.y - 2 * c12.x * c12y2 * c13.x * c21.y * c22.x - 6 * c20.y * c21.x * c13.x * c22.x * c13y2 - c11y2 * c12.x * c12.y * c13.x * c23.x + 2 * c20.x * c12x2 * c12.y * c13.y * c23.y + 6 * c20.y * c13x2 * c21.y * c22.x * c13.y + 2 * c11x2 * c11.y * c13.x * c13.y * c23.y + c11x2 * c12.x * c12.y * c13.y * c23.y + 2 * c12x2 * c20.y * c12.y * c13.y * c23.x + 2 * c12x2 * c21.x * c12.y * c13.y * c22.y + 2 * c12x2 * c12.y * c21.y * c22.x * c13.y + c21x3 * c13y3 + 3 * c10x2 * c13y3 * c23.x - 3 * c10y2 * c13x3 * c23.y + 3 * c20x2 * c13y3 * c23.x + c11y3 * c13x2 * c23.x - c11x3 * c13y2 * c23.y - c11.x * c11y2 * c13x2 * c23.y + c11x2 * c11.y * c13y2 * c23.x - 3 * c10x2 * c13.x * c13y2 * c23.y + 3 * c10y2 * c13x2 * c13.y * c23.x - c11x2 * c12y2 * c13.x * c23.y + c11y2 * c12x2 * c13.y * c23.x - 3 * c21x2 * c13.x * c21.y * c13y2 - 3 * c20x2 * c13.x * c13y2 * c23.y + 3 * c20y2 * c13x2 * c13.y * c23.x + c11.x * c12.x * c13.x * c13.y * (6 * c20.y * c23.y + 6 * c21.y * c22.y) + c12x3 * c13.y * ( - 2 * c20.y * c23.y - 2 * c21.y * c22.y) + c10.y * c13x3 * (6 * c20.y * c23.y + 6 * c21.y * c22.y) + c11.y * c12.x * c13x2 * ( - 2 * c20.y * c23.y - 2 * c21.y * c22.y) + c12x2 * c12.y * c13.x * (2 * c20.y * c23.y + 2 * c21.y * c22.y) + c11.x * c12.y * c13x2 * ( - 4 * c20.y * c23.y - 4 * c21.y * c22.y) + c10.x * c13x2 * c13.y * ( - 6 * c20.y * c23.y - 6 * c21.y * c22.y) + c20.x * c13x2 * c13.y * (6 * c20.y * c23.y + 6 * c21.y * c22.y) + c21.x * c13x2 * c13.y * (6 * c20.y * c22.y + 3 * c21y2) + c13x3 * ( - 2 * c20.y * c21.y * c22.y - c20y2 * c23.y - c21.y * (2 * c20.y * c22.y + c21y2) - c20.y * (2 * c20.y * c23.y + 2 * c21.y * c22.y)), - c10.x * c11.x * c12.y * c13.x * c13.y * c22.y + c10.x * c11.y * c12.x * c13.x * c13.y * c22.y + 6 * c10.x * c11.y * c12.y * c13.x * c22.x * c13.y - 6 * c10.y * c11.x * c12.x * c13.x * c13.y * c22.y - c10.y * c11.x * c12.y * c13.x * c22.x * c13.y + c10.y * c11.y * c12.x * c13.x * c22.x * c13.y + c11.x * c11.y * c12.x * c12.y * c13.x * c22.y - c11.x * c11.y * c12.x * c12.y * c22.x * c13.y + c11.x * c20.x * c12.y * c13.x * c13.y * c22.y + c11.x * c20.y * c12.y * c13.x * c22.x * c13.y + c11.x * c21.x * c12.y * c13.x * c21.y * c13.y - c20.x * c11.y * c12.x * c13.x * c13.y * c22.y - 6 * c20.x * c11.y * c12.y * c13.x * c22.x * c13.y - c11.y * c12.x * c20.y * c13.x * c22.x * c13.y - c11.y * c12.x * c21.x * c13.x * c21.y * c13.y - 6 * c10.x * c20.x * c22.x * c13y3 - 2 * c10.x * c12y3 * c13.x * c22.x + 2 * c20.x * c12y3 * c13.x * c22.x + 2 * c10.y * c12x3 * c13.y * c22.y - 6 * c10.x * c10.y * c13.x * c22.x * c13y2 + 3 * c10.x * c11.x * c12.x * c13y2 * c22.y - 2 * c10.x * c11.x * c12.y * c22.x * c13y2 - 4 * c10.x * c11.y * c12.x * c22.x * c13y2 + 3 * c10.y * c11.x * c12.x * c22.x * c13y2 + 6 * c10.x * c10.y * c13x2 * c13.y * c22.y + 6 * c10.x * c20.x * c13.x * c13y2 * c22.y - 3 * c10.x * c11.y * c12.y * c13x2 * c22.y + 2 * c10.x * c12.x * c12y2 * c13.x * c22.y + 2 * c10.x * c12.x * c12y2 * c22.x * c13.y + 6 * c10.x * c20.y * c13.x * c22.x * c13y2 + 6 * c10.x * c21.x * c13.x * c21.y * c13y2 + 4 * c10.y * c11.x * c12.y * c13x2 * c22.y + 6 * c10.y * c20.x * c13.x * c22.x * c13y2 + 2 * c10.y * c11.y * c12.x * c13x2 * c22.y - 3 * c10.y * c11.y * c12.y * c13x2 * c22.x + 2 * c10.y * c12.x * c12y2 * c13.x * c22.x - 3 * c11.x * c20.x * c12.x * c13y2 * c22.y + 2 * c11.x * c20.x * c12.y * c22.x * c13y2 + c11.x * c11.y * c12y2 * c13.x * c22.x - 3 * c11.x * c12.x * c20.y * c22.x * c13y2 - 3 * c11.x * c12.x * c21.x * c21.y * c13y2 + 4 * c20.x * c11.y * c12.x * c22.x * c13y2 - 2 * c10.x * c12x2 * c12.y * c13.y * c22.y - 6 * c10.y * c20.x * c13x2 * c13.y * c22.y - 6 * c10.y * c20.y * c13x2 * c22.x * c13.y - 6 * c10.y * c21.x * c13x2 * c21.y * c13.y - 2 * c10.y * c12x2 * c12.y * c13.x * c22.y - 2 * c10.y * c12x2 * c12.y * c22.x * c13.y - c11.x * c11.y * c12x2 * c13.y * c22.y - 2 * c11.x * c11y2 * c13.x * c22.x * c13.y + 3 * c20.x * c11.y * c12.y * c13x2 * c22.y - 2 * c20.x * c12.x * c12y2 * c13.x * c22.y - 2 * c20.x * c12.x * c12y2 * c22.x * c13.y - 6 * c20.x * c20.y * c13.x * c22.x * c13y2 - 6 * c20.x * c21.x * c13.x * c21.y * c13y2 + 3 * c11.y * c20.y * c12.y * c13x2 * c22.x + 3 * c11.y * c21.x * c12.y * c13x2 * c21.y - 2 * c12.x * c20.y * c12y2 * c13.x * c22.x - 2 * c12.x * c21.x * c12y2 * c13.x * c21.y - c11y2 * c12.x * c12.y * c13.x * c22.x + 2 * c20.x * c12x2 * c12.y * c13.y * c22.y - 3 * c11.y * c21x2 * c12.y * c13.x * c13.y + 6 * c20.y * c21.x * c13x2 * c21.y * c13.y + 2 * c11x2 * c11.y * c13.x * c13.y * c22.y + c11x2 * c12.x * c12.y * c13.y * c22.y + 2 * c12x2 * c20.y * c12.y * c22.x * c13.y + 2 * c12x2 * c21.x * c12.y * c21.y * c13.y - 3 * c10.x * c21x2 * c13y3 + 3 * c20.x * c21x2 * c13y3 + 3 * c10x2 * c22.x * c13y3 - 3 * c10y2 * c13x3 * c22.y + 3 * c20x2 * c22.x * c13y3 + c21x2 * c12y3 * c13.x + c11y3 * c13x2 * c22.x - c11x3 * c13y2 * c22.y + 3 * c10.y * c21x2 * c13.x * c13y2 - c11.x * c11y2 * c13x2 * c22.y + c11.x * c21x2 * c12.y * c13y2 + 2 * c11.y * c12.x * c21x2 * c13y2 + c11x2 * c11.y * c22.x * c13y2 - c12.x * c21x2 * c12y2 * c13.y - 3 * c20.y * c21x2 * c13.x * c13y2 - 3 * c10x2 * c13.x * c13y2 * c22.y + 3 * c10y2 * c13x2 * c22.x * c13.y - c11x2 * c12y2 * c13.x * c22.y + c11y2 * c12x2 * c22.x * c13.y - 3 * c20x2 * c13.x * c13y2 * c22.y + 3 * c20y2 * c13x2 * c22.x * c13.y + c12x2 * c12.y * c13.x * (2 * c20.y * c22.y + c21y2) + c11.x * c12.x * c13.x * c13.y * (6 * c20.y * c22.y + 3 * c21y2) + c12x3 * c13.y * ( - 2 * c20.y * c22.y - c21y2) + c10.y * c13x3 * (6 * c20.y * c22.y + 3 * c21y2) + c11.y * c12.x * c13x2 * ( - 2 * c20.y * c22.y - c21y2) + c11.x * c12.y * c13x2 * ( - 4 * c20.y * c22.y - 2 * c21y2) + c10.x * c13x2 * c13.y * ( - 6 * c20.y * c22.y - 3 * c21y2) + c20.x * c13x2 * c13.y * (6 * c20.y * c22.y + 3 * c21y2) + c13x3 * ( - 2 * c20.y * c21y2 - c20y2 * c22.y - c20.y * (2 * c20.y * c22.y + c21y2)), - c10.x * c11.x * c12.y * c13.x * c21.y * c13.y + c10.x * c11.y * c12.x * c13.x * c21.y * c13.y + 6 * c10.x * c11.y * c21.x * c12.y * c13.x * c13.y - 6 * c10.y * c11.x * c12.x * c13.x * c21.y * c13.y - c10.y * c11.x * c21.x * c12.y * c13.x * c13.y + c10.y * c11.y * c12.x * c21.x * c13.x * c13.y - c11.x * c11.y * c12.x * c21.x * c12.y * c13.y + c11.x * c11.y * c12.x * c12.y * c13.x * c21.y + c11.x * c20.x * c12.y * c13.x * c21.y * c13.y + 6 * c11.x * c12.x * c20.y * c13.x * c21.y * c13.y + c11.x * c20.y * c21.x * c12.y * c13.x * c13.y - c20.x * c11.y * c12.x * c13.x * c21.y * c13.y - 6 * c20.x * c11.y * c21.x * c12.y * c13.x * c13.y - c11.y * c12.x * c20.y * c21.x * c13.x * c13.y - 6 * c10.x * c20.x * c21.x * c13y3 - 2 * c10.x * c21.x * c12y3 * c13.x + 6 * c10.y * c20.y * c13x3 * c21.y + 2 * c20.x * c21.x * c12y3 * c13.x + 2 * c10.y * c12x3 * c21.y * c13.y - 2 * c12x3 * c20.y * c21.y * c13.y - 6 * c10.x * c10.y * c21.x * c13.x * c13y2 + 3 * c10.x * c11.x * c12.x * c21.y * c13y2 - 2 * c10.x * c11.x * c21.x * c12.y * c13y2 - 4 * c10.x * c11.y * c12.x * c21.x * c13y2 + 3 * c10.y * c11.x * c12.x * c21.x * c13y2 + 6 * c10.x * c10.y * c13x2 * c21.y * c13.y + 6 * c10.x * c20.x * c13.x * c21.y * c13y2 - 3 * c10.x * c11.y * c12.y * c13x2 * c21.y + 2 * c10.x * c12.x * c21.x * c12y2 * c13.y + 2 * c10.x * c12.x * c12y2 * c13.x * c21.y + 6 * c10.x * c20.y * c21.x * c13.x * c13y2 + 4 * c10.y * c11.x * c12.y * c13x2 * c21.y + 6 * c10.y * c20.x * c21.x * c13.x * c13y2 + 2 * c10.y * c11.y * c12.x * c13x2 * c21.y - 3 * c10.y * c11.y * c21.x * c12.y * c13x2 + 2 * c10.y * c12.x * c21.x * c12y2 * c13.x - 3 * c11.x * c20.x * c12.x * c21.y * c13y2 + 2 * c11.x * c20.x * c21.x * c12.y * c13y2 + c11.x * c11.y * c21.x * c12y2 * c13.x - 3 * c11.x * c12.x * c20.y * c21.x * c13y2 + 4 * c20.x * c11.y * c12.x * c21.x * c13y2 - 6 * c10.x * c20.y * c13x2 * c21.y * c13.y - 2 * c10.x * c12x2 * c12.y * c21.y * c13.y - 6 * c10.y * c20.x * c13x2 * c21.y * c13.y - 6 * c10.y * c20.y * c21.x * c13x2 * c13.y - 2 * c10.y * c12x2 * c21.x * c12.y * c13.y - 2 * c10.y * c12x2 * c12.y * c13.x * c21.y - c11.x * c11.y * c12x2 * c21.y * c13.y - 4 * c11.x * c20.y * c12.y * c13x2 * c21.y - 2 * c11.x * c11y2 * c21.x * c13.x * c13.y + 3 * c20.x * c11.y * c12.y * c13x2 * c21.y - 2 * c20.x * c12.x * c21.x * c12y2 * c13.y - 2 * c20.x * c12.x * c12y2 * c13.x * c21.y - 6 * c20.x * c20.y * c21.x * c13.x * c13y2 - 2 * c11.y * c12.x * c20.y * c13x2 * c21.y + 3 * c11.y * c20.y * c21.x * c12.y * c13x2 - 2 * c12.x * c20.y * c21.x * c12y2 * c13.x - c11y2 * c12.x * c21.x * c12.y * c13.x + 6 * c20.x * c20.y * c13x2 * c21.y * c13.y + 2 * c20.x * c12x2 * c12.y * c21.y * c13.y + 2 * c11x2 * c11.y * c13.x * c21.y * c13.y + c11x2 * c12.x * c12.y * c21.y * c13.y + 2 * c12x2 * c20.y * c21.x * c12.y * c13.y + 2 * c12x2 * c20.y * c12.y * c13.x * c21.y + 3 * c10x2 * c21.x * c13y3 - 3 * c10y2 * c13x3 * c21.y + 3 * c20x2 * c21.x * c13y3 + c11y3 * c21.x * c13x2 - c11x3 * c21.y * c13y2 - 3 * c20y2 * c13x3 * c21.y - c11.x * c11y2 * c13x2 * c21.y + c11x2 * c11.y * c21.x * c13y2 - 3 * c10x2 * c13.x * c21.y * c13y2 + 3 * c10y2 * c21.x * c13x2 * c13.y - c11x2 * c12y2 * c13.x * c21.y + c11y2 * c12x2 * c21.x * c13.y - 3 * c20x2 * c13.x * c21.y * c13y2 + 3 * c20y2 * c21.x * c13x2 * c13.y, c10.x * c10.y * c11.x * c12.y * c13.x * c13.y - c10.x * c10.y * c11.y * c12.x * c13.x * c13.y + c10.x * c11.x * c11.y * c12.x * c12.y * c13.y - c10.y * c11.x * c11.y * c12.x * c12.y * c13.x - c10.x * c11.x * c20.y * c12.y * c13.x * c13.y + 6 * c10.x * c20.x * c11.y * c12.y * c13.x * c13.y + c10.x * c11.y * c12.x * c20.y * c13.x * c13.y - c10.y * c11.x * c20.x * c12.y * c13.x * c13.y - 6 * c10.y * c11.x * c12.x * c20.y * c13.x * c13.y + c10.y * c20.x * c11.y * c12.x * c13.x * c13.y - c11.x * c20.x * c11.y * c12.x * c12.y * c13.y + c11.x * c11.y * c12.x * c20.y * c12.y * c13.x + c11.x * c20.x * c20.y * c12.y * c13.x * c13.y - c20.x * c11.y * c12.x * c20.y * c13.x * c13.y - 2 * c10.x * c20.x * c12y3 * c13.x + 2 * c10.y * c12x3 * c20.y * c13.y - 3 * c10.x * c10.y * c11.x * c12.x * c13y2 - 6 * c10.x * c10.y * c20.x * c13.x * c13y2 + 3 * c10.x * c10.y * c11.y * c12.y * c13x2 - 2 * c10.x * c10.y * c12.x * c12y2 * c13.x - 2 * c10.x * c11.x * c20.x * c12.y * c13y2 - c10.x * c11.x * c11.y * c12y2 * c13.x + 3 * c10.x * c11.x * c12.x * c20.y * c13y2 - 4 * c10.x * c20.x * c11.y * c12.x * c13y2 + 3 * c10.y * c11.x * c20.x * c12.x * c13y2 + 6 * c10.x * c10.y * c20.y * c13x2 * c13.y + 2 * c10.x * c10.y * c12x2 * c12.y * c13.y + 2 * c10.x * c11.x * c11y2 * c13.x * c13.y + 2 * c10.x * c20.x * c12.x * c12y2 * c13.y + 6 * c10.x * c20.x * c20.y * c13.x * c13y2 - 3 * c10.x * c11.y * c20.y * c12.y * c13x2 + 2 * c10.x * c12.x * c20.y * c12y2 * c13.x + c10.x * c11y2 * c12.x * c12.y * c13.x + c10.y * c11.x * c11.y * c12x2 * c13.y + 4 * c10.y * c11.x * c20.y * c12.y * c13x2 - 3 * c10.y * c20.x * c11.y * c12.y * c13x2 + 2 * c10.y * c20.x * c12.x * c12y2 * c13.x + 2 * c10.y * c11.y * c12.x * c20.y * c13x2 + c11.x * c20.x * c11.y * c12y2 * c13.x - 3 * c11.x * c20.x * c12.x * c20.y * c13y2 - 2 * c10.x * c12x2 * c20.y * c12.y * c13.y - 6 * c10.y * c20.x * c20.y * c13x2 * c13.y - 2 * c10.y * c20.x * c12x2 * c12.y * c13.y - 2 * c10.y * c11x2 * c11.y * c13.x * c13.y - c10.y * c11x2 * c12.x * c12.y * c13.y - 2 * c10.y * c12x2 * c20.y * c12.y * c13.x - 2 * c11.x * c20.x * c11y2 * c13.x * c13.y - c11.x * c11.y * c12x2 * c20.y * c13.y + 3 * c20.x * c11.y * c20.y * c12.y * c13x2 - 2 * c20.x * c12.x * c20.y * c12y2 * c13.x - c20.x * c11y2 * c12.x * c12.y * c13.x + 3 * c10y2 * c11.x * c12.x * c13.x * c13.y + 3 * c11.x * c12.x * c20y2 * c13.x * c13.y + 2 * c20.x * c12x2 * c20.y * c12.y * c13.y - 3 * c10x2 * c11.y * c12.y * c13.x * c13.y + 2 * c11x2 * c11.y * c20.y * c13.x * c13.y + c11x2 * c12.x * c20.y * c12.y * c13.y - 3 * c20x2 * c11.y * c12.y * c13.x * c13.y - c10x3 * c13y3 + c10y3 * c13x3 + c20x3 * c13y3 - c20y3 * c13x3 - 3 * c10.x * c20x2 * c13y3 - c10.x * c11y3 * c13x2 + 3 * c10x2 * c20.x * c13y3 + c10.y * c11x3 * c13y2 + 3 * c10.y * c20y2 * c13x3 + c20.x * c11y3 * c13x2 + c10x2 * c12y3 * c13.x - 3 * c10y2 * c20.y * c13x3 - c10y2 * c12x3 * c13.y + c20x2 * c12y3 * c13.x - c11x3 * c20.y * c13y2 - c12x3 * c20y2 * c13.y - c10.x * c11x2 * c11.y * c13y2 + c10.y * c11.x * c11y2 * c13x2 - 3 * c10.x * c10y2 * c13x2 * c13.y - c10.x * c11y2 * c12x2 * c13.y + c10.y * c11x2 * c12y2 * c13.x - c11.x * c11y2 * c20.y * c13x2 + 3 * c10x2 * c10.y * c13.x * c13y2 + c10x2 * c11.x * c12.y * c13y2 + 2 * c10x2 * c11.y * c12.x * c13y2 - 2 * c10y2 * c11.x * c12.y * c13x2 - c10y2 * c11.y * c12.x * c13x2 + c11x2 * c20.x * c11.y * c13y2 - 3 * c10.x * c20y2 * c13x2 * c13.y + 3 * c10.y * c20x2 * c13.x * c13y2 + c11.x * c20x2 * c12.y * c13y2 - 2 * c11.x * c20y2 * c12.y * c13x2 + c20.x * c11y2 * c12x2 * c13.y - c11.y * c12.x * c20y2 * c13x2 - c10x2 * c12.x * c12y2 * c13.y - 3 * c10x2 * c20.y * c13.x * c13y2 + 3 * c10y2 * c20.x * c13x2 * c13.y + c10y2 * c12x2 * c12.y * c13.x - c11x2 * c20.y * c12y2 * c13.x + 2 * c20x2 * c11.y * c12.x * c13y2 + 3 * c20.x * c20y2 * c13x2 * c13.y - c20x2 * c12.x * c12y2 * c13.y - 3 * c20x2 * c20.y * c13.x * c13y2 + c12x2 * c20y2 * c12.y * c13.x]
-    roots = equation(*poly, offset=offset)
-    roots = list(roots)
-    roots.sort()
-
-    retsults = []
-    pre = -999999999
-    for t in roots:
-        if t - pre < offset:
-            pre = 0
-            continue
-        pre = t
-
-        retsults.append(t)
-        # xRoots = equation(c13.x, c12.x, c11.x, c10.x - c20.x - t * c21.x - t * t * c22.x - t * t * t * c23.x)
-        # yRoots = equation(c13.y, c12.y, c11.y, c10.y - c20.y - t * c21.y - t * t * c22.y - t * t * t * c23.y)
+def _subCubic(c, t0, t1):
+    if t1 < 1:
+        c = _splitCubic(c, t1)[0]
+    if t0 > 0:
+        c = _splitCubic(c, t0 / t1)[1]
+    return c
+
+def _splitCubic(c, t):
+    (x0, y0), (x1, y1), (x2, y2), (x3, y3) = c
+    mt = 1 - t
+    x01, y01 = x0*mt + x1*t, y0*mt + y1*t
+    x12, y12 = x1*mt + x2*t, y1*mt + y2*t
+    x23, y23 = x2*mt + x3*t, y2*mt + y3*t
+    xa, ya = x01*mt + x12*t, y01*mt + y12*t
+    xb, yb = x12*mt + x23*t, y12*mt + y23*t
+    xm, ym = xa*mt + xb*t, ya*mt + yb*t
+    return ((x0, y0), (x01, y01), (xa, ya), (xm, ym)), ((xm, ym), (xb, yb), (x23, y23), (x3, y3))
+
+def _cubicAt(c, t):
+    mt = 1 - t
+    return (c[0][0]*mt**3 + c[1][0]*3*mt**2*t + c[2][0]*3*mt*t**2 + c[3][0]*t**3, c[0][1]*mt**3 + c[1][1]*3*mt**2*t + c[2][1]*3*mt*t**2 + c[3][1]*t**3)
+
+def _cubicDerivative(c, t, n=1):
+    mt = 1 - t
+    (x0, y0), (x1, y1), (x2, y2), (x3, y3) = c
+    if n == 1:
+        return ((x1-x0)*3*mt**2 + (x2-x1)*6*mt*t + (x3-x2)*3*t**2, (y1-y0)*3*mt**2 + (y2-y1)*6*mt*t + (y3-y2)*3*t**2)
+    else:
+        return ((x2 - x1*2 + x0)*6*mt + (x3 - x2*2 + x1)*6*t, (y2 - y1*2 + y0)*6*mt + (y3 - y2*2 + y1)*6*t)
+
+def _cubicDirection(c, t):
+    DELTA = 1e-3
+    dx, dy = _cubicDerivative(c, t)
+    if math.hypot(dx, dy) < 1e-9:
+        (x1, y1), (x2, y2) = _cubicAt(c, max(t - DELTA, 0)), _cubicAt(c, min(t + DELTA, 1))
+        dx, dy = x2 - x1, y2 - y1
+    return dx, dy
+
+def _cubicValues(points, ts):
+    t = np.asarray(ts)[..., None]
+    mt = 1 - t
+    return points[..., 0, :]*mt**3 + points[..., 1, :]*3*mt**2*t + points[..., 2, :]*3*mt*t**2 + points[..., 3, :]*t**3
+
+def _cubicDerivatives(points, ts, n=1):
+    t = np.asarray(ts)[..., None]
+    mt = 1 - t
+    d1 = points[..., 1, :] - points[..., 0, :]
+    d2 = points[..., 2, :] - points[..., 1, :]
+    d3 = points[..., 3, :] - points[..., 2, :]
+    if n == 1:
+        return (d1*mt**2 + d2*2*mt*t + d3*t**2) * 3
+    elif n == 2:
+        return ((d2 - d1)*mt + (d3 - d2)*t) * 6
+    else:
+        return (d3 - d2*2 + d1) * 6 + t*0
+
+def _cubicDirections(points, ts):
+    DELTA = 1e-3
+    directions = _cubicDerivatives(points, ts)
+    length = np.hypot(directions[:, 0], directions[:, 1])
+    empty = length < 1e-9
+    if np.any(empty):
+        ts = ts[empty]
+        directions[empty] = _cubicValues(points[empty], np.minimum(ts + DELTA, 1)) - _cubicValues(points[empty], np.maximum(ts - DELTA, 0))
+        length[empty] = np.hypot(directions[empty, 0], directions[empty, 1])
+    return np.divide(directions, length[:, None], out=np.zeros(directions.shape), where=length[:, None] != 0)
+
+def _cubicBox(c):
+    (x0, y0), (x1, y1), (x2, y2), (x3, y3) = c
+    return min(x0, x1, x2, x3), min(y0, y1, y2, y3), max(x0, x1, x2, x3), max(y0, y1, y2, y3)
+
+def _cubicExtent(c):
+    left, top, right, bottom = _cubicBox(c)
+    return max(right - left, bottom - top)
+
+def _cubicBoxesApart(a, b, tolerance):
+    left1, top1, right1, bottom1 = _cubicBox(a)
+    left2, top2, right2, bottom2 = _cubicBox(b)
+    return left1 - right2 > tolerance or left2 - right1 > tolerance or top1 - bottom2 > tolerance or top2 - bottom1 > tolerance
+
+def _fatLineClip(a, b, tolerance):
+    (x0, y0), (x3, y3) = a[0], a[3]
+    dx, dy = x3 - x0, y3 - y0
+    length = math.hypot(dx, dy)
+    if length < 1e-12:
+        dx, dy = a[2][0] - a[1][0], a[2][1] - a[1][1]
+        length = math.hypot(dx, dy)
+        if length < 1e-12:
+            return 0, 1
+    nx, ny = -dy / length, dx / length
+    d1 = (a[1][0] - x0)*nx + (a[1][1] - y0)*ny
+    d2 = (a[2][0] - x0)*nx + (a[2][1] - y0)*ny
+    k = 3/4 if d1 * d2 > 0 else 4/9
+    dmin = k * min(0, d1, d2) - tolerance
+    dmax = k * max(0, d1, d2) + tolerance
+
+    points = [(i / 3, (p[0] - x0)*nx + (p[1] - y0)*ny) for i, p in enumerate(b)]
+    if all(d < dmin for _, d in points) or all(d > dmax for _, d in points):
+        return None
+    tmin = 2
+    tmax = -1
+    for t, d in points:
+        if dmin <= d <= dmax:
+            if t < tmin:
+                tmin = t
+            if t > tmax:
+                tmax = t
+    for i in range(4):
+        ti, di = points[i]
+        for j in range(i+1, 4):
+            tj, dj = points[j]
+            if di == dj:
+                continue
+            for bound in (dmin, dmax):
+                s = (bound - di) / (dj - di)
+                if 0 <= s <= 1:
+                    t = ti + (tj - ti)*s
+                    if t < tmin:
+                        tmin = t
+                    if t > tmax:
+                        tmax = t
+    if tmin > tmax:
+        return None
+    return max(tmin, 0), min(tmax, 1)
+
+def _closestParameter(c, pos, iterations=8):
+    best = min((math.hypot(x - pos[0], y - pos[1]), t) for t in (0, .25, .5, .75, 1) for x, y in [_cubicAt(c, t)])[1]
+    t = best
+    for _ in range(iterations):
+        x, y = _cubicAt(c, t)
+        dx, dy = x - pos[0], y - pos[1]
+        (ax, ay), (bx, by) = _cubicDerivative(c, t), _cubicDerivative(c, t, 2)
+        f = dx*ax + dy*ay
+        df = ax*ax + ay*ay + dx*bx + dy*by
+        if abs(df) < 1e-12:
+            break
+        step = min(max(t - f / df, 0.), 1.) - t
+        t += step
+        if abs(step) < 1e-12:
+            break
+    x, y = _cubicAt(c, t)
+    return t, math.hypot(x - pos[0], y - pos[1])
+
+def _cubicFlat(c, tolerance):
+    (x0, y0), (x3, y3) = c[0], c[3]
+    dx, dy = x3 - x0, y3 - y0
+    length = math.hypot(dx, dy)
+    if length <= tolerance:
+        return False
+    limit = tolerance * length / 2
+    return abs((c[1][0] - x0)*dy - (c[1][1] - y0)*dx) <= limit and abs((c[2][0] - x0)*dy - (c[2][1] - y0)*dx) <= limit
+
+def _flatIntersection(a, b, tolerance):
+    (x0, y0), (x1, y1) = a[0], a[3]
+    ax, ay = x1 - x0, y1 - y0
+    bx, by = b[3][0] - b[0][0], b[3][1] - b[0][1]
+    ex, ey = b[0][0] - x0, b[0][1] - y0
+    length = math.hypot(ax, ay)
+    d0 = (ex*ay - ey*ax) / length
+    d1 = ((b[3][0] - x0)*ay - (b[3][1] - y0)*ax) / length
+    if abs(d0) <= tolerance and abs(d1) <= tolerance:
+        # Tangential contact, take the middle of the common span
+        p = (ex*ax + ey*ay) / length**2
+        q = ((b[3][0] - x0)*ax + (b[3][1] - y0)*ay) / length**2
+        lo, hi = max(0, min(p, q)), min(1, max(p, q))
+        if lo - hi > tolerance / length:
+            return None
+        s = (lo + hi) / 2
+    else:
+        cross = ax*by - ay*bx
+        if cross == 0:
+            return None
+        s = (ex*by - ey*bx) / cross
+        u = (ex*ay - ey*ax) / cross
+        if not -tolerance / length <= s <= 1 + tolerance / length or not -tolerance <= u*math.hypot(bx, by) <= math.hypot(bx, by) + tolerance:
+            return None
+    pos = x0 + ax*s, y0 + ay*s
+    t, d1 = _flatParameter(a, pos)
+    u, d2 = _flatParameter(b, pos)
+    if d1 + d2 > tolerance*2:
+        return None
+    return t, u
+
+def _flatParameter(c, pos):
+    (x0, y0), (x3, y3) = c[0], c[3]
+    dx, dy = x3 - x0, y3 - y0
+    target = (pos[0] - x0)*dx + (pos[1] - y0)*dy
+    lo, hi = 0., 1.
+    for _ in range(48):
+        t = (lo + hi) / 2
+        x, y = _cubicAt(c, t)
+        if (x - x0)*dx + (y - y0)*dy < target:
+            lo = t
+        else:
+            hi = t
+    t = (lo + hi) / 2
+    x, y = _cubicAt(c, t)
+    return t, math.hypot(x - pos[0], y - pos[1])
+
+def _inCubicBox(c, pos, tolerance):
+    left, top, right, bottom = _cubicBox(c)
+    return left - tolerance <= pos[0] <= right + tolerance and top - tolerance <= pos[1] <= bottom + tolerance
+
+def _cubicOverlap(a, b, tolerance):
+    candidates = [(b, a[3*t], t, False) for t in (0, 1) if _inCubicBox(b, a[3*t], tolerance)]
+    candidates += [(a, b[3*t], t, True) for t in (0, 1) if _inCubicBox(a, b[3*t], tolerance)]
+    if len(candidates) < 2:
+        return None
 
-        # if (len(xRoots) == 0) ^ (len(yRoots) == 0):
-        #     retsults.append(t)
-        #     continue
+    pairs = []
+    for c, pos, t, reverse in candidates:
+        v, d = _closestParameter(c, pos)
+        if d <= tolerance:
+            pairs.append((v, t) if reverse else (t, v))
+    pairs = sorted(set((round(s, 9), round(u, 9)) for s, u in pairs))
+    if len(pairs) < 2:
+        return None
+    (s0, u0), (s1, u1) = pairs[0], pairs[-1]
+    if s1 - s0 < 1e-6:
+        return None
+    for k in (.25, .5, .75):
+        u, d = _closestParameter(b, _cubicAt(a, s0 + (s1 - s0)*k))
+        if d > tolerance:
+            return None
+    return (s0, s1), (u0, u1)
+
+def _cubicNearEnds(a, b, pairs, tolerance):
+    hits = [_cubicAt(a, s) for s, _ in pairs]
+    ends = []
+    for c, other, reverse in ((a, b, False), (b, a, True)):
+        for t in (0, 1):
+            pos = c[3*t]
+            if not _inCubicBox(other, pos, tolerance):
+                continue
+            v, distance = _flatParameter(other, pos) if _cubicFlat(other, tolerance) else _closestParameter(other, pos)
+            if distance > tolerance:
+                continue
+            hit = _cubicAt(a, v if reverse else t)
+            if all(math.hypot(hit[0] - x, hit[1] - y) > tolerance for x, y in hits):
+                hits.append(hit)
+                ends.append((v, t) if reverse else (t, v))
+    return ends
+
+def clipBezier3Bezier3(a1, a2, a3, a4, b1, b2, b3, b4, tolerance=.0001):
+    a = tuple((p.x, p.y) for p in (a1, a2, a3, a4))
+    b = tuple((p.x, p.y) for p in (b1, b2, b3, b4))
+    MAX_ITERATIONS = 10000
+
+    overlap = _cubicOverlap(a, b, tolerance)
+    if overlap:
+        return [], [overlap]
+
+    runs = []
+    stack = [(0., 1., 0., 1., a, b, False)]
+    iteration = 0
+    while stack and iteration < MAX_ITERATIONS:
+        iteration += 1
+        t0, t1, u0, u1, ca, cb, swapped = stack.pop()
+        if _cubicBoxesApart(ca, cb, tolerance):
+            continue
+        if _cubicFlat(ca, tolerance) and _cubicFlat(cb, tolerance):
+            pair = _flatIntersection(ca, cb, tolerance)
+            if pair:
+                s, u = t0 + (t1 - t0)*pair[0], u0 + (u1 - u0)*pair[1]
+                runs.append((u, u, s, s) if swapped else (s, s, u, u))
+            continue
+        if _cubicExtent(ca) <= tolerance:
+            if _cubicExtent(cb) <= tolerance:
+                v, distance = .5, math.hypot(ca[0][0] - cb[0][0], ca[0][1] - cb[0][1])
+            elif _cubicFlat(cb, tolerance):
+                v, distance = _flatParameter(cb, ca[0])
+            else:
+                v, distance = _closestParameter(cb, ca[0])
+            if distance <= tolerance*2:
+                s, u = (t0 + t1) / 2, u0 + (u1 - u0)*v
+                runs.append((u, u, s, s) if swapped else (s, s, u, u))
+            continue
 
-        # done = False
-        # for xRoot in xRoots:
-        #     for yRoot in yRoots:
-        #         if abs(xRoot - yRoot) < offset:
-        #             retsults.append(t)
-        #             done = True
-        #             break
-        #     if done:
-        #         break
+        clip = _fatLineClip(ca, cb, tolerance)
+        if clip is None:
+            continue
+        v0, v1 = clip
+        n0, n1 = u0 + (u1 - u0)*v0, u0 + (u1 - u0)*v1
+        cb = _subCubic(cb, v0, v1) if v1 - v0 < 1 else cb
+        if v1 - v0 > .8:
+            # Clipping stalls where the curves run within tolerance, keep the whole span as one run.
+            overlap = _cubicOverlap(ca, cb, tolerance)
+            if overlap:
+                (p0, p1), (q0, q1) = overlap
+                s0, s1 = t0 + (t1 - t0)*p0, t0 + (t1 - t0)*p1
+                w0, w1 = n0 + (n1 - n0)*q0, n0 + (n1 - n0)*q1
+                runs.append((w0, w1, s0, s1) if swapped else (s0, s1, w0, w1))
+            elif _cubicExtent(cb) > _cubicExtent(ca):
+                cb1, cb2 = _splitCubic(cb, .5)
+                nm = (n0 + n1) / 2
+                stack.append((n0, nm, t0, t1, cb1, ca, not swapped))
+                stack.append((nm, n1, t0, t1, cb2, ca, not swapped))
+            else:
+                ca1, ca2 = _splitCubic(ca, .5)
+                tm = (t0 + t1) / 2
+                stack.append((n0, n1, t0, tm, cb, ca1, not swapped))
+                stack.append((n0, n1, tm, t1, cb, ca2, not swapped))
+        else:
+            stack.append((n0, n1, t0, t1, cb, ca, not swapped))
+
+    if stack:
+        pieces = [(cb, ca) if swapped else (ca, cb) for _, _, _, _, ca, cb, swapped in stack]
+        for (t0, t1, u0, u1, _, _, swapped), (sList, uList) in zip(stack, subdivideBezier3Pairs(pieces, tolerance)):
+            if swapped:
+                t0, t1, u0, u1 = u0, u1, t0, t1
+            for s, u in zip(sList, uList):
+                s, u = t0 + (t1 - t0)*s, u0 + (u1 - u0)*u
+                runs.append((s, s, u, u))
+
+    # Shallow crossings and tangential contacts leave runs of adjacent hits, keep the closest point of each run.
+    runs.sort()
+    result = []
+    gap = max(tolerance*4, math.sqrt(tolerance))
+    prev = None
+    for s0, s1, w0, w1 in runs:
+        candidates = [(s0 + (s1 - s0)*k, w0 + (w1 - w0)*k) for k in ((0, .25, .5, .75, 1) if s1 > s0 else (0,))]
+        candidates = [(math.hypot(x - y[0], x2 - y[1]), s, u) for s, u in candidates for (x, x2), y in [(_cubicAt(a, s), _cubicAt(b, u))]]
+        pos = _cubicAt(a, s0)
+        joined = False
+        if prev is not None:
+            mid = _cubicAt(a, (prev[0] + s0) / 2)
+            other = _cubicAt(b, (prev[1] + w0) / 2)
+            joined = math.hypot(pos[0] - prev[2][0], pos[1] - prev[2][1]) <= gap or math.hypot(mid[0] - other[0], mid[1] - other[1]) <= tolerance*2
+        best = min(candidates)
+        if joined:
+            if best < result[-1]:
+                result[-1] = best
+        else:
+            result.append(best)
+        prev = s1, w1, _cubicAt(a, s1)
+    return [(s, u) for distance, s, u in result if distance <= tolerance], []
+
+def subdivideBezier3Pairs(pairs, precision=1, maxDepth=24):
+    FLATNESS = precision / 5
+
+    results = [([], []) for _ in pairs]
+    stack = [(i, tuple(a), 0., 1., tuple(b), 0., 1., 0) for i, (a, b) in enumerate(pairs)]
+    while stack:
+        index, ca, t0, t1, cb, u0, u1, depth = stack.pop()
+        if _cubicBoxesApart(ca, cb, precision/2):
+            continue
 
-    return retsults
+        big1 = _cubicExtent(ca) > precision
+        big2 = _cubicExtent(cb) > precision
+        if depth < maxDepth and big1 and not _cubicFlat(ca, FLATNESS) and (not big2 or _cubicFlat(cb, FLATNESS) or t1 - t0 >= u1 - u0):
+            ca1, ca2 = _splitCubic(ca, .5)
+            tm = (t0 + t1) / 2
+            stack.append((index, ca1, t0, tm, cb, u0, u1, depth+1))
+            stack.append((index, ca2, tm, t1, cb, u0, u1, depth+1))
+            continue
+        if depth < maxDepth and big2 and not _cubicFlat(cb, FLATNESS):
+            cb1, cb2 = _splitCubic(cb, .5)
+            um = (u0 + u1) / 2
+            stack.append((index, ca, t0, t1, cb1, u0, um, depth+1))
+            stack.append((index, ca, t0, t1, cb2, um, u1, depth+1))
+            continue
 
-def _getPointFromReMatch(match):
-    return Point(next(match).group(), next(match).group())
+        if big1 and big2:
+            pair = _flatIntersection(ca, cb, precision/2)
+        elif big1:
+            v, distance = _flatParameter(ca, _cubicAt(cb, .5))
+            pair = (v, .5) if distance <= precision else None
+        elif big2:
+            v, distance = _flatParameter(cb, _cubicAt(ca, .5))
+            pair = (.5, v) if distance <= precision else None
+        else:
+            pair = (.5, .5)
+        if pair:
+            results[index][0].append(t0 + (t1 - t0)*pair[0])
+            results[index][1].append(u0 + (u1 - u0)*pair[1])
+    return results
 
 def cInterpolation(t):
     if t < 0 or t > 1:
@@ -369,7 +737,145 @@ def abcRotate(t):
         raise ValueError("Require value is between 0 ~ 1!")
     return math.fabs((t**3 + (1-t)**3 - 1) / (t**3 + (1-t)**3))
 
+def _polishRoot(a, b, c, d, x):
+    y = ((a*x + b)*x + c)*x + d
+    for _ in range(2):
+        dy = (3*a*x + 2*b)*x + c
+        if dy == 0:
+            break
+        nx = x - y / dy
+        ny = ((a*nx + b)*nx + c)*nx + d
+        if abs(ny) >= abs(y):
+            break
+        x = nx
+        y = ny
+    return x
+
+def _quadraticRoots(a, b, c, offset=0):
+    if a == 0:
+        if b == 0:
+            return [], []
+        return [-c / b], []
+    n = b*b - 4*a*c
+    if n >= 0:
+        q = -(b + math.copysign(math.sqrt(n), b)) / 2
+        if q == 0:
+            return [0.0, 0.0], []
+        return [q / a, c / q], []
+    elif math.sqrt(-n) / (2*abs(a)) <= offset:
+        return [], [-b / (2*a)] * 2
+    return [], []
+
+def _cubicRoot(a, b, c, d):
+    b /= a
+    c /= a
+    d /= a
+    shift = b / 3
+    p = c - b*shift
+    q = 2*shift**3 - shift*c + d
+    n = (q/2)**2 + (p/3)**3
+    if n > 0:
+        w = -q/2 - math.copysign(math.sqrt(n), q)
+        u = math.copysign(abs(w) ** (1/3), w)
+        return u - p / (3*u) - shift
+    elif p == 0:
+        return -shift
+    r = 2 * math.sqrt(-p / 3)
+    phi = math.acos(max(-1, min(1, 3*q / (p*r))))
+    return max([r * math.cos((phi - 2*math.pi*k) / 3) - shift for k in range(3)], key=abs)
+
+def cubicEquation(a, b, c, d, offset=0):
+    if abs(a) <= max(abs(b), abs(c), abs(d)) * 1e-12:
+        roots, approximations = _quadraticRoots(b, c, d, offset)
+        if a and len(roots) == 2:
+            roots.append(-b / a - roots[0] - roots[1])
+    else:
+        r = _polishRoot(a, b, c, d, _cubicRoot(a, b, c, d))
+        if abs(a*r*r*r) > abs(d):
+            q0 = -d / r
+            q1 = (q0 - c) / r
+        else:
+            q1 = b + a*r
+            q0 = c + q1*r
+        roots, approximations = _quadraticRoots(a, q1, q0, offset)
+        roots.append(r)
+
+    return [_polishRoot(a, b, c, d, x) for x in roots] + approximations
+
+def _quadraticRootsArray(a, b, c, offset=0):
+    n = b*b - 4*a*c
+    q = -(b + np.copysign(np.sqrt(np.abs(n)), b)) / 2
+    real = n >= 0
+    roots = np.full((len(a), 2), np.nan)
+    roots[:, 0] = np.where(real, q / a, np.nan)
+    roots[:, 1] = np.where(real, np.where(q == 0, 0, c / q), np.nan)
+    near = ~real & (np.sqrt(-n) / (2*np.abs(a)) <= offset)
+    roots[near] = (-b / (2*a))[near, None]
+    return roots, np.repeat(near[:, None], 2, axis=1)
+
+def _polishRootsArray(a, b, c, d, roots, mask=None):
+    for _ in range(2):
+        y = ((a*roots + b)*roots + c)*roots + d
+        dy = (3*a*roots + 2*b)*roots + c
+        nr = roots - y / dy
+        better = np.abs(((a*nr + b)*nr + c)*nr + d) < np.abs(y)
+        if mask is not None:
+            better &= ~mask
+        roots = np.where(better, nr, roots)
+    return roots
+
+def cubicEquations(coefficients, offset=0):
+    coefficients = np.asarray(coefficients, dtype=np.float64).reshape(-1, 4)
+    a, b, c, d = coefficients.T
+    roots = np.full((len(coefficients), 3), np.nan)
+    approximations = np.zeros(roots.shape, dtype=bool)
+
+    with np.errstate(all='ignore'):
+        cubic = np.abs(a) > np.max(np.abs(coefficients[:, 1:]), axis=1) * 1e-12
+        quad = ~cubic & (b != 0)
+        linear = ~cubic & ~quad & (c != 0)
+
+        roots[linear, 0] = -d[linear] / c[linear]
+
+        r, near = _quadraticRootsArray(b[quad], c[quad], d[quad], offset)
+        roots[quad, :2] = r
+        roots[quad, 2] = np.where(a[quad] != 0, -b[quad] / a[quad] - r[:, 0] - r[:, 1], np.nan)
+        approximations[quad, :2] = near
+
+        ca, cb, cc, cd = a[cubic], b[cubic], c[cubic], d[cubic]
+        shift = cb / ca / 3
+        p = cc / ca - cb / ca * shift
+        q = 2*shift**3 - shift*cc / ca + cd / ca
+        n = (q/2)**2 + (p/3)**3
+
+        w = -q/2 - np.copysign(np.sqrt(np.abs(n)), q)
+        u = np.cbrt(w)
+        single = u - p / (3*u) - shift
+
+        pr = 2 * np.sqrt(np.abs(p / 3))
+        phi = np.arccos(np.clip(3*q / (p*pr), -1, 1))
+        three = np.stack([pr * np.cos((phi - 2*np.pi*k) / 3) - shift for k in range(3)], axis=1)
+        three = three[np.arange(len(three)), np.argmax(np.abs(three), axis=1)]
+
+        r = np.where(n > 0, single, np.where(p == 0, -shift, three))
+        r = _polishRootsArray(ca, cb, cc, cd, r)
+        roots[cubic, 2] = r
+        backward = np.abs(ca*r*r*r) > np.abs(cd)
+        q0 = np.where(backward, -cd / r, cc + (cb + ca*r)*r)
+        q1 = np.where(backward, (q0 - cc) / r, cb + ca*r)
+        roots[cubic, :2], approximations[cubic, :2] = _quadraticRootsArray(ca, q1, q0, offset)
+
+        roots = _polishRootsArray(a[:, None], b[:, None], c[:, None], d[:, None], roots, approximations)
+
+    return roots
+
 def equation(*coefficient, offset=0):
+    coefficient = list(coefficient)
+    while len(coefficient) > 4 and coefficient[0] == 0:
+        coefficient.pop(0)
+    if len(coefficient) <= 4:
+        return set(cubicEquation(*([0] * (4 - len(coefficient)) + coefficient), offset=offset))
+
     re = []
     for r in np.roots(coefficient):
         if isinstance(r, np.float64):
@@ -388,43 +894,114 @@ def towPointCurve(p3, t1, pos1, t2, pos2):
 
     return Point(x1, y1), Point(x2, y2)
 
+_legendreWeights = (0.3626837833783620,0.3626837833783620,0.3137066458778873,0.3137066458778873,0.2223810344533745,0.2223810344533745,0.1012285362903763,0.1012285362903763,)
+_legendreAbscissae = (-0.1834346424956498,0.1834346424956498,-0.5255324099163290,0.5255324099163290,-0.7966664774136267,0.7966664774136267,-0.9602898564975363,0.9602898564975363,)
+
 class BezierCtrl(object):
+    _owner = None
+    _sharedGeneration = 0
+
     def __init__(self, pos:Point, p1:Point = Point(0,0), p2:Point = None) -> None:
-        self.p1 = p1
+        self._p1 = p1
         if p2 == None:
             self._p2 = pos
         else:
             self._p2 = p2
-        self.pos = pos
+        self._pos = pos
+        self._cache = {}
+        self._cacheKey = None
 
         # Test
         # if not self.isValid(1):
         #     if not (p1.isOrigin() and (p2 == None or p2.isOrigin()) and pos.isOrigin()):
         #         raise Exception('Empty bezier ctrl!')
 
+    @property
+    def p1(self):
+        return self._p1
+
+    @p1.setter
+    def p1(self, pos:Point):
+        self._p1 = pos
+        self._modified(False)
+
     @property
     def p2(self):
         if self._p2:
             return self._p2
         else:
-            return self.pos
+            return self._pos
 
     @p2.setter
     def p2(self, pos:Point):
         self._p2 = pos
+        self._modified(False)
+
+    @property
+    def pos(self):
+        return self._pos
+
+    @pos.setter
+    def pos(self, pos:Point):
+        self._pos = pos
+        self._modified()
+
+    def _modified(self, vertex=True):
+        self._cacheKey = None
+        owner = self._owner
+        if owner is _SHARED_OWNER:
+            BezierCtrl._sharedGeneration += 1
+        elif owner is not None:
+            path = owner()
+            if path is not None:
+                path._ctrlModified(vertex)
+
+    def _geometryKey(self):
+        p1 = self.p1
+        p2 = self._p2 or self.pos
+        pos = self.pos
+        return (p1._x, p1._y, p2._x, p2._y, pos._x, pos._y)
+
+    def _cached(self, name, func):
+        key = self._geometryKey()
+        if self._cacheKey != key:
+            self._cache = {}
+            self._cacheKey = key
+        cache = self._cache
+        if name not in cache:
+            cache[name] = func()
+        return cache[name]
 
     def casteljauPoints(self, t:float, pos:Point=Point(), limit=True):
         if limit and (t < 0 or t > 1):
             raise ValueError("Require value is between 0 ~ 1!")
         
-        posList = { 'n3': [], 'n2': [], 'n1': Point() }
-        posList['n3'].append(self.p1 * t + pos)
-        posList['n3'].append((self.p2 - self.p1) * t + self.p1 + pos)
-        posList['n3'].append((self.pos - self.p2) * t + self.p2 + pos)
-        posList['n2'].append((posList['n3'][1] - posList['n3'][0]) * t + posList['n3'][0])
-        posList['n2'].append((posList['n3'][2] - posList['n3'][1]) * t + posList['n3'][1])
-        posList['n1'] = (posList['n2'][1] - posList['n2'][0]) * t + posList['n2'][0]
-        return posList
+        p1x = self.p1._x
+        p1y = self.p1._y
+        p2 = self.p2
+        p2x = p2._x
+        p2y = p2._y
+        p3x = self.pos._x
+        p3y = self.pos._y
+        sx = pos._x
+        sy = pos._y
+
+        ax = p1x*t + sx
+        ay = p1y*t + sy
+        bx = (p2x - p1x)*t + p1x + sx
+        by = (p2y - p1y)*t + p1y + sy
+        cx = (p3x - p2x)*t + p2x + sx
+        cy = (p3y - p2y)*t + p2y + sy
+        dx = (bx - ax)*t + ax
+        dy = (by - ay)*t + ay
+        ex = (cx - bx)*t + bx
+        ey = (cy - by)*t + by
+
+        return {
+            'n3': [_point(ax, ay), _point(bx, by), _point(cx, cy)],
+            'n2': [_point(dx, dy), _point(ex, ey)],
+            'n1': _point((ex - dx)*t + dx, (ey - dy)*t + dy)
+        }
     
     def extension(self, t:float):
         cList = self.casteljauPoints(t, limit=False)
@@ -456,8 +1033,8 @@ class BezierCtrl(object):
         if ctrl.p2.distanceOffset(ctrl.pos, 0.01):
             ctrl.p2 = -ctrl.tangents(1, 10)[0]
         
-        k = copy.deepcopy(k)
-        pos = copy.deepcopy(pos)
+        k = _point(k.x, k.y)
+        pos = _point(pos.x, pos.y)
         rotate = 0
         while True:
             if ctrl.p1.x * ctrl.p1.y * (ctrl.p2.x - ctrl.pos.x) * (ctrl.p2.y - ctrl.pos.y) * k.x * k.y == 0 :
@@ -518,7 +1095,7 @@ class BezierCtrl(object):
         if self.p1.isOrigin() and self.p2.distanceOffset(self.pos, 0.1):
             return self
 
-        pos = copy.deepcopy(pos)
+        pos = _point(pos.x, pos.y)
         rotate = 0
         while True:
             A1 = self.p1.y
@@ -589,43 +1166,104 @@ class BezierCtrl(object):
         return self.rotate(-rotate)
 
     def lengthAt(self, t:float):
-        def f(v, t):
-            if v == 'x':
-                v1 = self.p1.x
-                v2 = self.p2.x
-                v3 = self.pos.x
-            else:
-                v1 = self.p1.y
-                v2 = self.p2.y
-                v3 = self.pos.y
-
-            return (3 * (1-t)**2 * v1 + 6 * (1-t) * t * (v2 - v1) + 3 * t**2 * (v3 - v2))**2
-        cList = [0.3626837833783620,0.3626837833783620,0.3137066458778873,0.3137066458778873,0.2223810344533745,0.2223810344533745,0.1012285362903763,0.1012285362903763,]
-        tList = [-0.1834346424956498,0.1834346424956498,-0.5255324099163290,0.5255324099163290,-0.7966664774136267,0.7966664774136267,-0.9602898564975363,0.9602898564975363,]
+        if t == 1:
+            return self._cached('length', lambda: self._lengthAt(1))
+        return self._lengthAt(t)
 
+    def _lengthAt(self, t:float, start=0):
         val = 0
-        t2 = t / 2
-        for i in range(0, len(cList)):
-            val += cList[i] * math.sqrt(f('x', t2 * tList[i] + t2) + f('y', t2 * tList[i] + t2))
+        t2 = (t - start) / 2
+        for c, v in zip(_legendreWeights, _legendreAbscissae):
+            val += c * self._speed(t2 * v + t2 + start)
         
         return t2 * val
+
+    def _speed(self, t):
+        p1 = self.p1
+        p2 = self.p2
+        p3 = self.pos
+        a = 3 * (1-t)**2
+        b = 6 * (1-t) * t
+        c = 3 * t**2
+        return math.hypot(a*p1._x + b*(p2._x - p1._x) + c*(p3._x - p2._x), a*p1._y + b*(p2._y - p1._y) + c*(p3._y - p2._y))
+
+    def speeds(self, ts):
+        ts = np.asarray(ts, dtype=np.float64)
+        mt = 1 - ts
+        a = 3 * mt**2
+        b = 6 * mt * ts
+        c = 3 * ts**2
+        p1 = self.p1
+        p2 = self.p2
+        p3 = self.pos
+        return np.hypot(a*p1._x + b*(p2._x - p1._x) + c*(p3._x - p2._x), a*p1._y + b*(p2._y - p1._y) + c*(p3._y - p2._y))
+
+    def lengthsAt(self, ts, starts=0):
+        ts = np.asarray(ts, dtype=np.float64)
+        starts = np.asarray(starts, dtype=np.float64)
+        half = (ts - starts) / 2
+        nodes = half[..., None] * _legendreAbscissae + (half + starts)[..., None]
+        return half * (self.speeds(nodes) * _legendreWeights).sum(axis=-1)
+
+    def _lengthTable(self):
+        SEGMENT = 16
+        ts = np.linspace(0, 1, SEGMENT+1)
+        lengths = np.concatenate([[0], np.cumsum(self.lengthsAt(ts[1:], ts[:-1]))])
+        return ts.tolist(), lengths.tolist()
+
+    def inDistances(self, pcts):
+        ts, lengths = self._cached('lengthTable', self._lengthTable)
+        ts = np.array(ts)
+        lengths = np.array(lengths)
+        pcts = np.asarray(pcts, dtype=np.float64)
+        total = lengths[-1]
+        if total == 0:
+            return pcts.copy()
+
+        target = np.clip(pcts, 0, 1) * total
+        index = np.clip(np.searchsorted(lengths, target, side='right') - 1, 0, len(ts) - 2)
+        s = ts[index]
+        e = ts[index+1]
+        t = np.interp(target, lengths, ts)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            for _ in range(3):
+                speed = self.speeds(t)
+                t = np.clip(np.where(speed > 0, t - (lengths[index] + self.lengthsAt(t, s) - target) / speed, t), s, e)
+
+        return np.where(pcts <= 0, 0.0, np.where(pcts >= 1, 1.0, t))
         
     def inDistance(self, pct:float, offset=0.1, interval=[0,1]):
+        MAX_ITERATIONS = 8
+
+        lo, hi = interval
         if pct == 0 or pct == 1:
-            return pct
-        length = self.lengthAt(1)
-        target = length * pct
-        s = interval[0]
-        e = interval[1]
-        for _ in range(0, 50):
-            t = (s + e) / 2
-            pLength = self.lengthAt(t)
-            if abs(pLength - target) < offset:
-                return t
-            elif pLength > target:
-                e = t
-            else:
-                s = t
+            return min(max(pct, lo), hi)
+        ts, lengths = self._cached('lengthTable', self._lengthTable)
+        if lengths[-1] == 0 or pct < 0 or pct > 1:
+            return min(max(pct, lo), hi)
+
+        target = lengths[-1] * pct
+        i = min(max(bisect.bisect_right(lengths, target) - 1, 0), len(ts) - 2)
+        if ts[i+1] <= lo:
+            return lo
+        if ts[i] >= hi:
+            return hi
+        s = max(ts[i], lo)
+        e = min(ts[i+1], hi)
+        sLength = lengths[i] + self._lengthAt(s, ts[i]) if s > ts[i] else lengths[i]
+        eLength = lengths[i+1] - self._lengthAt(ts[i+1], e) if e < ts[i+1] else lengths[i+1]
+        if target <= sLength:
+            return s
+        if target >= eLength:
+            return e
+
+        t = s + (e - s) * (target - sLength) / (eLength - sLength)
+        for _ in range(MAX_ITERATIONS):
+            error = sLength + self._lengthAt(t, s) - target
+            speed = self._speed(t)
+            if abs(error) < offset or speed == 0:
+                break
+            t = min(max(t - error / speed, s), e)
 
         return t
         
@@ -731,16 +1369,19 @@ class BezierCtrl(object):
         tLine = self.tangents(t, len, pos)
         return [(tLine[1] - tLine[0]).perpendicular(), tLine[0]]
 
-    def roots(self, x=None, y=None, pos:Point=Point(), offset=0, interval=[0, 1]):
+    def roots(self, x=None, y=None, pos:Point=Point(), offset=0, interval=[0, 1], transform:Transform=None):
         result = []
         
-        three = (self.p1+pos)*3 - (self.p2+pos)*3 - pos + (self.pos+pos)
-        two = pos*3 - (self.p1+pos)*6 + (self.p2+pos)*3
-        one = (self.p1+pos)*3 - pos*3
+        p0, p1, p2, p3 = pos, self.p1+pos, self.p2+pos, self.pos+pos
+        if transform is not None:
+            p0, p1, p2, p3 = (transform.applyPoint(p) for p in (p0, p1, p2, p3))
+        three = p1*3 - p2*3 - p0 + p3
+        two = p0*3 - p1*6 + p2*3
+        one = p1*3 - p0*3
         if x != None:
-            result += equation(three.x, two.x, one.x, pos.x-x, offset=offset)
+            result += equation(three.x, two.x, one.x, p0.x-x, offset=offset)
         if y != None:
-            result += equation(three.y, two.y, one.y, pos.y-y, offset=offset)
+            result += equation(three.y, two.y, one.y, p0.y-y, offset=offset)
         
         temp = []
         n = interval[0]-offset
@@ -760,7 +1401,80 @@ class BezierCtrl(object):
 
         return temp
     
+    def flatten(self, tolerance=.1):
+        return self._cached(('flatten', tolerance), lambda: self._flatten(tolerance))
+
+    def _flatten(self, tolerance):
+        p1 = np.array((self.p1._x, self.p1._y), dtype=np.float64)
+        p2 = np.array((self.p2._x, self.p2._y), dtype=np.float64)
+        p3 = np.array((self.pos._x, self.pos._y), dtype=np.float64)
+        if self.isNoControl():
+            n = 1
+        else:
+            m = max(np.hypot(*(p2 - p1*2)), np.hypot(*(p1 - p2*2 + p3)))
+            n = max(1, math.ceil(math.sqrt(.75 * m / tolerance)))
+        t = np.arange(1, n+1)[:, None] / n
+        mt = 1 - t
+        points = p1 * (3*mt*mt*t) + p2 * (3*mt*t*t) + p3 * t**3
+        points[-1] = p3
+        points.flags.writeable = False
+        return points
+
+    def windingNumbers(self, points, sPos:Point=Point(), offset=0):
+        points = _pointsArray(points)
+        winding = np.zeros(len(points), dtype=int)
+        boundary = np.zeros(len(points), dtype=bool)
+
+        p1 = self.p1
+        p2 = self.p2
+        p3 = self.pos
+        sx = sPos._x
+        sy = sPos._y
+        candidates = np.flatnonzero((points[:, 1] >= sy + min(0, p1._y, p2._y, p3._y) - offset) & (points[:, 1] <= sy + max(0, p1._y, p2._y, p3._y) + offset) & (points[:, 0] <= sx + max(0, p1._x, p2._x, p3._x) + offset))
+        if not len(candidates):
+            return winding, boundary
+        x = points[candidates, 0]
+        y = points[candidates, 1]
+
+        ax = 3*p1._x - 3*p2._x + p3._x
+        bx = 3*p2._x - 6*p1._x
+        cx = 3*p1._x
+        ay = 3*p1._y - 3*p2._y + p3._y
+        by = 3*p2._y - 6*p1._y
+        cy = 3*p1._y
+
+        tList = [0] + sorted(self.extermesXY()[1]) + [1]
+        yList = [sy] + [sy + ((ay*t + by)*t + cy)*t for t in tList[1:-1]] + [sy + p3._y]
+        for i in range(len(tList) - 1):
+            s = tList[i]
+            e = tList[i+1]
+            y0 = yList[i]
+            y1 = yList[i+1]
+            if y0 == y1:
+                if offset:
+                    xs = [sx + ((ax*t + bx)*t + cx)*t for t in (s, e)]
+                    boundary[candidates] |= (np.abs(y - y0) <= offset) & (x >= min(xs) - offset) & (x <= max(xs) + offset)
+                continue
+
+            mask = (y >= min(y0, y1)) & (y < max(y0, y1))
+            if not mask.any():
+                continue
+            py = y[mask]
+            roots = cubicEquations(np.stack([np.full(len(py), ay), np.full(len(py), by), np.full(len(py), cy), sy - py], axis=1))
+            valid = (roots >= s - 1e-9) & (roots <= e + 1e-9)
+            t = np.where(valid.any(axis=1), np.nanmax(np.where(valid, roots, -np.inf), axis=1), s + (e - s) * (py - y0) / (y1 - y0))
+            t = np.clip(t, s, e)
+            xt = sx + ((ax*t + bx)*t + cx)*t
+            winding[candidates[mask]] += np.where(xt > x[mask], 1 if y0 < y1 else -1, 0)
+            if offset:
+                boundary[candidates[mask]] |= np.abs(xt - x[mask]) <= offset
+
+        return winding, boundary
+
     def extermesXY(self):
+        return [list(r) for r in self._cached('extermesXY', self._extermesXY)]
+
+    def _extermesXY(self):
         def process(v1, v2, v3):
             a = 3*v3 - 6*v2 + 3*v1
             b = 6 * (v2 - v1)
@@ -774,6 +1488,10 @@ class BezierCtrl(object):
         return results
 
     def extermes(self, radian=0):
+        results = self._cached(('extermes', radian), lambda: self._extermes(radian))
+        return [list(results[0]), list(results[1]), results[2], results[3]]
+
+    def _extermes(self, radian=0):
         ctrl = self.rotate(radian)
         def second(v1, v2, v3):
             a = 3*v1- 3*v2 + v3
@@ -851,32 +1569,41 @@ class BezierCtrl(object):
         return list(tList.values())
         
     def boundingBox(self, startPos=Point()):
+        [left, bottom, right, top] = self._cached('boundingBox', self._boundingBox)
+        x = startPos._x
+        y = startPos._y
+        return Rect(_point(left + x, bottom + y), _point(right + x, top + y))
+
+    def _boundingBox(self):
         roots = self.extermes()
-        dotListX = []
-        dotListY = []
-        dotListX.extend([ startPos.x, startPos.x + self.pos.x ])
-        dotListY.extend([ startPos.y, startPos.y + self.pos.y ])
+        dotListX = [ 0, self.pos.x ]
+        dotListY = [ 0, self.pos.y ]
         for t in roots[0]:
             if t < 0 or t > 1:
                 continue
-            aPos = self.valueAt(t, startPos)
-            dotListX.append(aPos.x)
+            dotListX.append(self.valueAt(t).x)
         for t in roots[1]:
             if t < 0 or t > 1:
                 continue
-            aPos = self.valueAt(t, startPos)
-            dotListY.append(aPos.y)
+            dotListY.append(self.valueAt(t).y)
             
         if roots[2] and roots[2] > 0 and roots[2] < 1:
-            aPos = self.valueAt(roots[2], startPos)
-            dotListX.append(aPos.x)
+            dotListX.append(self.valueAt(roots[2]).x)
         if roots[3] and roots[3] > 0 and roots[3] < 1:
-            aPos = self.valueAt(roots[3], startPos)
-            dotListY.append(aPos.y)
+            dotListY.append(self.valueAt(roots[3]).y)
 
-        lbPos = Point(min(dotListX), min(dotListY))
-        rtPos = Point(max(dotListX), max(dotListY))
-        return Rect(lbPos, rtPos)
+        return [min(dotListX), min(dotListY), max(dotListX), max(dotListY)]
+
+    def clone(self):
+        ctrl = object.__new__(BezierCtrl)
+        pos = self._pos
+        p2 = self._p2
+        ctrl._pos = _point(pos._x, pos._y)
+        ctrl._p1 = _point(self._p1._x, self._p1._y)
+        ctrl._p2 = ctrl._pos if p2 is pos or not p2 else _point(p2._x, p2._y)
+        ctrl._cache = dict(self._cache)
+        ctrl._cacheKey = self._cacheKey
+        return ctrl
 
     def reverse(self):
         return BezierCtrl(p1=self.p2-self.pos, p2=self.p1-self.pos, pos=-self.pos)
@@ -956,6 +1683,9 @@ class BezierCtrl(object):
         return BezierCtrl(p1=p1-start, p2=p2-start, pos=end-start)
 
     def approximatedLength(self, segment=8):
+        return self._cached(('approximatedLength', segment), lambda: self._approximatedLength(segment))
+
+    def _approximatedLength(self, segment=8):
         lenPos = []
         unit = 1 / segment
         for v in range(1, segment):
@@ -1007,7 +1737,10 @@ class BezierCtrl(object):
 
         return [[], [], False]
 
-    def intersections(self, pos, other, otherPos:Point, interval=[0, 1]):
+    def intersectionPairs(self, pos, other, otherPos:Point, tolerance=.0001):
+        return clipBezier3Bezier3(pos, self.p1+pos, self.p2+pos, self.pos+pos, otherPos, other.p1+otherPos, other.p2+otherPos, other.pos+otherPos, tolerance)
+
+    def intersections(self, pos, other, otherPos:Point, interval=[0, 1], tolerance=.5):
         PIX_OFFSET = 1
 
         rect1 = self.boundingBox(pos)
@@ -1015,41 +1748,23 @@ class BezierCtrl(object):
         if not rect1.intersects(rect2, -PIX_OFFSET/2):
             return [[], []]
 
-        poslist = [[], []]
-        tOffset = [PIX_OFFSET/self.approximatedLength(), PIX_OFFSET/other.approximatedLength()]
+        if self.isLine() and other.isLine():
+            poslist = self.simplifiedCheck(pos, other, otherPos)
+            return poslist[:2]
 
-        l1 = self.isLine()
-        l2 = other.isLine()
-        if l1 and l2:
-            poslist[0], poslist[1], _ = self.simplifiedCheck(pos, other, otherPos)
-        elif l1:
-            r =  -self.pos.radian()
-            roots = other.rotate(r).roots(y=pos.y, pos=otherPos.rotate(r, pos), offset=tOffset[1], interval=[0, 1])
-            for t in roots: 
-                p = self.posAt(other.valueAt(t, otherPos), pos, min(1, self.approximatedLength()/50))
-                if len(p):
-                    poslist[0].append(p[0])
-                    poslist[1].append(t)
-        elif l2:
-            r =  -other.pos.radian()
-            roots = self.rotate(r).roots(y=otherPos.y, pos=pos.rotate(r, otherPos), offset=tOffset[0], interval=[0, 1])
-            for t in roots: 
-                p = other.posAt(self.valueAt(t, pos), otherPos, min(1, self.approximatedLength()/50))
-                if len(p):
-                    poslist[1].append(p[0])
-                    poslist[0].append(t)
-        else:
-            roots = intersectBezier3Bezier3(pos, self.p1+pos, self.p2+pos, self.pos+pos, otherPos, other.p1+otherPos, other.p2+otherPos, other.pos+otherPos, tOffset[1])
-            for t in roots:
-                if t >= interval[0] and t <= interval[1]:
-                    p = self.posAt(other.valueAt(t, otherPos), pos, min(1, self.approximatedLength()/50))
-                    if len(p):
-                        poslist[0].append(p[0])
-                        poslist[1].append(t)
-            
-            if len(poslist[1]) == 0:
-                return [self.posAt(otherPos, pos, 5) + self.posAt(otherPos+other.pos, pos, 5), other.posAt(pos, otherPos, 5) + other.posAt(pos+self.pos, otherPos, 5)]
+        pairs, overlaps = self.intersectionPairs(pos, other, otherPos)
+        for (s0, s1), (u0, u1) in overlaps:
+            pairs += [(s0, u0), (s1, u1)]
+        if tolerance > 0:
+            a = tuple((p.x, p.y) for p in (pos, self.p1+pos, self.p2+pos, self.pos+pos))
+            b = tuple((p.x, p.y) for p in (otherPos, other.p1+otherPos, other.p2+otherPos, other.pos+otherPos))
+            pairs += _cubicNearEnds(a, b, pairs, tolerance)
 
+        poslist = [[], []]
+        for s, u in sorted(pairs):
+            if s >= interval[0] and s <= interval[1]:
+                poslist[0].append(s)
+                poslist[1].append(u)
         return poslist
 
     def appIntersections(self, pos, other, otherPos:Point, interval=[0, 1], preCtrl1=None, preCtrl2=None):
@@ -1119,88 +1834,9 @@ class BezierCtrl(object):
             
             return len(list1)
 
-        # binarySearch
-        def binarySearch(ctrl1, pos1, list1, ctrl2, pos2, list2):
-            rect1 = ctrl1.boundingBox(pos1)
-            rect2 = ctrl2.boundingBox(pos2)
-
-            if rect1.intersects(rect2, -PIX_OFFSET/2):
-                if ctrl1.curve() > RADIANT and (rect1.width > PIX_OFFSET or rect1.height > PIX_OFFSET):
-                    splitCtrl = ctrl1.splitting(.5)
-                    ok = False
-
-                    rList = []
-                    if binarySearch(ctrl2, pos2, list2, splitCtrl[0], pos1, rList):
-                        for i in range(0, len(rList)):
-                            rList[i] *= .5
-                        list1.extend(rList)
-                        ok = True
-
-                    rList = []
-                    if binarySearch(ctrl2, pos2, list2, splitCtrl[1], splitCtrl[0].pos + pos1, rList):
-                        for i in range(0, len(rList)):
-                            rList[i] = rList[i]*.5 + .5
-                        list1.extend(rList)
-                        ok = True
-
-                    return ok
-                elif ctrl2.curve() > RADIANT and (rect2.width > PIX_OFFSET or rect2.height > PIX_OFFSET):
-                    splitCtrl = ctrl2.splitting(.5)
-                    ok = False
-
-                    rList = []
-                    if binarySearch(ctrl1, pos1, list1, splitCtrl[0], pos2, rList):
-                        for i in range(0, len(rList)):
-                            rList[i] *= .5
-                        list2.extend(rList)
-                        ok = True
-                        
-                    rList = []
-                    if binarySearch(ctrl1, pos1, list1, splitCtrl[1], splitCtrl[0].pos + pos2, rList):
-                        for i in range(0, len(rList)):
-                            rList[i] = rList[i]*.5 + .5
-                        list2.extend(rList)
-                        ok = True
-
-                    return ok
-                else:
-                    def findTFromPos(ctrl, pos, sPos):
-                        r1 = ctrl.posAt(pos, sPos, 1, interval=[0, 1])
-                        if len(r1):
-                            r1 = [sum(r1) / len(r1)]
-                        return r1
-
-                    b1 = rect1.width > PIX_OFFSET or rect1.height > PIX_OFFSET
-                    b2 = rect2.width > PIX_OFFSET or rect2.height > PIX_OFFSET
-                    # b1 = ctrl1.curve() < RADIANT
-                    # b2 = ctrl2.curve() < RADIANT
-                    if b1 and b2:
-                        r1, r2, _ = ctrl1.simplifiedCheck(pos1, ctrl2, pos2)
-                        list1.extend(r1)
-                        list2.extend(r2)
-                        return len(r1)
-                    elif b1:
-                        r = findTFromPos(ctrl1, ctrl2.valueAt(.5, pos2), pos1)
-                        if len(r):
-                            list1 += r
-                            list2.append(.5)
-                        return len(r)
-                    elif b2:
-                        r = findTFromPos(ctrl2, ctrl1.valueAt(.5, pos1), pos2)
-                        if len(r):
-                            list2 += r
-                            list1.append(.5)
-                        return len(r)
-                    else:
-                        list1.append(.5)
-                        list2.append(.5)
-                        return True
-            else:
-                return False
-
-        poslist = [[], []]
-        check = binarySearch
-        check(self, pos, poslist[0], other, otherPos, poslist[1])
+        a = [(p.x, p.y) for p in (pos, self.p1+pos, self.p2+pos, self.pos+pos)]
+        b = [(p.x, p.y) for p in (otherPos, other.p1+otherPos, other.p2+otherPos, other.pos+otherPos)]
+        poslist = list(subdivideBezier3Pairs([(a, b)], PIX_OFFSET)[0])
         #check = simplifiedCheck
         #check(self, pos, poslist[0], other, otherPos, poslist[1])
 
@@ -1290,11 +1926,20 @@ class BezierCtrl(object):
         return [cList, tList]
 
     def scale(self, scale=Point(1,1)):
-        self.pos.transform(scale, Point())
-        if not self.p1.isOrigin(): self.p1.transform(scale, Point())
-        if self._p2 and self._p2 != self.pos: self.p2.transform(scale, Point())
+        pos = self._pos
+        p2 = self._p2
+        self._pos = _point(pos._x * scale._x, pos._y * scale._y)
+        self._p1 = _point(self._p1._x * scale._x, self._p1._y * scale._y)
+        if p2 and p2 is not pos:
+            self._p2 = _point(p2._x * scale._x, p2._y * scale._y)
+        else:
+            self._p2 = self._pos
+        self._modified()
 
     def isLine(self):
+        return self._cached('isLine', self._isLine)
+
+    def _isLine(self):
         OFFSET = .1
         return abs(self.p1.rotate(-self.pos.radian()).y) < OFFSET and abs(self.p2.rotate(-self.pos.radian()).y) < OFFSET
 
@@ -1367,9 +2012,388 @@ def _connectPaths(paths):
 
     return temp
            
+def _formatNumbers(values):
+    text = _re_numberTrim.sub('', ' '.join(map(repr, values.ravel().tolist())) + ' ')
+    return np.array(text.split(' ')[:-1], dtype=object).reshape(values.shape).tolist()
+
+def _joinNumbers(values):
+    result = [values[0]]
+    for v in values[1:]:
+        if v[0] != '-':
+            result.append(' ')
+        result.append(v)
+    return ''.join(result)
+
+def _writeText(stream, text):
+    if isinstance(stream, io.TextIOBase):
+        stream.write(text)
+    else:
+        stream.write(text.encode('utf-8'))
+
+def _pointsArray(points):
+    if isinstance(points, np.ndarray):
+        return points.astype(np.float64, copy=False).reshape(-1, 2)
+    return np.array([(p.x, p.y) for p in points], dtype=np.float64).reshape(-1, 2)
+
+def _polylineWindings(polyline, points):
+    CHUNK = 1 << 20
+
+    if (polyline[0] != polyline[-1]).any():
+        polyline = np.concatenate([polyline, polyline[:1]])
+    x0 = polyline[:-1, 0]
+    y0 = polyline[:-1, 1]
+    x1 = polyline[1:, 0]
+    y1 = polyline[1:, 1]
+    winding = np.zeros(len(points), dtype=int)
+    step = max(1, CHUNK // max(1, len(x0)))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for s in range(0, len(points), step):
+            px = points[s:s+step, 0, None]
+            py = points[s:s+step, 1, None]
+            up = (y0 <= py) & (py < y1)
+            down = (y1 <= py) & (py < y0)
+            right = x0 + (py - y0) * (x1 - x0) / (y1 - y0) > px
+            winding[s:s+step] = (up & right).sum(axis=1) - (down & right).sum(axis=1)
+    return winding
+
+def _polylineDistances(polyline, points):
+    CHUNK = 1 << 20
+
+    if len(polyline) == 1:
+        return np.hypot(*(points - polyline[0]).T)
+    p0 = polyline[:-1]
+    d = polyline[1:] - p0
+    length = (d**2).sum(axis=1)
+    length[length == 0] = 1
+    distances = np.empty(len(points))
+    step = max(1, CHUNK // len(p0))
+    for s in range(0, len(points), step):
+        v = points[s:s+step, None] - p0
+        t = np.clip((v * d).sum(axis=2) / length, 0, 1)
+        distances[s:s+step] = np.sqrt(((v - d * t[..., None])**2).sum(axis=2)).min(axis=1)
+    return distances
+
+def _cutPath(path, tLists, offset):
+    ctrlList = []
+    breaks = set()
+    for ctrl, tList in zip(path, tLists):
+        kept = []
+        for t in sorted(tList):
+            if t <= 0:
+                breaks.add(len(ctrlList))
+                continue
+            if t >= 1:
+                breaks.add(len(ctrlList) + len(kept) + 1)
+                continue
+            splits = ctrl.splittings(kept[-1:] + [t])
+            if not splits[-2].isValid(offset):
+                if not kept:
+                    breaks.add(len(ctrlList))
+            elif not splits[-1].isValid(offset):
+                breaks.add(len(ctrlList) + len(kept) + 1)
+            else:
+                kept.append(t)
+        for i in range(len(kept)):
+            breaks.add(len(ctrlList) + i + 1)
+        ctrlList.extend(ctrl.splittings(kept))
+
+    breaks = sorted(set(b % len(ctrlList) for b in breaks))
+    if not breaks:
+        return [path]
+
+    starts = [path.startPos()]
+    for ctrl in ctrlList:
+        starts.append(starts[-1] + ctrl.pos)
+
+    fragments = []
+    for i, b in enumerate(breaks):
+        e = breaks[(i+1) % len(breaks)]
+        if e <= b:
+            e += len(ctrlList)
+        fragment = BezierPath()
+        fragment.start(starts[b])
+        for j in range(b, e):
+            fragment.append(ctrlList[j % len(ctrlList)])
+        fragments.append(fragment)
+    return fragments
+
+def _stitchPaths(paths):
+    OFFSET = 2
+
+    temp = [p for p in paths if not p.isClose()]
+    paths = [p for p in paths if p.isClose()]
+    while len(temp):
+        connectPath = temp.pop(0)
+        while not connectPath.endPos().distanceOffset(connectPath.startPos(), OFFSET):
+            pos = connectPath.endPos()
+            nearest = None
+            distance = OFFSET
+            for i, p in enumerate(temp):
+                d = pos.distance(p.startPos())
+                if d < distance:
+                    nearest = i
+                    distance = d
+            if nearest is None:
+                for i, p in enumerate(temp):
+                    d = pos.distance(p.endPos())
+                    if d < distance:
+                        nearest = i
+                        distance = d
+                if nearest is None:
+                    break
+                temp[nearest] = temp[nearest].reverse()
+            connectPath.connectPath(temp.pop(nearest))
+        if connectPath.endPos().distanceOffset(connectPath.startPos(), OFFSET):
+            connectPath.close()
+            paths.append(connectPath)
+
+    return paths
+
+def _pointsInBox(points, box, offset=0):
+    return (points[:, 0] > box.left - offset) & (points[:, 0] < box.right + offset) & (points[:, 1] > box.bottom - offset) & (points[:, 1] < box.top + offset)
+
+def _fragmentSamples(fragment, count):
+    ctrls = [i for i, ctrl in enumerate(fragment) if ctrl.isValid(5)] or list(range(len(fragment)))
+    per = -(-count // len(ctrls))
+    if per == 1:
+        ctrls = [ctrls[(2*k + 1) * len(ctrls) // (2*count)] for k in range(count)]
+    return [(i, (2*k + 1) / (2*per)) for i in ctrls for k in range(per)]
+
+def _polylineDirection(polyline, point):
+    p0 = polyline[:-1]
+    d = polyline[1:] - p0
+    length = (d**2).sum(axis=1)
+    length[length == 0] = 1
+    v = point - p0
+    t = np.clip((v * d).sum(axis=1) / length, 0, 1)
+    return d[np.argmin(((v - d * t[:, None])**2).sum(axis=1))]
+
+def _coincidentFragments(polylines, samples, tolerance):
+    ends = np.array([(line[0], line[-1]) for line in polylines]).reshape(-1, 2, 2)
+    def near(a, b):
+        return np.hypot(a[:, None, 0] - b[None, :, 0], a[:, None, 1] - b[None, :, 1]) < tolerance
+    matches = (near(ends[:, 0], ends[:, 0]) & near(ends[:, 1], ends[:, 1])) | (near(ends[:, 0], ends[:, 1]) & near(ends[:, 1], ends[:, 0]))
+
+    links = [[] for _ in polylines]
+    for i, j in np.argwhere(np.triu(matches, 1)):
+        if (_polylineDistances(polylines[j], samples[i][0]) < tolerance).all() and (_polylineDistances(polylines[i], samples[j][0]) < tolerance).all():
+            mid = len(samples[i][0]) // 2
+            direction = 1 if np.dot(samples[i][1][mid], _polylineDirection(polylines[j], samples[i][0][mid])) >= 0 else -1
+            links[i].append((j, direction))
+            links[j].append((i, direction))
+
+    groups = np.arange(len(polylines))
+    directions = np.ones(len(polylines), dtype=int)
+    for root in range(len(polylines)):
+        if groups[root] != root or not links[root]:
+            continue
+        stack = [root]
+        seen = {root}
+        while stack:
+            i = stack.pop()
+            for j, direction in links[i]:
+                if j not in seen:
+                    seen.add(j)
+                    groups[j] = root
+                    directions[j] = directions[i] * direction
+                    stack.append(j)
+    return groups, directions
+
+class _BoxIndex(object):
+    def __init__(self, path, offset=0):
+        self._path = path
+        self._offset = offset
+        self._starts = []
+        self._boxes = np.empty((0, 4))
+        self.update(0)
+
+    def update(self, index):
+        path = self._path
+        del self._starts[index:]
+        if index:
+            pos = self._starts[-1] + path[index-1].pos
+        else:
+            pos = path.startPos()
+        boxes = []
+        for i in range(index, len(path)):
+            self._starts.append(pos)
+            box = path[i].boundingBox(pos)
+            boxes.append((box.left, box.bottom, box.right, box.top))
+            pos += path[i].pos
+        self._boxes = np.concatenate([self._boxes[:index], np.array(boxes, dtype=np.float64).reshape(-1, 4)])
+
+    def startPos(self, index):
+        return self._starts[index]
+
+    def query(self, rect, start=0):
+        boxes = self._boxes[start:]
+        offset = self._offset
+        hits = (boxes[:, 2] - rect.left > offset) & (rect.right - boxes[:, 0] > offset) & (rect.top - boxes[:, 1] > offset) & (boxes[:, 3] - rect.bottom > offset)
+        return (np.flatnonzero(hits) + start).tolist()
+
+def _cross(a, b):
+    return a[..., 0]*b[..., 1] - a[..., 1]*b[..., 0]
+
+def _offsetFits(points, t0, t1, radius):
+    tm = (t0 + t1) / 2
+    starts = _cubicValues(points, t0)
+    ends = _cubicValues(points, t1)
+    startDirs = _cubicDirections(points, t0)
+    endDirs = _cubicDirections(points, t1)
+    midNormals = _cubicDirections(points, tm)[:, ::-1] * (1, -1) * radius
+    startNormals = startDirs[:, ::-1] * (1, -1) * radius
+    endNormals = endDirs[:, ::-1] * (1, -1) * radius
+    mids = _cubicValues(points, tm)
+
+    chord = np.hypot(*(ends - starts).T)
+    handle1 = np.hypot(*_cubicDerivatives(points, t0).T) * (t1 - t0) / 3
+    handle2 = np.hypot(*_cubicDerivatives(points, t1).T) * (t1 - t0) / 3
+    det = _cross(startDirs, -endDirs)
+
+    fits = np.empty((len(points), 2, 4, 2))
+    for side, sign in enumerate((1, -1)):
+        o0 = starts + startNormals*sign
+        o3 = ends + endNormals*sign
+        rhs = (mids + midNormals*sign - (o0 + o3) / 2) * 8 / 3
+        alpha = np.divide(_cross(rhs, -endDirs), det, out=np.full(len(det), -1.), where=np.abs(det) > 1e-3)
+        beta = np.divide(_cross(startDirs, rhs), det, out=np.full(len(det), -1.), where=np.abs(det) > 1e-3)
+
+        offsetChord = np.hypot(*(o3 - o0).T)
+        ratio = np.divide(offsetChord, chord, out=np.ones(len(chord)), where=chord > 1e-9)
+        bad = (alpha < 0) | (beta < 0) | (alpha > offsetChord*2) | (beta > offsetChord*2)
+        alpha = np.where(bad, handle1*ratio, alpha)
+        beta = np.where(bad, handle2*ratio, beta)
+
+        fits[:, side, 0] = o0
+        fits[:, side, 1] = o0 + startDirs*alpha[:, None]
+        fits[:, side, 2] = o3 - endDirs*beta[:, None]
+        fits[:, side, 3] = o3
+
+    errors = np.zeros(len(points))
+    for s in (.25, .75):
+        ts = t0 + (t1 - t0)*s
+        for side in range(2):
+            approx = _cubicValues(fits[:, side], np.full(len(points), s))
+            t = ts
+            for _ in range(2):
+                diff = _cubicValues(points, t) - approx
+                d1 = _cubicDerivatives(points, t)
+                d2 = _cubicDerivatives(points, t, 2)
+                f = np.sum(diff*d1, axis=1)
+                df = np.sum(d1*d1, axis=1) + np.sum(diff*d2, axis=1)
+                t = np.clip(t - np.divide(f, df, out=np.zeros(len(f)), where=df > 1e-12), t0, t1)
+            distance = np.hypot(*(_cubicValues(points, t) - approx).T)
+            errors = np.maximum(errors, np.abs(distance - radius))
+
+    return fits, startNormals, endNormals, errors
+
+def _offsetPieces(points, seeds, radius, tolerance, maxDepth=10):
+    index = np.array([k for k, ts in enumerate(seeds) for _ in ts[1:]], dtype=np.int64)
+    t0 = np.array([t for ts in seeds for t in ts[:-1]], dtype=np.float64)
+    t1 = np.array([t for ts in seeds for t in ts[1:]], dtype=np.float64)
+
+    accepted = []
+    for depth in range(maxDepth + 1):
+        if not len(index):
+            break
+        fits, startNormals, endNormals, errors = _offsetFits(points[index], t0, t1, radius)
+        done = (errors <= tolerance) | (depth == maxDepth)
+        accepted.append((index[done], t0[done], fits[done], startNormals[done], endNormals[done]))
+
+        split = ~done
+        tm = (t0[split] + t1[split]) / 2
+        index = np.repeat(index[split], 2)
+        t0, t1 = np.stack([t0[split], tm], axis=1).ravel(), np.stack([tm, t1[split]], axis=1).ravel()
+
+    index, t0, fits, startNormals, endNormals = [np.concatenate(v) for v in zip(*accepted)]
+    order = np.lexsort((t0, index))
+    fits = (fits[order] - fits[order][:, :, :1]).tolist()
+    startNormals = startNormals[order].tolist()
+    endNormals = endNormals[order].tolist()
+    index = index[order].tolist()
+
+    pieces = [[] for _ in seeds]
+    for i, k in enumerate(index):
+        ctrls = [BezierCtrl(p1=_point(*f[1]), p2=_point(*f[2]), pos=_point(*f[3])) for f in fits[i]]
+        pieces[k].append((_point(*startNormals[i]), _point(*endNormals[i]), ctrls[0], ctrls[1]))
+    return pieces
+
+def _trimJoin(ctrl1, ctrl2, offset):
+    a = ((0, 0), (ctrl1.p1.x, ctrl1.p1.y), (ctrl1.p2.x, ctrl1.p2.y), (ctrl1.pos.x, ctrl1.pos.y))
+    ox, oy = offset.x, offset.y
+    b = ((ox, oy), (ctrl2.p1.x+ox, ctrl2.p1.y+oy), (ctrl2.p2.x+ox, ctrl2.p2.y+oy), (ctrl2.pos.x+ox, ctrl2.pos.y+oy))
+
+    ax, ay = _cubicDirection(a, 1)
+    bx, by = _cubicDirection(b, 0)
+    gx, gy = ox - a[3][0], oy - a[3][1]
+    det = ay*bx - ax*by
+    chordA = math.hypot(a[3][0], a[3][1])
+    chordB = math.hypot(b[3][0] - ox, b[3][1] - oy)
+    if abs(det) < 1e-12 or chordA == 0 or chordB == 0:
+        return None
+    lenA = (gy*bx - gx*by) / det * math.hypot(ax, ay)
+    lenB = (ax*gy - ay*gx) / det * math.hypot(bx, by)
+    s = min(max(1 + lenA / chordA, .001), .999)
+    u = min(max(lenB / chordB, .001), .999)
+
+    for _ in range(24):
+        (x1, y1), (x2, y2) = _cubicAt(a, s), _cubicAt(b, u)
+        fx, fy = x1 - x2, y1 - y2
+        if abs(fx) + abs(fy) < 1e-7:
+            return s, u
+        jax, jay = _cubicDerivative(a, s)
+        jbx, jby = _cubicDerivative(b, u)
+        jbx, jby = -jbx, -jby
+        det = jax*jby - jay*jbx
+        if abs(det) < 1e-12:
+            return None
+        s = min(max(s - (fx*jby - fy*jbx) / det, 0.), 1.)
+        u = min(max(u - (jax*fy - jay*fx) / det, 0.), 1.)
+    return None
+
+_SHARED_OWNER = object()
+
+class _VertexCache(object):
+    __slots__ = ('ctrlList', 'start', 'xs', 'ys', 'shared', 'ctrls')
+
+    def __init__(self, ctrlList, start, xs, ys, shared, ctrls=None):
+        self.ctrlList = ctrlList
+        self.start = start
+        self.xs = xs
+        self.ys = ys
+        self.shared = shared
+        self.ctrls = ctrls
+
+    def copy(self, ctrlList, start):
+        return _VertexCache(ctrlList, start, self.xs[:], self.ys[:], self.shared, self.ctrls)
+
 class BezierPath(object):
+    _vertexCache = None
+    _sharedCtrls = False
+
     def __init__(self) -> None:
-        self._ctrlList = []
+        self._pending = None
+        self._ctrls = []
+
+    @property
+    def _ctrlList(self):
+        if self._pending is not None:
+            self._materialize()
+        return self._ctrls
+
+    @_ctrlList.setter
+    def _ctrlList(self, value):
+        self._ctrls = value
+
+    @property
+    def _startPos(self):
+        if self._pending is not None:
+            self._materialize()
+        return self._start
+
+    @_startPos.setter
+    def _startPos(self, value):
+        self._start = value
 
     def __iter__(self):
         return iter(self._ctrlList)
@@ -1382,6 +2406,30 @@ class BezierPath(object):
 
     def __setitem__(self, index, value:BezierCtrl):
         self._ctrlList[index] = value
+        self._adopt(value if isinstance(index, slice) else [value])
+        if isinstance(index, slice):
+            self._vertexCache = None
+        else:
+            self._dropVertices(index + len(self._ctrlList) if index < 0 else index)
+
+    def clone(self):
+        newPath = object.__new__(BezierPath)
+        newPath.__dict__.update(self.__dict__)
+        if self._pending is not None:
+            return newPath
+
+        ref = weakref.ref(newPath)
+        ctrlList = [ctrl.clone() for ctrl in self._ctrlList]
+        for ctrl in ctrlList:
+            ctrl._owner = ref
+        newPath._ctrlList = ctrlList
+        newPath._sharedCtrls = False
+        if '_start' in self.__dict__:
+            newPath._start = _point(self._start._x, self._start._y)
+        cache = self._vertexCache
+        if cache is not None:
+            newPath._vertexCache = cache.copy(newPath._ctrlList, newPath._startPos)
+        return newPath
 
     def __and__(self, path):
         if len(self) == 0 or len(path) == 0:
@@ -1393,12 +2441,8 @@ class BezierPath(object):
         a = 0
         b = 1
         while True:
-            temp = []
-            for p in newPaths[a]:
-                pos = p[0].valueAt(.5, p.startPos())
-                if oldPath[b].containsPos(pos):
-                    temp.append(p)
-            newPaths[a] = temp
+            contains = oldPath[b].containsPoints([p[0].valueAt(.5, p.startPos()) for p in newPaths[a]])
+            newPaths[a] = [p for p, c in zip(newPaths[a], contains) if c]
             if a == 0:
                 a, b = b, a
             else:
@@ -1422,12 +2466,8 @@ class BezierPath(object):
         a = 0
         b = 1
         while True:
-            temp = []
-            for p in newPaths[a]:
-                pos = p[0].valueAt(.5, p.startPos())
-                if not oldPath[b].containsPos(pos):
-                    temp.append(p)
-            newPaths[a] = temp
+            contains = oldPath[b].containsPoints([p[0].valueAt(.5, p.startPos()) for p in newPaths[a]])
+            newPaths[a] = [p for p, c in zip(newPaths[a], contains) if not c]
             if a == 0:
                 a, b = b, a
             else:
@@ -1446,15 +2486,14 @@ class BezierPath(object):
         b = 1
         flag = True
         while True:
-            temp = []
+            posList = []
             for p in newPaths[a]:
                 i = 0
                 while not p[i].isValid(5) and i + 1 != len(p):
                     i += 1
-                pos = p[i].valueAt(.5, p.startPos())
-                if oldPath[b].containsPos(pos) ^ flag:
-                    temp.append(p)
-            newPaths[a] = temp
+                posList.append(p[i].valueAt(.5, p.startPos()))
+            contains = oldPath[b].containsPoints(posList)
+            newPaths[a] = [p for p, c in zip(newPaths[a], contains) if c ^ flag]
             if a == 0:
                 a, b = b, a
                 flag = False
@@ -1467,23 +2506,89 @@ class BezierPath(object):
         self._startPos.transform(scale, move)
         for ctrl in self._ctrlList:
             ctrl.scale(scale)
+        self._vertexCache = None
 
     def insert(self, index, value:BezierCtrl):
         self._ctrlList.insert(index, value)
+        self._adopt([value])
+        self._dropVertices(max(0, index + len(self._ctrlList) - 1) if index < 0 else index)
 
     def extend(self, iterable):
+        count = len(self._ctrlList)
         self._ctrlList.extend(iterable)
+        self._adopt(self._ctrlList[count:])
 
     def popFront(self):
         self._ctrlList.pop(0)
+        self._dropVertices(0)
 
     def popBack(self):
         self._ctrlList.pop()
+        self._dropVertices(len(self._ctrlList))
 
     def scale(self, value):
         self._startPos.scale(value)
         for ctrl in self._ctrlList:
             ctrl.scale(value)
+        self._vertexCache = None
+
+    def _adopt(self, ctrls):
+        ref = weakref.ref(self)
+        for ctrl in ctrls:
+            owner = ctrl._owner
+            if owner is None or owner is ref:
+                ctrl._owner = ref
+                continue
+            path = None if owner is _SHARED_OWNER else owner()
+            if path is None and owner is not _SHARED_OWNER:
+                ctrl._owner = ref
+                continue
+            if path is not None:
+                path._sharedCtrls = True
+            ctrl._owner = _SHARED_OWNER
+            self._sharedCtrls = True
+
+    def _ctrlModified(self, vertex):
+        cache = self._vertexCache
+        if cache is None:
+            return
+        if vertex:
+            self._vertexCache = None
+        else:
+            cache.ctrls = None
+
+    def _dropVertices(self, index):
+        cache = self._vertexCache
+        if cache is not None:
+            cache.ctrls = None
+            if len(cache.xs) > index + 1:
+                del cache.xs[index+1:]
+                del cache.ys[index+1:]
+
+    def _vertices(self, count):
+        ctrlList = self._ctrlList
+        start = self._startPos
+        cache = self._vertexCache
+        shared = BezierCtrl._sharedGeneration if self._sharedCtrls else 0
+        if cache is None or cache.shared != shared or cache.ctrlList is not ctrlList or cache.start is not start or cache.xs[0] != start._x or cache.ys[0] != start._y:
+            cache = _VertexCache(ctrlList, start, [start._x], [start._y], shared)
+            self._vertexCache = cache
+        xs = cache.xs
+        ys = cache.ys
+        if len(xs) < count:
+            x = xs[-1]
+            y = ys[-1]
+            for ctrl in ctrlList[len(xs)-1:count-1]:
+                pos = ctrl.pos
+                x += pos._x
+                y += pos._y
+                xs.append(x)
+                ys.append(y)
+        return xs, ys
+
+    def vertices(self, start=0, stop=None):
+        xs, ys = self._vertices(len(self._ctrlList) + 1)
+        return np.array([xs[start:stop], ys[start:stop]], dtype=np.float64).T.reshape(-1, 2)
 
     def startPos(self):
         return self._startPos
@@ -1502,6 +2607,7 @@ class BezierPath(object):
             if ep != sp:
                 if ep.distance(sp) < OFFSET:
                     self[-1].pos += sp - ep
+                    self._dropVertices(len(self) - 1)
                 else:
                     self.connect(sp - ep)
             
@@ -1519,18 +2625,80 @@ class BezierPath(object):
             return
         if s:
             p1 = self._ctrlList[-1].pos - self._ctrlList[-1].p2
-        self._ctrlList.append(BezierCtrl(pos, p1, p2))
+        ctrl = BezierCtrl(pos, p1, p2)
+        ctrl._owner = weakref.ref(self)
+        self._ctrlList.append(ctrl)
 
     def connectPath(self, path):
         if self.isClose() or path.isClose():
             raise Exception('Cannot connect closed path!')
-        self._ctrlList.extend(iter(path))
+        self.extend(iter(path))
 
     def append(self, ctrl:BezierCtrl):
         self._ctrlList.append(ctrl)
+        self._adopt([ctrl])
         
     def backCtrl(self):
         return self._ctrlList[-1]
+
+    def toPathData(self, precision=3, mode='auto'):
+        if mode not in ('auto', 'absolute', 'relative'):
+            raise ValueError('Unknown path data mode: {}'.format(mode))
+
+        points = np.round(self.toArray().controlPoints(), precision) + 0.0
+        if not len(points):
+            points = np.round([[(self._startPos.x, self._startPos.y)]], precision) + 0.0
+        points[1:, 0] = points[:-1, 3]
+        deltas = np.round(points[:, 1:] - points[:, :1], precision) + 0.0
+        points = _formatNumbers(points)
+        deltas = _formatNumbers(deltas)
+
+        data = ['M', _joinNumbers(points[0][0])]
+        pre = 'M'
+        for i, ctrl in enumerate(self._ctrlList):
+            p = points[i]
+            d = deltas[i]
+            if ctrl.p1.isOrigin() and (ctrl.p2.isOrigin() or ctrl.p2 == ctrl.pos):
+                if p[3][1] == p[0][1]:
+                    commands = [('H', [p[3][0]]), ('h', [d[2][0]])]
+                elif p[3][0] == p[0][0]:
+                    commands = [('V', [p[3][1]]), ('v', [d[2][1]])]
+                else:
+                    commands = [('L', p[3]), ('l', d[2])]
+            else:
+                commands = [('C', p[1] + p[2] + p[3]), ('c', d[0] + d[1] + d[2])]
+
+            if mode == 'absolute':
+                command, values = commands[0]
+            elif mode == 'relative':
+                command, values = commands[1]
+            else:
+                command, values = min(commands, key=lambda c: (sum(map(len, c[1])), c[0] != pre))
+            values = _joinNumbers(values)
+            if command == pre:
+                data.append(values if values[0] == '-' else ' ' + values)
+            else:
+                data.append(command)
+                data.append(values)
+            pre = command
+
+        if self.isClose():
+            data.append('z')
+        return ''.join(data)
+
+    def toArray(self):
+        if self._pending is not None:
+            ctrls, start, transform = self._pending
+            return BezierArray(ctrls, start, self.isClose()).transformed(transform)
+
+        self._vertices(1)
+        cache = self._vertexCache
+        ctrls = cache.ctrls
+        if ctrls is None or len(ctrls) != len(self._ctrlList):
+            ctrls = np.array([(c._p1._x, c._p1._y, c._p2._x, c._p2._y, c._pos._x, c._pos._y) for c in self._ctrlList], dtype=np.float64).reshape(-1, 3, 2)
+            ctrls.flags.writeable = False
+            cache.ctrls = ctrls
+        return BezierArray(ctrls, self._startPos, self.isClose())
     
     def boundingBox(self):
         rect = Rect(Point(99999, 99999), Point())
@@ -1545,25 +2713,31 @@ class BezierPath(object):
 
         return rect
 
-    def rotate(self, radian, center:Point=Point()):
+    def transformed(self, transform:Transform):
+        if self._pending is not None:
+            ctrls, start, pre = self._pending
+            transform = pre.compose(transform)
+        else:
+            ctrls, start = self.toArray().ctrls, self.startPos()
         newPath = BezierPath()
-        newPath.start(self.startPos().rotate(radian, center))
-        for ctrl in self._ctrlList:
-            newPath.append(ctrl.rotate(radian))
-
+        newPath._pending = (ctrls, start, transform)
         if self.isClose():
-            newPath.close()
+            newPath.z = True
         return newPath
+
+    def _materialize(self):
+        ctrls, start, transform = self._pending
+        self._pending = None
+        path = BezierArray(ctrls, start).transformed(transform).toPath()
+        self._ctrls = path._ctrls
+        self._start = path._start
+        self._adopt(self._ctrls)
+
+    def rotate(self, radian, center:Point=Point()):
+        return self.transformed(Transform.rotation(radian, center))
     
     def mirror(self, p1, p2):
-        newPath = BezierPath()
-        newPath.start(self.startPos().mirror(p1, p2))
-        for ctrl in self._ctrlList:
-            newPath.append(ctrl.mirror(p1 - p2))
-
-        if self.isClose():
-            newPath.close()
-        return newPath
+        return self.transformed(Transform.mirroring(p1, p2))
         
     def reverse(self):
         rPath = BezierPath()
@@ -1579,64 +2753,94 @@ class BezierPath(object):
         return rPath
     
     def endPos(self):
-        pos = self._startPos
-        for ctrl in self._ctrlList:
-            pos += ctrl.pos
-        return pos
+        count = len(self._ctrlList) + 1
+        xs, ys = self._vertices(count)
+        return _point(xs[count-1], ys[count-1])
 
     def posIn(self, index):
-        pos = self._startPos
-        for ctrl in self._ctrlList[0:index]:
-            pos += ctrl.pos
-        return pos
+        count = len(self._ctrlList)
+        if index < 0:
+            index = max(0, index + count)
+        index = min(index, count)
+        xs, ys = self._vertices(index + 1)
+        return _point(xs[index], ys[index])
 
     def containsPos(self, pos):
-        length = 0
-        for ctrl in self:
-            length += ctrl.approximatedLength()
-
-        PIX_OFFSET = min(3, length/10)
-        RADIAN = math.pi/90
-        OFFSET = min(.01, 1/length)
-
-        count = 0
-        if self.isClose():
-            path = copy.deepcopy(self)
-            sPos = self.startPos()
-            i = 0
-            r = 0
-            while i < len(path):
-                if sPos.distanceOffset(pos, OFFSET):
-                    return True
-                if sPos.y < pos.y or abs(sPos.x - pos.x) > PIX_OFFSET:
-                    sPos += path[i].pos
-                    i += 1
-                else:
-                    i = 0
-                    r += RADIAN
-                    path = self.rotate(r, pos)
-                    sPos = path.startPos()
-
-                    if r > math.pi * 2:
-                        raise Exception('The graph is too small!')
-
-            for ctrl in path:
-                roots = ctrl.roots(x=pos.x, pos=sPos, offset=OFFSET, interval=[0, 1])
-                for t in roots:
-                    cPosY = ctrl.valueAt(t, sPos, False).y
-                    if abs(cPosY - pos.y) < .01:
-                        return True
-                    if cPosY > pos.y:
-                        if len(roots) == 1:
-                            ePosx = ctrl.pos.x + sPos.x
-                            if (ePosx < pos.x and pos.x < sPos.x) or (ePosx > pos.x and pos.x > sPos.x):
-                                count += 1
-                        else:
-                            count += 1
-                sPos += ctrl.pos
-
-        return int(count) % 2 == 1
+        return bool(self.containsPoints([pos])[0])
+
+    def containsPoints(self, points, tolerance=None, fillRule='evenodd', transform:Transform=None):
+        OFFSET = .01
+
+        points = _pointsArray(points)
+        if transform is not None:
+            points = transform.inverse().apply(points)
+        if not self.isClose():
+            return np.zeros(len(points), dtype=bool)
+        if tolerance:
+            winding = _polylineWindings(self.polyline(tolerance), points)
+            boundary = False
+        else:
+            winding, boundary = self._windingNumbers(points, OFFSET)
+        if fillRule == 'nonzero':
+            return boundary | (winding != 0)
+        elif fillRule == 'evenodd':
+            return boundary | (winding % 2 == 1)
+        else:
+            raise ValueError('Unknown fill rule: {}'.format(fillRule))
+
+    def windingNumbers(self, points, tolerance=None):
+        points = _pointsArray(points)
+        if tolerance:
+            return _polylineWindings(self.polyline(tolerance), points)
+        return self._windingNumbers(points)[0]
+
+    def distances(self, points, tolerance=.1):
+        return _polylineDistances(self.polyline(tolerance), _pointsArray(points))
+
+    def polyline(self, tolerance=.1):
+        key = (tolerance, self._startPos._x, self._startPos._y, tuple((id(ctrl), ctrl._geometryKey()) for ctrl in self._ctrlList))
+        cache = getattr(self, '_polyline', None)
+        if cache is None or cache[0] != key:
+            x = self._startPos._x
+            y = self._startPos._y
+            pointList = [np.array([[x, y]], dtype=np.float64)]
+            for ctrl in self._ctrlList:
+                pointList.append(ctrl.flatten(tolerance) + (x, y))
+                x += ctrl.pos._x
+                y += ctrl.pos._y
+            polyline = np.concatenate(pointList)
+            polyline.flags.writeable = False
+            cache = (key, polyline)
+            self._polyline = cache
+        return cache[1]
+
+    def _windingNumbers(self, points, offset=0):
+        winding = np.zeros(len(points), dtype=int)
+        boundary = np.zeros(len(points), dtype=bool)
+        ctrlList = self._ctrlList
+        if self.startPos() != self.endPos():
+            ctrlList = ctrlList + [BezierCtrl(self.startPos() - self.endPos())]
+        if not len(points) or not len(ctrlList):
+            return winding, boundary
+
+        starts = [self.startPos()]
+        for ctrl in ctrlList[:-1]:
+            starts.append(starts[-1] + ctrl.pos)
+        boxes = np.array([(s._x, s._y, c.p1._x, c.p1._y, c.p2._x, c.p2._y, c.pos._x, c.pos._y) for s, c in zip(starts, ctrlList)], dtype=np.float64)
+        xs = boxes[:, 0:1] + np.concatenate([np.zeros((len(boxes), 1)), boxes[:, 2::2]], axis=1)
+        ys = boxes[:, 1:2] + np.concatenate([np.zeros((len(boxes), 1)), boxes[:, 3::2]], axis=1)
+        hits = (points[None, :, 1] >= ys.min(axis=1)[:, None] - offset) & (points[None, :, 1] <= ys.max(axis=1)[:, None] + offset) & (points[None, :, 0] <= xs.max(axis=1)[:, None] + offset)
+
+        for i in np.flatnonzero(hits.any(axis=1)):
+            index = np.flatnonzero(hits[i])
+            w, b = ctrlList[i].windingNumbers(points[index], starts[i], offset)
+            winding[index] += w
+            boundary[index] |= b
+        return winding, boundary
     
+    def windingNumber(self, pos):
+        return int(self.windingNumbers([pos])[0])
+
     def rotations(self):
         center = self.boundingBox().center()
 
@@ -1661,24 +2865,24 @@ class BezierPath(object):
 
     def splitting(self, p1: Point, p2: Point, connect=True):
         radian = p2.radian(p1)
-        rPath = self.rotate(-radian, p1)
+        rotation = Transform.rotation(-radian, p1)
 
         result = [[], []]
-        pos = rPath.startPos()
+        pos = self.startPos()
         newPath = BezierPath()
         newPath.start(pos)
-        if pos.y < p1.y:
+        if rotation.applyPoint(pos).y < p1.y:
             index = 0
         else:
             index = 1
         startIndex = index
 
-        for ctrl in rPath:
-            roots = ctrl.roots(y=p1.y, pos=pos)
+        for ctrl in self._ctrlList:
+            roots = ctrl.roots(y=p1.y, pos=pos, transform=rotation)
             if len(roots) and roots[0] < 0.0001:
                 roots.pop(0)
                 if len(newPath) != 0:
-                    result[index].append(newPath.rotate(radian, p1))
+                    result[index].append(newPath)
                     newPath = BezierPath()
                     newPath.start(pos)
                     index = (index+1) % 2
@@ -1687,7 +2891,7 @@ class BezierPath(object):
                 splits = ctrl.splittings(roots)
                 for sCtrl in splits[:-1]:
                     newPath.append(sCtrl)
-                    result[index].append(newPath.rotate(radian, p1))
+                    result[index].append(newPath)
                     pos += sCtrl.pos
                     newPath = BezierPath()
                     newPath.start(pos)
@@ -1701,19 +2905,19 @@ class BezierPath(object):
                 newPath.append(ctrl)
                 pos += ctrl.pos
         
-        if connect and rPath.isClose() and startIndex == index:
+        if connect and self.isClose() and startIndex == index:
             temp = result[index][0]
-            result[index][0] = newPath.rotate(radian, p1)
+            result[index][0] = newPath
             result[index][0].connectPath(temp)
         else:
-            result[index].append(newPath.rotate(radian, p1))
+            result[index].append(newPath)
 
         if abs(radian) > math.pi/2:
             result.reverse()
         
         return result
 
-    def toOutline(self, strokeWidth, jointype='Round', captype='Butt'):
+    def toOutline(self, strokeWidth, jointype='Round', captype='Butt', tolerance=.05):
         radius = strokeWidth / 2
         newPath = [BezierPath(),  BezierPath()]
 
@@ -1732,11 +2936,14 @@ class BezierPath(object):
                     path1.append(ctrl1)
                 else:
                     raise Exception('Undefine join type: ' + jointype)
-                iList1, iList2 = path2[-1].intersections(Point(), ctrl2, path2[-1].pos + sn - en)
 
-                if len(iList1) or 1:
-                    path2[-1] = path2[-1].splitting(max(iList1))[0]
-                    path2.append(ctrl2.splitting(min(iList2))[1])
+                values = _trimJoin(path2[-1], ctrl2, path2[-1].pos + sn - en)
+                if values:
+                    path2[-1] = path2[-1].splitting(values[0])[0]
+                    path2.append(ctrl2.splitting(values[1])[1])
+                else:
+                    path2.connect(sn - en)
+                    path2.append(ctrl2)
 
             if len(newPath[0]) == 0:
                 newPath[0].append(ctrl1)
@@ -1753,103 +2960,52 @@ class BezierPath(object):
                     radian = -abs(radian)
                 else:
                     radian = abs(radian)
-            if radian > 0:
+            if radian > 1e-6:
                 joinProcess(newPath[0], newPath[1], ctrl1, ctrl2, normals, preNormals, radian)
-            elif radian < 0:
+            elif radian < -1e-6:
                 joinProcess(newPath[1], newPath[0], ctrl2, ctrl1, -normals, -preNormals, -radian)
             else:
                 newPath[0].append(ctrl1)
                 newPath[1].append(ctrl2)
             
         startPos = self.startPos()
-        
+
+        curves = []
+        seeds = []
+        for bCtrl in self._ctrlList:
+            if not bCtrl.isLine():
+                pOffset = 2 / bCtrl.approximatedLength(12)
+                tg = bCtrl.tangents(0)
+                roots = bCtrl.extermes(-(tg[0]-tg[1]).radian())
+                splitValues = [0]
+                for t in sorted(roots[0] + roots[1]):
+                    if t > splitValues[-1] + pOffset and t < 1 - pOffset:
+                        splitValues.append(t)
+                splitValues.append(1)
+                curves.append([(startPos.x, startPos.y), (startPos.x + bCtrl.p1.x, startPos.y + bCtrl.p1.y), (startPos.x + bCtrl.p2.x, startPos.y + bCtrl.p2.y), (startPos.x + bCtrl.pos.x, startPos.y + bCtrl.pos.y)])
+                seeds.append(splitValues)
+            startPos += bCtrl.pos
+        if curves:
+            pieces = iter(_offsetPieces(np.array(curves, dtype=np.float64), seeds, radius, tolerance))
+
+        startPos = self.startPos()
         preNormals, prePos = self[0].normals(0, radius, startPos)
         newPath[0].start(prePos + preNormals)
         newPath[1].start(prePos - preNormals)
 
         for bCtrl in self._ctrlList:
-            pOffset = 2 / bCtrl.approximatedLength(12)
-
-            tg = bCtrl.tangents(0)
-            roots = bCtrl.extermes(-(tg[0]-tg[1]).radian())
-            splitValues = []
-            for t in roots[0] + roots[1]:
-                if t < 0+pOffset or t > 1-pOffset:
-                    continue
-                splitValues.append(t)
-            splitValues.sort()
-            #splitValues = splitValues[1:]
-
-            temp = []
-            sValue = 0
-            for t in splitValues:
-                if t - sValue < pOffset:
-                    continue
-                temp.append((t+sValue) / 2)
-                temp.append(t)
-                sValue = t
-            if sValue and sValue + pOffset < 1:
-                temp.append((1+sValue) / 2)
-            temp.append(1)
-            splitValues = temp
-            del temp
-
             if bCtrl.isLine():
                 normals = bCtrl.pos.normalization(radius).perpendicular()
                 join(bCtrl, bCtrl, normals, preNormals)
                 preNormals = normals
             else:
-                sValue = 0
-                sNormals, sPos = bCtrl.normals(0, radius, startPos)
-                for t in splitValues:
-                    eNormals, ePos = bCtrl.normals(t, radius, startPos)
-
-                    currentCtrl = bCtrl.splitting(sValue)[1].splitting((t-sValue) / (1-sValue))[0]
-                    cpList = currentCtrl.casteljauPoints(.5, sPos)
-
-                    mNormals = (cpList['n2'][1] - cpList['n1']).normalization(radius)
-                    if mNormals:
-                        mNormals = mNormals.perpendicular()
-                    else:
-                        mNormals = (ePos - sPos).normalization(radius).perpendicular()
-                    mPos = cpList['n1']
-                    
-                    intersectPos = intersection(sPos, sPos+sNormals, ePos, ePos+eNormals)
-                    if not intersectPos:
-                        intersectPos =  (sPos - ePos) / 2
-
-                    ratio1 = (mPos+mNormals).distance(intersectPos) / mPos.distance(intersectPos)
-                    eCtrlPos1 = (ePos+eNormals) - (sPos+sNormals)
-
-                    ratio2 = (mPos-mNormals).distance(intersectPos) / mPos.distance(intersectPos)
-                    eCtrlPos2 = (ePos-eNormals) - (sPos-sNormals)
-
-                    def newCtrlGen(ratio, eCtrlPos):
-                        if ratio < 1:
-                            # 这是一个有缺陷的缩小处理方法，也许以后会修正……的吧？
-                            ctl = currentCtrl.scale(ratio)
-                            for v in ctl.roots(x=eCtrlPos.x, y=eCtrlPos.y):
-                                if v > 0 and v < .85:
-                                    if abs(ctl.valueAt(v).distance(eCtrlPos)) < 3:
-                                        ctl = ctl.splitting(v)[0]
-                                        #ctl.p2 = eCtrlPos - ctl.pos
-                                        ctl.pos = eCtrlPos
-                                        return ctl
-                        return BezierCtrl(p1=currentCtrl.p1.scale(ratio), p2=(currentCtrl.p2-currentCtrl.pos).scale(ratio)+eCtrlPos, pos=eCtrlPos)
-
-                    c1 = newCtrlGen(ratio1, eCtrlPos1)
-                    c2 = newCtrlGen(ratio2, eCtrlPos2)
-
-                    if sValue == 0:
+                for i, (sNormals, eNormals, c1, c2) in enumerate(next(pieces)):
+                    if i == 0:
                         join(c1, c2, sNormals, preNormals)
                     else:
                         newPath[0].append(c1)
                         newPath[1].append(c2)
-
-                    sValue = t
-                    sNormals = eNormals
-                    sPos = ePos
-                preNormals = sNormals
+                preNormals = eNormals
             startPos += bCtrl.pos
 
         if self.isClose():
@@ -1876,7 +3032,7 @@ class BezierPath(object):
                 newPath[0].connect(p2 - endPos)
                 newPath[0].connectPath(path)
                 path = newPath[0]
-                #path.connect(path.startPos() - p1)
+                path.connect(path.startPos() - path.endPos())
             elif captype == 'Round':
                 tangent = -preNormals.perpendicular()
                 newPath[0].connect(p1=tangent*SEMICIRCLE, p2=tangent-preNormals*(1-SEMICIRCLE), pos=tangent-preNormals)
@@ -1901,10 +3057,12 @@ class BezierPath(object):
 
     def separateFromPath(self, path):
         OFFSET = .5
+        PIX_OFFSET = 1
         if not (self.isClose() and path.isClose()):
             raise Exception('Path not closed!')
 
-        paths = [copy.deepcopy(self), copy.deepcopy(path)]
+        paths = [self.clone(), path.clone()]
+        boxIndex = _BoxIndex(paths[1], -PIX_OFFSET/2)
 
         iList = [[], []]
 
@@ -1912,10 +3070,11 @@ class BezierPath(object):
         pos1 = paths[0].startPos()
         values = [None, None]
         while index1 < len(paths[0]):
-            index2 = 0
-            pos2 = paths[1].startPos()
-            while index2 < len(paths[1]):
-                values[0], values[1] = paths[0][index1].intersections(pos1, paths[1][index2], pos2, [0, 1])
+            candidates = boxIndex.query(paths[0][index1].boundingBox(pos1))
+            while candidates:
+                index2 = candidates.pop(0)
+                pos2 = boxIndex.startPos(index2)
+                values[0], values[1] = paths[0][index1].intersections(pos1, paths[1][index2], pos2, [0, 1], PIX_OFFSET/2)
                 for vs in values:
                     vs.sort()
                 if len(values[0]):
@@ -1931,6 +3090,7 @@ class BezierPath(object):
                         for i in range(0, len(iList[0])):
                             if iList[0][i] >= index1 : iList[0][i] += 1
                         iList[0].append(index1)
+                        candidates = boxIndex.query(paths[0][index1].boundingBox(pos1), index2+1)
                     else:
                         if t < .5:
                             preIndex = index1-1
@@ -1954,6 +3114,8 @@ class BezierPath(object):
                         for i in range(0, len(iList[1])):
                             if iList[1][i] >= index2 : iList[1][i] += 1
                         iList[1].append(index2)
+                        boxIndex.update(index2)
+                        candidates = boxIndex.query(paths[0][index1].boundingBox(pos1), index2+1)
                     else:
                         if t < .5:
                             preIndex = index2-1
@@ -1964,8 +3126,6 @@ class BezierPath(object):
                         else:
                             if iList[1].count(index2) == 0:
                                 iList[1].append(index2)
-                pos2 += paths[1][index2].pos
-                index2 += 1
             pos1 += paths[0][index1].pos
             index1 += 1
 
@@ -1998,6 +3158,123 @@ class BezierPath(object):
 
         return newPaths
 
+class BezierArray(object):
+    def __init__(self, ctrls=None, start:Point=Point(), close=False) -> None:
+        if ctrls is None:
+            ctrls = []
+        self._ctrls = np.asarray(ctrls, dtype=np.float64).reshape(-1, 3, 2)
+        self._start = np.array([start.x, start.y], dtype=np.float64)
+        self._close = close
+
+    def __len__(self):
+        return len(self._ctrls)
+
+    @property
+    def ctrls(self):
+        return self._ctrls
+
+    def isClose(self):
+        return self._close
+
+    def startPos(self):
+        return Point(*self._start.tolist())
+
+    def endPos(self):
+        return Point(*self.vertices()[-1].tolist())
+
+    def vertices(self):
+        pos = np.empty((len(self._ctrls) + 1, 2))
+        pos[0] = self._start
+        np.cumsum(self._ctrls[:, 2], axis=0, out=pos[1:])
+        pos[1:] += self._start
+        return pos
+
+    def controlPoints(self):
+        starts = self.vertices()[:-1, None]
+        points = np.empty((len(self._ctrls), 4, 2))
+        points[:, :1] = starts
+        points[:, 1:] = self._ctrls + starts
+        return points
+
+    def _tValues(self, ts):
+        ts = np.asarray(ts, dtype=np.float64)
+        if ts.ndim < 2:
+            ts = ts.reshape(1, -1)
+        return ts[..., None]
+
+    def valueAt(self, ts):
+        return _cubicValues(self.controlPoints()[:, None], self._tValues(ts)[..., 0])
+
+    def derivation(self, ts, n=1):
+        if n in (1, 2, 3):
+            return _cubicDerivatives(self.controlPoints()[:, None], self._tValues(ts)[..., 0], n)
+
+    def tangents(self, ts, length=1):
+        t = self._tValues(ts)
+        p1 = self._ctrls[:, None, 0]
+        p2 = self._ctrls[:, None, 1]
+        pos = self._ctrls[:, None, 2]
+        b1 = np.all(p1 == 0, axis=-1)[..., None]
+        b2 = (np.hypot(p2[..., 0] - pos[..., 0], p2[..., 1] - pos[..., 1]) < 0.001)[..., None]
+
+        n30 = p1 * t
+        n31 = (p2 - p1) * t + p1
+        n32 = (pos - p2) * t + p2
+        tline = ((n32 - n31) - (n31 - n30)) * t + (n31 - n30)
+        tline = np.where(b2 & (t == 1), pos - p1, tline)
+        tline = np.where(b1 & (t == 0), p2, tline)
+        tline = np.where(b1 & b2, pos, tline)
+
+        empty = np.all(tline == 0, axis=-1, keepdims=True)
+        tline = np.where(empty & b1, n32 - n31, np.where(empty & b2, n31 - n30, tline))
+
+        norm = np.hypot(tline[..., 0], tline[..., 1])[..., None]
+        return np.divide(tline * length, norm, out=np.zeros(tline.shape), where=norm != 0)
+
+    def normals(self, ts, length=1):
+        tangents = self.tangents(ts, length)
+        return np.stack([tangents[..., 1], -tangents[..., 0]], axis=-1)
+
+    def boundingBox(self):
+        vertices = self.vertices()
+        lb = vertices.min(axis=0)
+        rt = vertices.max(axis=0)
+        if len(self._ctrls):
+            p1 = self._ctrls[:, 0]
+            p2 = self._ctrls[:, 1]
+            pos = self._ctrls[:, 2]
+            a = pos*3 - p2*9 + p1*9
+            b = p2*6 - p1*12
+            c = p1*3
+            starts = vertices[:-1, None]
+            for i in range(2):
+                ts = cubicEquations(np.stack([np.zeros(len(a)), a[:, i], b[:, i], c[:, i]], axis=1))
+                ts = np.where((ts > 0) & (ts < 1), ts, 0)
+                mt = 1 - ts
+                values = (p1[:, None, i]*3*mt**2*ts + p2[:, None, i]*3*mt*ts**2 + pos[:, None, i]*ts**3) + starts[..., i]
+                lb[i] = min(lb[i], values.min())
+                rt[i] = max(rt[i], values.max())
+
+        return Rect(Point(*lb.tolist()), Point(*rt.tolist()))
+
+    def transformed(self, transform:Transform):
+        ctrls = transform.applyVectors(self._ctrls)
+        same = np.all(self._ctrls[:, 1] == self._ctrls[:, 2], axis=1)
+        ctrls[same, 1] = ctrls[same, 2]
+        return BezierArray(ctrls, transform.applyPoint(self.startPos()), self._close)
+
+    def toPath(self):
+        path = BezierPath()
+        path.start(self.startPos())
+        for p1, p2, pos in self._ctrls.tolist():
+            if p2 == pos:
+                path.append(BezierCtrl(_point(*pos), _point(*p1)))
+            else:
+                path.append(BezierCtrl(_point(*pos), _point(*p1), _point(*p2)))
+        if self._close:
+            path.close()
+        return path
+
 class BezierShape(object):
     def __init__(self) -> None:
         self._pathList = []
@@ -2016,6 +3293,11 @@ class BezierShape(object):
 
     def add(self, bezierPath = BezierPath()):
         self._pathList.append(bezierPath)
+
+    def clone(self):
+        newShape = BezierShape()
+        newShape._pathList = [path.clone() for path in self._pathList]
+        return newShape
         
     def extend(self, iterable):
         self._pathList.extend(iterable)
@@ -2024,29 +3306,25 @@ class BezierShape(object):
         for path in self._pathList:
             path.transform(scale, move)
 
-    def toSvgElement(self, arrt={}):
-        attrStr = ''
-        for aPath in self._pathList:
-            startPos = aPath.startPos()
-            attrStr += 'M {},{} '.format(round(startPos.x, 3), round(startPos.y, 3))
-
-            for bCtrl in aPath:
-                if bCtrl.p1.isOrigin() and bCtrl.p2.isOrigin():
-                    if not bCtrl.pos.x:
-                        attrStr += 'v {} '.format(round(bCtrl.pos.y, 3))
-                    elif not bCtrl.pos.y:
-                        attrStr += 'h {} '.format(round(bCtrl.pos.x, 3))
-                    else:
-                        attrStr += 'l {},{} '.format(round(bCtrl.pos.x, 3), round(bCtrl.pos.y, 3))
-                else:
-                    attrStr += 'C {},{} {},{} {},{} '.format(round(bCtrl.p1.x + startPos.x, 3), round(bCtrl.p1.y + startPos.y, 3), round(bCtrl.p2.x + startPos.x, 3), round(bCtrl.p2.y + startPos.y, 3), round(bCtrl.pos.x + startPos.x, 3), round(bCtrl.pos.y + startPos.y, 3))
-                startPos += bCtrl.pos
+    def toPathData(self, precision=3, mode='auto'):
+        return ''.join([path.toPathData(precision, mode) for path in self._pathList])
 
-            if aPath.isClose():
-                attrStr += 'z '                    
-    
-        arrt['d'] = attrStr
-        elem = ET.Element('path', arrt)#re.sub(_re_zero, r'\1\2', attrStr) })
+    def writePathData(self, stream, precision=3, mode='auto'):
+        for path in self._pathList:
+            _writeText(stream, path.toPathData(precision, mode))
+
+    def writeSvgElement(self, stream, arrt={}, precision=3, mode='auto'):
+        _writeText(stream, '<path')
+        for k, v in arrt.items():
+            if k != 'd':
+                _writeText(stream, ' {}={}'.format(k, quoteattr(str(v))))
+        _writeText(stream, ' d="')
+        self.writePathData(stream, precision, mode)
+        _writeText(stream, '"/>\n')
+
+    def toSvgElement(self, arrt={}, precision=3, mode='auto'):
+        arrt['d'] = self.toPathData(precision, mode)
+        elem = ET.Element('path', arrt)
         elem.tail = '\n'
         return elem
     
@@ -2061,18 +3339,104 @@ class BezierShape(object):
 
         return rect
         
-    def rotate(self, radian, center:Point=Point()):
+    def transformed(self, transform:Transform):
         newShape = BezierShape()
         for path in self._pathList:
-            newShape.add(path.rotate(radian, center))
+            newShape.add(path.transformed(transform))
         return newShape
 
-    def union(self, shape):
-        pass
+    def rotate(self, radian, center:Point=Point()):
+        return self.transformed(Transform.rotation(radian, center))
 
-def controlComp(ctrl, comp: BezierPath, pos=Point(), xcenter=0.5, group=False, fExtend=0, bExtend=0):
-    def sumFunc(x, y): return x+y
+    def union(self, shape=None):
+        OFFSET = .5
+        PIX_OFFSET = 1
+        TOLERANCE = .05
+        MIN_OFFSET = 1e-6
+        SAMPLES = 5
+
+        pathList = list(self._pathList)
+        if shape is not None:
+            pathList.extend(shape)
+        paths = [path.clone() for path in pathList if path.isClose() and len(path)]
+        boxes = [path.boundingBox() for path in paths]
+        indexes = [_BoxIndex(path, -PIX_OFFSET/2) for path in paths]
+
+        tLists = [[[] for _ in path] for path in paths]
+        for i in range(len(paths)):
+            for j in range(i+1, len(paths)):
+                if not boxes[i].intersects(boxes[j], -PIX_OFFSET/2):
+                    continue
+                for k, ctrl in enumerate(paths[i]):
+                    sPos = indexes[i].startPos(k)
+                    for l in indexes[j].query(ctrl.boundingBox(sPos)):
+                        values = ctrl.intersections(sPos, paths[j][l], indexes[j].startPos(l), [0, 1], PIX_OFFSET/2)
+                        tLists[i][k].extend(values[0])
+                        tLists[j][l].extend(values[1])
+
+        fragments = []
+        for path, tList in zip(paths, tLists):
+            fragments.extend(_cutPath(path, tList, OFFSET))
+
+        samples = []
+        for fragment in fragments:
+            ctrls, ts = zip(*_fragmentSamples(fragment, SAMPLES))
+            points = fragment.toArray().controlPoints()[list(ctrls)]
+            ts = np.array(ts)
+            samples.append((_cubicValues(points, ts), _cubicDirections(points, ts)))
+        polylines = [fragment.polyline(TOLERANCE) for fragment in fragments]
+
+        groups, directions = _coincidentFragments(polylines, samples, PIX_OFFSET/2)
+        net = np.bincount(groups, directions, len(fragments))
+        leads = dict()
+        for k, (group, direction) in enumerate(zip(groups, directions)):
+            if group not in leads and direction * net[group] > 0:
+                leads[group] = k
+        candidates = sorted(leads.values())
+
+        indexes = np.repeat(np.array(candidates, dtype=int), [len(samples[k][0]) for k in candidates])
+        points = np.concatenate([samples[k][0] for k in candidates] + [np.empty((0, 2))])
+        normals = np.concatenate([samples[k][1] for k in candidates] + [np.empty((0, 2))])[:, ::-1] * (1, -1)
+        sampleGroups = groups[indexes]
+        gaps = np.full(len(points), np.inf)
+        for k, line in enumerate(polylines):
+            box = Rect(_point(*line.min(axis=0).tolist()), _point(*line.max(axis=0).tolist()))
+            near = (sampleGroups != groups[k]) & _pointsInBox(points, box, OFFSET*2 + TOLERANCE)
+            if near.any():
+                gaps[near] = np.minimum(gaps[near], _polylineDistances(line, points[near]))
+        offsets = np.minimum(OFFSET, (gaps - TOLERANCE) / 2)
+        valid = offsets >= MIN_OFFSET
+        unsampled = np.bincount(indexes, valid, len(fragments))[indexes] == 0
+        offsets[unsampled] = OFFSET
+        valid |= unsampled
+
+        normals = normals * np.maximum(offsets, MIN_OFFSET)[:, None]
+        probes = np.stack([points + normals, points - normals], axis=1).reshape(-1, 2)
+        winding = np.zeros(len(probes), dtype=int)
+        for box, path in zip(boxes, paths):
+            inside = _pointsInBox(probes, box)
+            if inside.any():
+                winding[inside] += path.windingNumbers(probes[inside])
+        filled = (winding != 0).reshape(-1, 2)
+
+        votes = np.where(filled[:, 0] != filled[:, 1], 1, -1) * valid
+        votes = np.bincount(indexes, votes, len(fragments))
+        fragments = [fragments[k] for k in candidates if votes[k] > 0]
+
+        newShape = BezierShape()
+        newShape.extend(_stitchPaths(fragments))
+        newShape.extend(path.clone() for path in pathList if not path.isClose())
+        return newShape
+
+def _rotateVectors(vectors, radians):
+    cos = np.cos(radians)
+    sin = np.sin(radians)
+    return np.stack([vectors[:, 0]*cos - vectors[:, 1]*sin, vectors[:, 0]*sin + vectors[:, 1]*cos], axis=1)
 
+def _vectorRadians(vectors):
+    return np.arctan2(vectors[:, 1], vectors[:, 0])
+
+def controlComp(ctrl, comp: BezierPath, pos=Point(), xcenter=0.5, group=False, fExtend=0, bExtend=0):
     box: Rect = comp.boundingBox()
     xorigin = box.width * xcenter + box.left
 
@@ -2095,119 +3459,114 @@ def controlComp(ctrl, comp: BezierPath, pos=Point(), xcenter=0.5, group=False, f
         lengthRatios[i] = (lengthRatios[i]) / ctrlLength + pre
         pre = lengthRatios[i]
     lengthRatios[-1] = 1.0
+
+    skeleton = BezierArray([[(c.p1.x, c.p1.y), (c.p2.x, c.p2.y), (c.pos.x, c.pos.y)] for c in ctrlList], pos)
+    ratios = np.array(lengthRatios)
+    pres = np.concatenate([[0], ratios[:-1]])
     
     def zval(y):
         return (y - box.bottom) / box.height
     
     def inCtrl(z):
-        z = max(0, min(1, z))
-        pre = 0
-        advence = Point()
-        for i in range(len(ctrlList)):
-            r = lengthRatios[i]
-            if r >= z:
-                t = ctrlList[i].inDistance((z-pre)/(r-pre), 0.1)
-                return ctrlList[i], t, advence
-            else:
-                advence += ctrlList[i].pos
-                pre = r
-
-    def mapTo(p):
-        z = zval(p.y)
-        return z
-    
-    def normal(z, len=1):
-        ctrl, t, _ = inCtrl(z)
-        return ctrl.normals(t, len)[0]
+        z = np.clip(z, 0, 1)
+        index = np.minimum(np.searchsorted(ratios, z), len(ctrlList) - 1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pcts = (z - pres[index]) / (ratios[index] - pres[index])
+        ts = np.empty(len(z))
+        for i in np.unique(index):
+            ts[index == i] = ctrlList[i].inDistances(pcts[index == i])
+        return index, ts, np.arange(len(z))
+
+    def normal(z, length=1):
+        index, ts, n = inCtrl(z)
+        return skeleton.normals(ts, length)[index, n]
 
     def normalTo(z, p):
-        ctrl, t, aPos = inCtrl(z)
-        return reduce(sumFunc, ctrl.normals(t, p.x - xorigin, pos+aPos))
+        index, ts, n = inCtrl(z)
+        return skeleton.valueAt(ts)[index, n] + skeleton.normals(ts)[index, n] * (p[:, :1] - xorigin)
 
-    groupList = []
-    path = BezierPath()
-    cspos = comp.startPos()
-    startZ = mapTo(cspos)
-    pspos = normalTo(startZ, cspos)
-    path.start(pspos)
-
-    lenRatio = ctrlLength / box.height
-
-    for cctrl in comp:
-        newComps = []
+    pieces = []
+    for n, cctrl in enumerate(comp):
         split = False
         if isLine or cctrl.isLine():
-            newComps.append(cctrl)
+            newComps = [cctrl]
         else:
-            sList = cctrl.radianSegmentation(.157)[0]
-            if len(sList) == 1:
-                newComps.append(cctrl)
-            else:
-                split = True
-                newComps.extend(sList)
-
-        for cctrl in newComps:
-            tPos = cctrl.pos + cspos
-            endZ = mapTo(tPos)
-            cPos = normalTo(endZ, tPos) - pspos
-
-            p1 = cctrl.tangent(0)
-            p1.y *= lenRatio
-            radian = p1.radian()
-            p1 = normal(startZ, 10).rotate(radian)
-
-            p2 = -cctrl.tangent(1,10)
-            p2.y *= lenRatio
-            radian = p2.radian()
-            p2 = normal(endZ, 10).rotate(radian) + cPos
-            
-            s = 0
-            e = 1
-            radian1 = p1.radian()
-            radian2 = (cPos - p2).rotate(-radian1).radian()
-            target = radian2 / 2
-            for _ in range(20):
-                centerT = (s+e) / 2
-                tPos = cctrl.valueAt(centerT) + cspos
-                z1 = mapTo(tPos)
-
-                k = cctrl.tangent(centerT, 1000)
-                k.y *= lenRatio
-                k = normal(z1, 10).rotate(k.radian())
-                radian = k.rotate(-radian1).radian()
-                if radian2 < 0.0523:
-                    break
-                elif abs(radian - target) <= min(0.1, abs(radian2/10)):
-                    break
-                elif abs(target) < abs(radian):
-                    e = centerT
-                else:
-                    s = centerT
-            pos1 = normalTo(z1, tPos) - pspos
+            newComps = cctrl.radianSegmentation(.157)[0]
+            split = len(newComps) != 1
+        pieces.extend([c, split, n] for c in newComps)
+
+    array = BezierArray([[(c.p1.x, c.p1.y), (c.p2.x, c.p2.y), (c.pos.x, c.pos.y)] for c, _, _ in pieces], comp.startPos())
+    vertices = array.vertices()
+    zList = zval(vertices[:, 1])
+    ends = normalTo(zList, vertices)
+    cPosList = ends[1:] - ends[:-1]
+
+    lenRatio = np.array([1, ctrlLength / box.height])
+    tangents = array.tangents([0, 1], 10)
+    p1List = normal(zList[:-1], 10)
+    p1List = _rotateVectors(p1List, _vectorRadians(tangents[:, 0] * lenRatio))
+    p2List = normal(zList[1:], 10)
+    p2List = _rotateVectors(p2List, _vectorRadians(-tangents[:, 1] * lenRatio)) + cPosList
+
+    radian1 = _vectorRadians(p1List)
+    radian2 = _vectorRadians(_rotateVectors(cPosList - p2List, -radian1))
+    target = radian2 / 2
+
+    s = np.zeros(len(pieces))
+    e = np.ones(len(pieces))
+    active = np.ones(len(pieces), dtype=bool)
+    tPos = np.zeros((len(pieces), 2))
+    z1 = np.zeros(len(pieces))
+    kList = np.zeros((len(pieces), 2))
+    for _ in range(20):
+        if not active.any():
+            break
+        centerT = (s + e) / 2
+        values = array.valueAt(centerT[:, None])[:, 0]
+        zs = zval(values[:, 1])
+        k = array.tangents(centerT[:, None], 1000)[:, 0] * lenRatio
+        k = _rotateVectors(normal(zs, 10), _vectorRadians(k))
+        radian = _vectorRadians(_rotateVectors(k, -radian1))
+
+        tPos[active] = values[active]
+        z1[active] = zs[active]
+        kList[active] = k[active]
+        stop = (radian2 < 0.0523) | (np.abs(radian - target) <= np.minimum(0.1, np.abs(radian2/10)))
+        closer = np.abs(target) < np.abs(radian)
+        e = np.where(active & ~stop & closer, centerT, e)
+        s = np.where(active & ~stop & ~closer, centerT, s)
+        active &= ~stop
+    pos1List = normalTo(z1, tPos) - ends[:-1]
+
+    groupList = []
+    path = BezierPath()
+    path.start(_point(*ends[0].tolist()))
+    ends = ends.tolist()
+    for i, (cctrl, split, n) in enumerate(pieces):
+        cPos = _point(*cPosList[i].tolist())
+        pos1 = _point(*pos1List[i].tolist())
             
-            # newCtrl = BezierCtrl(cPos, p1, p2).threeTangentCurver(k, pos1)
-            # newCtrl = BezierCtrl(cPos, p1, p2).controlInto(BezierCtrl.threePointT(Point(), pos1, cPos), pos1)
-            # newCtrl = BezierCtrl.threePointCtrl(Point(), pos1, cPos)
-            if abs(radian2) < .157 or (split and cPos.distance() < ctrlLength/10):
+        # newCtrl = BezierCtrl(cPos, p1, p2).threeTangentCurver(k, pos1)
+        # newCtrl = BezierCtrl(cPos, p1, p2).controlInto(BezierCtrl.threePointT(Point(), pos1, cPos), pos1)
+        # newCtrl = BezierCtrl.threePointCtrl(Point(), pos1, cPos)
+        if abs(radian2[i]) < .157 or (split and cPos.distance() < ctrlLength/10):
+            newCtrl = BezierCtrl.threePointCtrl(Point(), pos1, cPos)
+        else:
+            p1 = _point(*p1List[i].tolist())
+            p2 = _point(*p2List[i].tolist())
+            newCtrl = BezierCtrl(cPos, p1, p2).threeTangentCurver(_point(*kList[i].tolist()), pos1)
+            if newCtrl == None:
                 newCtrl = BezierCtrl.threePointCtrl(Point(), pos1, cPos)
-            else:
-                newCtrl = BezierCtrl(cPos, p1, p2).threeTangentCurver(k, pos1)
-                if newCtrl == None:
-                    newCtrl = BezierCtrl.threePointCtrl(Point(), pos1, cPos)
-
-            if newCtrl.isLine():
-                newCtrl.p1 = Point()
-                newCtrl.p2 = newCtrl.pos
-            path.append(newCtrl)
-
-            cspos += cctrl.pos
-            pspos += cPos
-            startZ = endZ
+
+        if newCtrl.isLine():
+            newCtrl.p1 = Point()
+            newCtrl.p2 = newCtrl.pos
+        path.append(newCtrl)
         
-        if group:
+        if group and (i + 1 == len(pieces) or pieces[i+1][2] != n):
             groupList.append(path)
             path = BezierPath()
-            path.start(pspos)
+            path.start(_point(*ends[i+1]))
 
     if group:
         return groupList
@@ -2216,6 +3575,200 @@ def controlComp(ctrl, comp: BezierPath, pos=Point(), xcenter=0.5, group=False, f
             path.close()
         return path
 
+_pathArgCounts = { 'M': 2, 'L': 2, 'H': 1, 'V': 1, 'C': 6, 'S': 4, 'Q': 4, 'T': 2, 'A': 7, 'Z': 0 }
+
+def _toNumber(str):
+    if str.lstrip('+-').isdigit():
+        return int(str)
+    return float(str)
+
+def _pathTokens(d):
+    command = None
+    count = 0
+    args = []
+    empty = False
+    pos = 0
+    while True:
+        if count == 7 and (len(args) == 3 or len(args) == 4):
+            m = _re_pathFlag.match(d, pos)
+        else:
+            m = _re_pathToken.match(d, pos)
+        if m is None:
+            if d[pos:].strip(' \t\r\n,'):
+                raise ValueError('Invalid path data: {}'.format(d[pos:pos+16]))
+            break
+        pos = m.end()
+
+        if m.group(1):
+            if len(args) or empty:
+                raise ValueError('Missing arguments of path command {}!'.format(command))
+            command = m.group(1)
+            count = _pathArgCounts[command.upper()]
+            empty = count != 0
+            if count == 0:
+                yield command, []
+            continue
+
+        if count == 0:
+            raise ValueError('Path data number without command: {}'.format(m.group(2)))
+        args.append(_toNumber(m.group(2)))
+        if len(args) == count:
+            yield command, args
+            args = []
+            empty = False
+            if command == 'M':
+                command = 'L'
+            elif command == 'm':
+                command = 'l'
+
+    if len(args) or empty:
+        raise ValueError('Missing arguments of path command {}!'.format(command))
+
+def _arcCtrls(x1, y1, rx, ry, angle, largeArc, sweep, x2, y2):
+    rx = abs(rx)
+    ry = abs(ry)
+    if x1 == x2 and y1 == y2:
+        return []
+    if rx == 0 or ry == 0:
+        return [BezierCtrl(_point(x2 - x1, y2 - y1), _point(0, 0))]
+
+    phi = math.radians(angle)
+    cos = math.cos(phi)
+    sin = math.sin(phi)
+    dx = (x1 - x2) / 2
+    dy = (y1 - y2) / 2
+    x1p = cos*dx + sin*dy
+    y1p = -sin*dx + cos*dy
+    ratio = x1p**2 / rx**2 + y1p**2 / ry**2
+    if ratio > 1:
+        rx *= math.sqrt(ratio)
+        ry *= math.sqrt(ratio)
+
+    num = rx**2 * ry**2 - rx**2 * y1p**2 - ry**2 * x1p**2
+    den = rx**2 * y1p**2 + ry**2 * x1p**2
+    coef = math.sqrt(max(0, num / den))
+    if largeArc == sweep:
+        coef = -coef
+    cxp = coef * rx * y1p / ry
+    cyp = -coef * ry * x1p / rx
+    cx = cos*cxp - sin*cyp + (x1 + x2) / 2
+    cy = sin*cxp + cos*cyp + (y1 + y2) / 2
+
+    def vectorAngle(ux, uy, vx, vy):
+        return math.atan2(ux*vy - uy*vx, ux*vx + uy*vy)
+
+    ux = (x1p - cxp) / rx
+    uy = (y1p - cyp) / ry
+    theta = vectorAngle(1, 0, ux, uy)
+    delta = vectorAngle(ux, uy, (-x1p - cxp) / rx, (-y1p - cyp) / ry)
+    if not sweep and delta > 0:
+        delta -= math.pi * 2
+    elif sweep and delta < 0:
+        delta += math.pi * 2
+
+    n = max(1, math.ceil(abs(delta) / (math.pi/2) - 1e-9))
+    delta /= n
+    k = arcMagicNumber(delta)
+
+    def ellipse(t):
+        x = rx * math.cos(t)
+        y = ry * math.sin(t)
+        return cos*x - sin*y + cx, sin*x + cos*y + cy
+
+    def derivation(t):
+        x = -rx * math.sin(t)
+        y = ry * math.cos(t)
+        return cos*x - sin*y, sin*x + cos*y
+
+    ctrlList = []
+    sx, sy = x1, y1
+    for i in range(n):
+        t1 = theta + delta * i
+        t2 = t1 + delta
+        ex, ey = ellipse(t2) if i + 1 != n else (x2, y2)
+        d1 = derivation(t1)
+        d2 = derivation(t2)
+        ctrlList.append(BezierCtrl(_point(ex - sx, ey - sy), _point(k*d1[0], k*d1[1]), _point(ex - k*d2[0] - sx, ey - k*d2[1] - sy)))
+        sx, sy = ex, ey
+    return ctrlList
+
+def _parsePathData(d):
+    paths = []
+    bezier = None
+    x = y = 0
+    sx = sy = 0
+    preCommand = None
+    preCtrl = None
+    for command, args in _pathTokens(d):
+        com = command.upper()
+        if command == com:
+            ox, oy = x, y
+        else:
+            ox = oy = 0
+
+        if com == 'M':
+            if bezier is not None and len(bezier):
+                paths.append(bezier)
+            x = args[0] + (x if command == 'm' else 0)
+            y = args[1] + (y if command == 'm' else 0)
+            sx, sy = x, y
+            bezier = BezierPath()
+            bezier.start(_point(x, y))
+            preCommand = com
+            continue
+        elif com == 'Z':
+            if bezier is not None:
+                bezier.close()
+                paths.append(bezier)
+                bezier = None
+            x, y = sx, sy
+            preCommand = com
+            continue
+
+        if bezier is None:
+            bezier = BezierPath()
+            bezier.start(_point(x, y))
+
+        quad = None
+        if com == 'L':
+            ctrlList = [BezierCtrl(_point(args[0] - ox, args[1] - oy), _point(0, 0))]
+        elif com == 'H':
+            ctrlList = [BezierCtrl(_point(args[0] - ox, 0), _point(0, 0))]
+        elif com == 'V':
+            ctrlList = [BezierCtrl(_point(0, args[0] - oy), _point(0, 0))]
+        elif com == 'C':
+            ctrlList = [BezierCtrl(_point(args[4] - ox, args[5] - oy), _point(args[0] - ox, args[1] - oy), _point(args[2] - ox, args[3] - oy))]
+        elif com == 'S':
+            if preCommand in ('C', 'S'):
+                p1 = preCtrl.pos - preCtrl.p2
+            else:
+                p1 = _point(0, 0)
+            ctrlList = [BezierCtrl(_point(args[2] - ox, args[3] - oy), p1, _point(args[0] - ox, args[1] - oy))]
+        elif com == 'Q' or com == 'T':
+            if com == 'Q':
+                quad = _point(args[0] - ox, args[1] - oy)
+                pos = _point(args[2] - ox, args[3] - oy)
+            else:
+                quad = -preCtrl if preCommand in ('Q', 'T') else _point(0, 0)
+                pos = _point(args[0] - ox, args[1] - oy)
+            ctrlList = [BezierCtrl(pos, quad * (2/3), pos + (quad - pos) * (2/3))]
+            quad = quad - pos
+        elif com == 'A':
+            ctrlList = _arcCtrls(x, y, args[0], args[1], args[2], args[3], args[4], args[5] + x - ox, args[6] + y - oy)
+
+        for ctrl in ctrlList:
+            if ctrl.p1.isOrigin() and ctrl.p2.isOrigin() and ctrl.pos.isOrigin():
+                continue
+            bezier.append(ctrl)
+            x += ctrl.pos._x
+            y += ctrl.pos._y
+        preCommand = com
+        preCtrl = quad if quad is not None else ctrlList[-1] if ctrlList else None
+
+    if bezier is not None and not bezier.isClose() and len(bezier):
+        paths.append(bezier)
+    return paths
+
 def createPathfromSvgElem(elem, tag=''):
     if(tag == ''):
         tag = elem.tag
@@ -2223,63 +3776,16 @@ def createPathfromSvgElem(elem, tag=''):
     path = BezierShape()
     bezier = BezierPath()
     if tag == 'path':
-        pos = Point()
-        for avg in re.finditer(_re_args, elem.get('d')):
-            numList = re.finditer(_re_num, avg.group())
-            com = avg.group()[0]
-            if com == 's':
-                bezier.connect(p2=_getPointFromReMatch(numList), pos=_getPointFromReMatch(numList), s=True)
-            elif com == 'c':
-                bezier.connect(p1=_getPointFromReMatch(numList), p2=_getPointFromReMatch(numList), pos=_getPointFromReMatch(numList))
-            elif com == 'l':
-                bezier.connect(_getPointFromReMatch(numList))
-            elif com == 'h':
-                bezier.connect(Point(next(numList).group(), 0))
-            elif com == 'v':
-                bezier.connect(Point(0, next(numList).group()))
-            elif com == 'S':
-                bezier.connect(p2=_getPointFromReMatch(numList) - pos, pos=_getPointFromReMatch(numList) - pos, s=True)
-            elif com == 'C':
-                bezier.connect(p1=_getPointFromReMatch(numList) - pos, p2=_getPointFromReMatch(numList) - pos, pos=_getPointFromReMatch(numList) - pos)
-            elif com == 'L':
-                bezier.connect(_getPointFromReMatch(numList) - pos)
-            elif com == 'H':
-                bezier.connect(Point(strToNum(next(numList).group()) - pos.x, 0))
-            elif com == 'V':
-                bezier.connect(Point(0, strToNum(next(numList).group()) - pos.y))
-            elif com == 'M':
-                if len(bezier):
-                    path.add(bezier)
-                    bezier = BezierPath()
-
-                bezier.start(_getPointFromReMatch(numList))
-                pos = bezier.startPos()
-                continue
-            elif com == 'z':
-                bezier.close()
-                path.add(bezier)
-                bezier = BezierPath()
-                pos = Point()
-                continue
-            else:
-                raise AttributeError
-            
-            if len(bezier):
-                pos = bezier.endPos()
-        if (not bezier.isClose()) and (len(bezier)):
-            path.add(bezier)
+        path.extend(_parsePathData(elem.get('d')))
     elif tag == 'polyline':
-        matchs = re.finditer(_re_num, elem.get('points'))
-        pos = _getPointFromReMatch(matchs)
+        nums = [_toNumber(n) for n in _re_number.findall(elem.get('points'))]
+        pos = _point(nums[0], nums[1])
         bezier.start(pos)
         
-        while True:
-            try:
-                p = _getPointFromReMatch(matchs)
-                bezier.connect(p - pos)
-                pos = p
-            except StopIteration:
-                break
+        for i in range(2, len(nums) - 1, 2):
+            p = _point(nums[i], nums[i+1])
+            bezier.connect(p - pos)
+            pos = p
         
         path.add(bezier)
     elif tag == 'line':
@@ -2318,15 +3824,24 @@ def createPathfromSvgElem(elem, tag=''):
 
 class GroupShape(object):
     def __init__(self, shape:BezierShape=BezierShape()) -> None:
+        TOLERANCE = .05
+
+        paths = [path for path in shape if path.isClose()]
+        indexes = { id(path): i for i, path in enumerate(paths) }
+        posList = [path[0].valueAt(.5, path.startPos()) for path in paths]
+        containsTable = [path.containsPoints(posList, TOLERANCE) for path in paths]
+
+        def contains(path, other):
+            return containsTable[indexes[id(path)]][indexes[id(other)]]
+
         def grouping(sGroup, dGroup):
-            apos = sGroup[0][0].valueAt(.5, sGroup[0].startPos())
             for i in range(0, len(dGroup)):
                 p, g = dGroup[i]
-                if p.containsPos(apos):
+                if contains(p, sGroup[0]):
                     dGroup[i][1] = grouping(sGroup, g)
                     dGroup = [ x for x in dGroup if x ]
                     return dGroup
-                elif sGroup[0].containsPos(p[0].valueAt(.5, p.startPos())):
+                elif contains(sGroup[0], p):
                     sGroup[1].append(dGroup[i])
                     dGroup[i] = None
                     
@@ -2342,9 +3857,8 @@ class GroupShape(object):
                 direction(-d, list[i][1])
 
         group = []
-        for path in shape:
-            if path.isClose():
-                group = grouping([path, []], group)
+        for path in paths:
+            group = grouping([path, []], group)
 
         direction(-1, group)
         self._group = group
@@ -2414,7 +3928,7 @@ class GroupShape(object):
             return self
 
         oldGroup = []
-        newGroup = copy.deepcopy(group._group)
+        newGroup = group.clone()._group
         for p1, g1 in self._group:
             i = 0
             hIndex = None
@@ -2438,6 +3952,14 @@ class GroupShape(object):
         ng._group = newGroup + oldGroup
         return ng
 
+    def clone(self):
+        def cloneGroup(group):
+            return [[path.clone(), cloneGroup(g)] for path, g in group]
+
+        newGroup = object.__new__(GroupShape)
+        newGroup._group = cloneGroup(self._group)
+        return newGroup
+
     def toShape(self):
         def unGroup(group, list):
             for p, g in group:
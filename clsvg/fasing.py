@@ -1,4 +1,17 @@
+import gzip
+import hashlib
 import json
+import mmap
+import os
+import re
+import tempfile
+import traceback
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from types import MappingProxyType
+from xml.sax.saxutils import escape, quoteattr
+
+import numpy as np
 
 from . import bezierShape as bs
 from . import svgfile
@@ -7,18 +20,213 @@ def loadJson(file):
     with open(file, 'r', encoding='utf-8') as f:
         return json.load(f)
 
+_re_jsonToken = re.compile(rb'"(?:[^"\\]|\\.)*"|[{}\[\],:]')
+
+def _scanJsonEntries(buffer):
+    entries = []
+    depth = 0
+    isList = False
+    isKey = False
+    key = None
+    start = None
+    for m in _re_jsonToken.finditer(buffer):
+        token = m.group()
+        if token in b'{[':
+            if depth == 0:
+                isList = token == b'['
+                isKey = not isList
+                start = m.end()
+            depth += 1
+        elif token in b']}':
+            depth -= 1
+            if depth == 0:
+                if buffer[start:m.start()].strip():
+                    entries.append([len(entries) if isList else key, start, m.start()])
+                return entries
+        elif depth != 1:
+            continue
+        elif token == b',':
+            entries.append([len(entries) if isList else key, start, m.start()])
+            start = m.end()
+            isKey = not isList
+        elif token == b':':
+            start = m.end()
+            isKey = False
+        elif isKey:
+            key = json.loads(token)
+    raise ValueError('Unterminated JSON document')
+
+class IndexedJson(object):
+    def __init__(self, file, indexFile=None):
+        self.file = file
+        self.indexFile = file + '.idx' if indexFile is None else indexFile
+        self._open()
+
+    def _open(self):
+        self._fileObj = open(self.file, 'rb')
+        self._buffer = mmap.mmap(self._fileObj.fileno(), 0, access=mmap.ACCESS_READ)
+        stat = os.fstat(self._fileObj.fileno())
+        self._index = self._loadIndex(stat)
+        if self._index is None:
+            self._index = { k: (s, e) for k, s, e in _scanJsonEntries(self._buffer) }
+            self._saveIndex(stat)
+        self._keys = list(self._index)
+
+    def _loadIndex(self, stat):
+        try:
+            with open(self.indexFile, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if data.get('size') != stat.st_size or data.get('mtime') != stat.st_mtime_ns:
+            return None
+        return { k: (s, e) for k, s, e in data['entries'] }
+
+    def _saveIndex(self, stat):
+        data = { 'size': stat.st_size, 'mtime': stat.st_mtime_ns, 'entries': [[k, s, e] for k, (s, e) in self._index.items()] }
+        try:
+            fd, temp = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(os.path.abspath(self.indexFile)))
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(temp, self.indexFile)
+        except OSError:
+            pass
+
+    def __getstate__(self):
+        return { 'file': self.file, 'indexFile': self.indexFile }
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._open()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        self._buffer.close()
+        self._fileObj.close()
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __contains__(self, key):
+        return key in self._index
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def keys(self):
+        return list(self._keys)
+
+    def __getitem__(self, key):
+        start, end = self._index[key]
+        return json.loads(self._buffer[start:end])
+
+    def get(self, key, default=None):
+        if key in self._index:
+            return self[key]
+        return default
+
+    def items(self):
+        for key in self._keys:
+            yield key, self[key]
+
+GLYPH_STYLE = '.st0{fill:#000000;}'
+
+_SVG_TAG = '{http://www.w3.org/2000/svg}svg'
+
+def _openOutput(file):
+    if not isinstance(file, (str, os.PathLike)):
+        return file, False
+    file = os.fspath(file)
+    if file.endswith('.svgz'):
+        return gzip.open(file, 'wb'), True
+    else:
+        return open(file, 'wb'), True
+
+class GlyphWriter(object):
+    def __init__(self, file, attrib={}, tag=_SVG_TAG, style=GLYPH_STYLE, precision=3, namespaces=dict()):
+        self._stream, self._ownStream = _openOutput(file)
+        self._precision = precision
+        self._declared = set()
+        self._glyphCount = 0
+
+        uri, self._tag = svgfile.splitName(tag)
+        self._names = svgfile.NamespaceMap(namespaces, uri)
+
+        self._write("<?xml version='1.0' encoding='utf-8'?>\n")
+        self._write(self._startTag(self._tag, attrib))
+        self._write('>\n')
+        if style:
+            self._write('<style type="text/css">{}</style>\n'.format(escape(style)))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _write(self, text):
+        bs._writeText(self._stream, text)
+
+    def _startTag(self, tag, attrib):
+        attrs = [(self._names.qualify(k, True), v) for k, v in attrib.items()]
+        text = ['<', tag]
+        for name, uri in self._names.declarations():
+            if name not in self._declared:
+                self._declared.add(name)
+                text.append(' {}={}'.format(name, quoteattr(uri)))
+        for k, v in attrs:
+            text.append(' {}={}'.format(k, quoteattr(str(v))))
+        return ''.join(text)
+
+    def glyphCount(self):
+        return self._glyphCount
+
+    def writeShapes(self, shapes, attrib={ 'class': 'st0' }):
+        for shape in shapes:
+            shape.writeSvgElement(self._stream, attrib, self._precision)
+
+    def writeGlyph(self, name, shapes, attrib={}, tag='symbol'):
+        attrs = { 'id': name }
+        attrs.update(attrib)
+        self._write(self._startTag(tag, attrs))
+        self._write('>\n')
+        self.writeShapes(shapes)
+        self._write('</{}>\n'.format(tag))
+        self._glyphCount += 1
+
+    def close(self):
+        if self._stream is None:
+            return
+        self._write('</{}>\n'.format(self._tag))
+        if self._ownStream:
+            self._stream.close()
+        else:
+            self._stream.flush()
+        self._stream = None
+
+def writeGlyphSprite(glyphs, file, attrib={}, tag=_SVG_TAG, style=GLYPH_STYLE, glyphAttrib={}, namespaces=dict()):
+    with GlyphWriter(file, attrib, tag, style, namespaces=namespaces) as writer:
+        for name, shapes in glyphs:
+            writer.writeGlyph(name, shapes, glyphAttrib)
+        return writer.glyphCount()
+
+def writeGlyphFiles(glyphs, folder, attrib={}, tag=_SVG_TAG, style=GLYPH_STYLE, compress=False, namespaces=dict()):
+    extension = '.svgz' if compress else '.svg'
+    count = 0
+    for name, shapes in glyphs:
+        with GlyphWriter(os.path.join(folder, name + extension), attrib, tag, style, namespaces=namespaces) as writer:
+            writer.writeShapes(shapes)
+        count += 1
+    return count
+
 def writeTempGlyphFromShapes(shapes, fileName, tag, attrib):
-    newRoot = svgfile.ET.Element(tag, attrib)
-    newRoot.text = '\n'
-    styleElem = svgfile.ET.Element('style', { 'type': 'text/css' })
-    styleElem.text = '.st0{fill:#000000;}'
-    styleElem.tail = '\n'
-    newRoot.append(styleElem)
-
-    for shape in shapes:
-        newRoot.append(shape.toSvgElement({ 'class': 'st0' }))
-    newTree = svgfile.ET.ElementTree(newRoot)
-    newTree.write(fileName, encoding = "utf-8", xml_declaration = True)
+    with GlyphWriter(fileName, attrib, tag) as writer:
+        writer.writeShapes(shapes)
 
 def lineSymbol(p1, p2):
     if p1.x == p2.x:
@@ -57,61 +265,132 @@ def strokeDirection(bpath):
 
     return text
 
-def genStrucView(bpaths, p_map):
-    def map_x(v):
-        return p_map['h'].index(v)
-    def map_y(v):
-        return p_map['v'].index(v)
+_strucDtype = np.dtype([
+    ('row', np.int32), ('col', np.int32), ('path', np.int32), ('ctrl', np.int32),
+    ('symbol', 'S1'), ('dir', 'S1'), ('se', np.int8), ('padding', np.bool_)
+])
+
+class StrucView(object):
+    def __init__(self, records, width, height):
+        cells = records['row'].astype(np.int64) * width + records['col']
+        order = np.argsort(cells, kind='stable')
+        self._records = records[order]
+        self._records.flags.writeable = False
+        self._width = width
+        self._height = height
+        self._offsets = np.searchsorted(cells[order], np.arange(width * height + 1))
+
+    def __len__(self):
+        return self._height
+
+    def __getitem__(self, y):
+        if y < 0:
+            y += self._height
+        if not 0 <= y < self._height:
+            raise IndexError('StrucView row out of range')
+        return _StrucViewRow(self, y)
+
+    def __iter__(self):
+        for y in range(self._height):
+            yield _StrucViewRow(self, y)
 
-    view = [[[] for n in range(len(p_map['h']))] for m in range(len(p_map['v']))]
+    def records(self):
+        return self._records
+
+    def shape(self):
+        return self._height, self._width
+
+    def cellRecords(self, y, x):
+        cell = y * self._width + x
+        return self._records[self._offsets[cell]:self._offsets[cell+1]]
+
+    def _cellItems(self, y, x):
+        cell = []
+        for r in self.cellRecords(y, x).tolist():
+            if r[7]:
+                cell.append({ 'symbol': r[4].decode(), 'indexes': [r[2], r[3]], 'padding': True })
+            else:
+                cell.append({ 'symbol': r[4].decode(), 'indexes': [r[2], r[3]], 'padding': False, 'dir': r[5].decode(), 'se': r[6] })
+        return cell
+
+    def cell(self, y, x):
+        cell = []
+        for item in self._cellItems(y, x):
+            item['indexes'] = tuple(item['indexes'])
+            cell.append(MappingProxyType(item))
+        return tuple(cell)
+
+    def toList(self):
+        return [[self._cellItems(y, x) for x in range(self._width)] for y in range(self._height)]
+
+class _StrucViewRow(object):
+    def __init__(self, view, y):
+        self._view = view
+        self._y = y
+
+    def __len__(self):
+        return self._view._width
+
+    def __getitem__(self, x):
+        if x < 0:
+            x += self._view._width
+        if not 0 <= x < self._view._width:
+            raise IndexError('StrucView column out of range')
+        return self._view.cell(self._y, x)
+
+    def __iter__(self):
+        for x in range(self._view._width):
+            yield self._view.cell(self._y, x)
+
+def genStrucView(bpaths, p_map, compact=False):
+    xIndex = { v: i for i, v in enumerate(p_map['h']) }
+    yIndex = { v: i for i, v in enumerate(p_map['v']) }
+    records = []
+    padding = []
 
     for i, path in enumerate(bpaths):
         start = path.startPos()
-        prePos = bs.Point(map_x(start.x), map_y(start.y))
+        preX, preY = xIndex[start.x], yIndex[start.y]
         for j, ctrl in enumerate(path):
             sym = lineSymbol(bs.Point(), ctrl.pos)
-            attrs = {
-                'symbol': sym,
-                'indexes': [i, j],
-                'padding': False,
-                'dir': direction(ctrl.pos),
-                'se': 0
-            }
-            view[prePos.y][prePos.x].append(attrs)
+            dir = direction(ctrl.pos)
             start += ctrl.pos
-            currPos = bs.Point(map_x(start.x), map_y(start.y))
-            attrs = {
-                'symbol': sym,
-                'indexes': [i, j],
-                'padding': False,
-                'dir': direction(ctrl.pos),
-                'se': 1
-            }
-            view[currPos.y][currPos.x].append(attrs)
-
-            attrs = {
-                'symbol': sym,
-                'indexes': [i, j],
-                'padding': True
-            }
+            currX, currY = xIndex[start.x], yIndex[start.y]
+            records.append((preY, preX, i, j, sym, dir, 0, False))
+            records.append((currY, currX, i, j, sym, dir, 1, False))
+
             if sym == 'd':
-                for y in range(min(prePos.y, currPos.y)+1, max(prePos.y, currPos.y)):
-                    for x in range(min(prePos.x, currPos.x)+1, max(prePos.x, currPos.x)):
-                        if (y != prePos.y or x != prePos.x) and (y != currPos.y or x != currPos.x):
-                            view[y][x].append(attrs)
+                rows = np.arange(min(preY, currY)+1, max(preY, currY))
+                cols = np.arange(min(preX, currX)+1, max(preX, currX))
+                rows, cols = np.repeat(rows, len(cols)), np.tile(cols, len(rows))
+            elif sym == 'h':
+                cols = np.arange(min(preX, currX)+1, max(preX, currX))
+                rows = np.full(len(cols), currY)
             else:
-                if sym == 'h':
-                    for k in range(min(prePos.x, currPos.x) + 1, max(prePos.x, currPos.x)):
-                        view[currPos.y][k].append(attrs)
-                if sym == 'v':
-                    for k in range(min(prePos.y, currPos.y) + 1, max(prePos.y, currPos.y)):
-                        view[k][currPos.x].append(attrs)
+                rows = np.arange(min(preY, currY)+1, max(preY, currY))
+                cols = np.full(len(rows), currX)
+            if len(rows):
+                padding.append((len(records) - 1, rows, cols, i, j, sym))
+
+            preX, preY = currX, currY
 
-            prePos = currPos
+    records = np.array(records, dtype=_strucDtype)
+    if padding:
+        sizes = [len(p[1]) for p in padding]
+        block = np.zeros(sum(sizes), dtype=_strucDtype)
+        block['row'] = np.concatenate([p[1] for p in padding])
+        block['col'] = np.concatenate([p[2] for p in padding])
+        block['path'] = np.repeat([p[3] for p in padding], sizes)
+        block['ctrl'] = np.repeat([p[4] for p in padding], sizes)
+        block['symbol'] = np.repeat(np.array([p[5] for p in padding], dtype='S1'), sizes)
+        block['padding'] = True
+        after = np.repeat([p[0] for p in padding], sizes)
+        records = np.insert(records, after + 1, block)
 
-    return view
+    view = StrucView(records, len(p_map['h']), len(p_map['v']))
+    return view if compact else view.toList()
 
-def genCharData(data, scale):
+def _genCharData(data, scale):
     p_map = {'h': set(), 'v': set()}
     path_list = []
     
@@ -148,6 +427,191 @@ def genCharData(data, scale):
     scale = data["info"]["scale"]
     p_map['h'] = sorted(p_map['h'])
     p_map['v'] = sorted(p_map['v'])
-    view = genStrucView(bpaths, p_map)
+    view = genStrucView(bpaths, p_map, True)
     
     return {'bpaths': bpaths, 'view': view, 'scale': scale, 'p_map': p_map}
+
+def genCharData(data, scale, cache=None, compact=False):
+    if cache is None:
+        charData = _genCharData(data, scale)
+    else:
+        key = cache.key(data, scale)
+        charData = cache.get(key)
+        if charData is None:
+            charData = _genCharData(data, scale)
+            cache.put(key, charData)
+    if not compact:
+        charData['view'] = charData['view'].toList()
+    return charData
+
+class CharDataCache(object):
+    VERSION = 2
+
+    def __init__(self, folder, maxSize=256 * 1024 * 1024):
+        self.folder = folder
+        self.maxSize = maxSize
+        os.makedirs(folder, exist_ok=True)
+
+    def key(self, data, scale):
+        text = json.dumps([self.VERSION, scale, data['info']['scale'], data['comb']['key_paths']], sort_keys=True, separators=(',', ':'))
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+
+    def _file(self, key):
+        return os.path.join(self.folder, key + '.npz')
+
+    def get(self, key):
+        file = self._file(key)
+        try:
+            with np.load(file) as arrays:
+                charData = self._decode(arrays)
+            os.utime(file)
+        except (ValueError, KeyError, EOFError, zipfile.BadZipFile):
+            try:
+                os.remove(file)
+            except OSError:
+                pass
+            return None
+        except OSError:
+            return None
+        return charData
+
+    def put(self, key, charData):
+        fd, temp = tempfile.mkstemp(suffix='.tmp', dir=self.folder)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.savez(f, **self._encode(charData))
+            os.replace(temp, self._file(key))
+        except BaseException:
+            if os.path.exists(temp):
+                os.remove(temp)
+            raise
+        self.evict()
+
+    def size(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.folder):
+            if entry.name.endswith('.npz'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def evict(self):
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        for _, size, file in entries:
+            if total <= self.maxSize:
+                break
+            try:
+                os.remove(file)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, _, file in self._entries():
+            try:
+                os.remove(file)
+            except FileNotFoundError:
+                pass
+
+    def _encode(self, charData):
+        bpaths = charData['bpaths']
+        starts = [(path.startPos().x, path.startPos().y) for path in bpaths]
+        positions = [(ctrl.pos.x, ctrl.pos.y) for path in bpaths for ctrl in path]
+        view = charData['view']
+        return {
+            'starts': np.array(starts, dtype=np.int64).reshape(-1, 2),
+            'counts': np.array([len(path) for path in bpaths], dtype=np.int64),
+            'closes': np.array([path.isClose() for path in bpaths], dtype=np.bool_),
+            'positions': np.array(positions, dtype=np.int64).reshape(-1, 2),
+            'records': view.records(),
+            'shape': np.array(view.shape(), dtype=np.int64),
+            'scale': np.array(charData['scale']),
+            'h': np.array(charData['p_map']['h'], dtype=np.int64),
+            'v': np.array(charData['p_map']['v'], dtype=np.int64),
+        }
+
+    def _decode(self, arrays):
+        positions = arrays['positions'].tolist()
+        bpaths = []
+        end = 0
+        for start, count, close in zip(arrays['starts'].tolist(), arrays['counts'].tolist(), arrays['closes'].tolist()):
+            bp = bs.BezierPath()
+            bp.start(bs.Point(*start))
+            bp.extend([bs.BezierCtrl(bs.Point(*pos)) for pos in positions[end:end+count]])
+            if close:
+                bp.close()
+            bpaths.append(bp)
+            end += count
+
+        height, width = arrays['shape'].tolist()
+        view = StrucView(arrays['records'], width, height)
+        p_map = { 'h': arrays['h'].tolist(), 'v': arrays['v'].tolist() }
+        return {'bpaths': bpaths, 'view': view, 'scale': arrays['scale'].item(), 'p_map': p_map}
+
+class BatchResult(object):
+    def __init__(self, index, file, value=None, error=None):
+        self.index = index
+        self.file = file
+        self.value = value
+        self.error = error
+
+    def __repr__(self):
+        return 'BatchResult({}, {!r}, {})'.format(self.index, self.file, 'failed' if self.error else 'ok')
+
+    def ok(self):
+        return self.error is None
+
+def charDataFiles(source):
+    if isinstance(source, (str, os.PathLike)):
+        source = os.fspath(source)
+        return sorted(os.path.join(source, name) for name in os.listdir(source) if name.endswith('.json'))
+    return list(source)
+
+def charShapes(charData, strokeWidth=None, jointype='Round', captype='Butt'):
+    shapes = []
+    for bpath in charData['bpaths']:
+        shape = bs.BezierShape()
+        if strokeWidth is None:
+            shape.add(bpath)
+        else:
+            for path in bpath.toOutline(strokeWidth, jointype, captype):
+                shape.add(path)
+        shapes.append(shape)
+    return shapes
+
+def processCharFile(file, scale=1, strokeWidth=None, folder=None, attrib={}, jointype='Round', captype='Butt', cache=None):
+    charData = genCharData(loadJson(file), scale, cache, True)
+    shapes = charShapes(charData, strokeWidth, jointype, captype)
+    if folder is None:
+        return shapes
+
+    fileName = os.path.join(folder, os.path.splitext(os.path.basename(file))[0] + '.svg')
+    writeTempGlyphFromShapes(shapes, fileName, _SVG_TAG, attrib)
+    return fileName
+
+def _batchTask(task):
+    index, file, func, kwargs = task
+    try:
+        return BatchResult(index, file, func(file, **kwargs))
+    except Exception:
+        return BatchResult(index, file, error=traceback.format_exc())
+
+def iterBatch(source, func=processCharFile, workers=None, chunksize=1, **kwargs):
+    tasks = [(i, file, func, kwargs) for i, file in enumerate(charDataFiles(source))]
+    if workers == 1 or len(tasks) < 2:
+        for task in tasks:
+            yield _batchTask(task)
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            for result in pool.map(_batchTask, tasks, chunksize=chunksize):
+                yield result
+
+def batchProcess(source, func=processCharFile, workers=None, chunksize=1, **kwargs):
+    return list(iterBatch(source, func, workers, chunksize, **kwargs))
@@ -5,15 +5,152 @@ try:
 except ImportError:
     import xml.etree.ElementTree as ET
 
+import io
+import os
+
+from . import bezierShape as bs
+
 _namespaceList = dict()
 
+SHAPE_TAGS = ('path', 'polyline', 'line', 'circle', 'rect')
+
+XML_NAMESPACE = 'http://www.w3.org/XML/1998/namespace'
+
+def splitName(name):
+    if name[:1] == '{':
+        uri, local = name[1:].split('}', 1)
+        return uri, local
+    return None, name
+
+class NamespaceMap(object):
+    def __init__(self, namespaces=dict(), default=None):
+        self._known = dict()
+        for k, v in namespaces.items():
+            self._known.setdefault(v, []).append(k)
+        for prefixes in self._known.values():
+            prefixes.sort(key=lambda prefix: not prefix)
+        self._reserved = set(namespaces)
+        self._bindings = dict()
+        self._elements = dict()
+        self._attributes = dict()
+        if default is not None:
+            self._bind('', default)
+
+    def _bind(self, prefix, uri):
+        self._bindings[prefix] = uri
+        self._elements.setdefault(uri, prefix)
+        if prefix:
+            self._attributes.setdefault(uri, prefix)
+        return prefix
+
+    def _prefix(self, uri, attribute):
+        prefixes = self._attributes if attribute else self._elements
+        if uri in prefixes:
+            return prefixes[uri]
+        for prefix in self._known.get(uri, []):
+            if (prefix or not attribute) and self._bindings.get(prefix, uri) == uri:
+                return self._bind(prefix, uri)
+        n = 0
+        while 'ns{}'.format(n) in self._reserved or 'ns{}'.format(n) in self._bindings:
+            n += 1
+        return self._bind('ns{}'.format(n), uri)
+
+    def qualify(self, name, attribute=False):
+        uri, local = splitName(name)
+        if uri is None:
+            return local
+        elif uri == XML_NAMESPACE:
+            return 'xml:' + local
+
+        prefix = self._prefix(uri, attribute)
+        return prefix + ':' + local if prefix else local
+
+    def declarations(self):
+        return [('xmlns:' + prefix if prefix else 'xmlns', uri) for prefix, uri in sorted(self._bindings.items())]
+
+def _qualifiedCopy(elem, names):
+    if isinstance(elem.tag, str):
+        copy = ET.Element(names.qualify(elem.tag), { names.qualify(k, True): str(v) for k, v in elem.items() })
+    else:
+        copy = ET.Element(elem.tag, elem.attrib)
+    copy.text = elem.text
+    copy.tail = elem.tail
+    copy.extend(_qualifiedCopy(child, names) for child in elem)
+    return copy
+
+class SvgDocument(object):
+    def __init__(self, tree, namespaces=dict()):
+        self._tree = tree
+        self._namespaces = dict(namespaces)
+
+    def getroot(self):
+        return self._tree.getroot()
+
+    def tree(self):
+        return self._tree
+
+    def namespaces(self):
+        return dict(self._namespaces)
+
+    def prefix(self, name, prefix = ''):
+        return "{%s}%s" % (self._namespaces[prefix], name)
+
+    def unPrefix(self, name, prefix = ''):
+        return name[len(self._namespaces[prefix])+2:]
+
+    def write(self, file, encoding = "utf-8", xml_declaration = True):
+        names = NamespaceMap(self._namespaces)
+        root = _qualifiedCopy(self.getroot(), names)
+        attrib = dict(names.declarations())
+        attrib.update(root.attrib)
+        root.attrib = attrib
+
+        if isinstance(file, io.TextIOBase):
+            encoding = 'unicode'
+        ET.ElementTree(root).write(file, encoding, xml_declaration)
+
+class SvgTree(ET.ElementTree):
+    def __init__(self, document):
+        ET.ElementTree.__init__(self, document.getroot())
+        self._document = document
+
+    def namespaces(self):
+        return self._document.namespaces()
+
+    def write(self, file, encoding = "utf-8", xml_declaration = True):
+        SvgDocument(self, self.namespaces()).write(file, encoding, xml_declaration)
+
+def parseDocument(path):
+    namespaces = dict()
+    context = ET.iterparse(path, events=['start-ns'])
+    for _, node in context:
+        namespaces[node[0]] = node[1]
+
+    return SvgDocument(ET.ElementTree(context.root), namespaces)
+
 def parse(path):
     global _namespaceList
-    _namespaceList = dict([node for _, node in ET.iterparse(path, events=['start-ns'])])
-    for k, v in _namespaceList.items():
-        ET.register_namespace(k, v)
+    document = parseDocument(path)
+    _namespaceList = document.namespaces()
     
-    return ET.parse(path)
+    return SvgTree(document)
+
+def localName(name):
+    return name.rpartition('}')[2]
+
+def iterShapes(path, tags=SHAPE_TAGS):
+    parents = []
+    for event, node in ET.iterparse(path, events=['start', 'end']):
+        if event == 'start':
+            parents.append(node)
+        else:
+            parents.pop()
+            tag = localName(node.tag)
+            if tag in tags:
+                yield node, bs.createPathfromSvgElem(node, tag)
+                node.clear()
+                if parents:
+                    del parents[-1][:]
 
 def unPrefix(name, prefix = ''):
     global _namespaceList
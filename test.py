@@ -2,8 +2,13 @@
 
 from clsvg import svgfile
 from clsvg import bezierShape
+from clsvg import fasing
 
+import gzip
+import io
+import json
 import os
+import pathlib
 FILE_PATH = os.path.dirname(os.path.realpath(__file__))
 TEST_FOLDER = os.path.join(FILE_PATH, 'testFile')
 TEST_OVER_FOLDER = os.path.join(FILE_PATH, 'testFile/over/')
@@ -31,9 +36,230 @@ def testShapeToPath():
             elem.set('class', 'st0')
             newRoot.append(elem)
 
-    newTree = svgfile.ET.ElementTree(newRoot)
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
     newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
 
+def testShapeTransform():
+    targetFile = 'shape_transform.svg'
+
+    tree = svgfile.parse(os.path.join(TEST_FOLDER, 'shape_to_path.svg'))
+    root = tree.getroot()
+
+    newRoot = svgfile.ET.Element(root.tag, root.attrib)
+    newRoot.text = '\n'
+    styleElem = svgfile.ET.Element('style', { 'type': 'text/css' })
+    styleElem.text = MAIN_PATH_STYLE + ' .st1{fill:none;stroke:#ff0000;stroke-width:4;} .st2{fill:none;stroke:#0000ff;stroke-width:1;}'
+    styleElem.tail = '\n'
+    newRoot.append(styleElem)
+
+    shape = bezierShape.BezierShape()
+    for child in root:
+        tag = svgfile.unPrefix(child.tag)
+        if tag != 'style':
+            shape.extend(bezierShape.createPathfromSvgElem(child, tag))
+    center = shape.boundingBox().center()
+    transform = bezierShape.Transform.rotation(.3, center).compose(bezierShape.Transform.mirroring(center, center + bezierShape.Point(0, 1))).compose(bezierShape.Transform.scaling(.8, center))
+
+    newRoot.append(shape.toSvgElement({ 'class': 'st0' }))
+    newRoot.append(shape.transformed(transform).toSvgElement({ 'class': 'st1' }))
+    newRoot.append(shape.toSvgElement({ 'class': 'st2', 'transform': transform.toSvgValue() }))
+
+    transformed = shape.transformed(transform)
+    rect = shape.boundingBox()
+    points = [bezierShape.Point(rect.left + x * 10, rect.bottom + y * 10) for x in range(int(rect.width / 10)) for y in range(int(rect.height / 10))]
+    tPoints = transform.apply([(p.x, p.y) for p in points])
+    for path, tPath in zip(shape, transformed):
+        assert (tPath.containsPoints(tPoints) == path.containsPoints(points)).all()
+        assert (path.containsPoints(tPoints, transform=transform) == path.containsPoints(points)).all()
+        vertices = []
+        for i, ctrl in enumerate(path):
+            pos = path.posIn(i)
+            vertices.extend((p.x, p.y) for p in (pos + ctrl.p1, pos + ctrl.p2, pos + ctrl.pos))
+        tVertices = []
+        for i, ctrl in enumerate(tPath):
+            pos = tPath.posIn(i)
+            tVertices.extend((p.x, p.y) for p in (pos + ctrl.p1, pos + ctrl.p2, pos + ctrl.pos))
+            y = pos.y + ctrl.pos.y / 2
+            roots = tPath[i].roots(y=y, pos=pos)
+            tRoots = path[i].roots(y=y, pos=path.posIn(i), transform=transform)
+            assert len(roots) == len(tRoots) and all(abs(a - b) < 1e-6 for a, b in zip(roots, tRoots))
+        assert abs(transform.apply(vertices) - tVertices).max() < 1e-9
+        start = tPath.startPos()
+        assert abs(transform.apply([(path.startPos().x, path.startPos().y)]) - (start.x, start.y)).max() < 1e-9
+
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
+    newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
+
+def testPathData():
+    targetFile = 'path_data.svg'
+
+    tree = svgfile.parse(os.path.join(TEST_FOLDER, targetFile))
+    root = tree.getroot()
+
+    newRoot = svgfile.ET.Element(root.tag, root.attrib)
+    newRoot.text = '\n'
+    styleElem = svgfile.ET.Element('style', { 'type': 'text/css' })
+    styleElem.text = MAIN_PATH_STYLE
+    styleElem.tail = '\n'
+    newRoot.append(styleElem)
+
+    for child in root:
+        tag = svgfile.unPrefix(child.tag)
+        if tag != 'style':
+            shape = bezierShape.createPathfromSvgElem(child, tag)
+            newRoot.append(shape.toSvgElement({ 'class': 'st0' }))
+            for path in shape:
+                pos = path.startPos()
+                newRoot.append(svgfile.createCircleElem(pos, 4, {'fill': 'red'}))
+                for ctrl in path:
+                    pos += ctrl.pos
+                    newRoot.append(svgfile.createCircleElem(pos, 4, {'fill': 'red'}))
+
+    for d in ('M0 0 L', 'M0 0 L C1 1 2 2 3 3', 'M0 0 C1 1 2 2', 'M0 0 L1 1 2'):
+        try:
+            bezierShape.createPathfromSvgElem(svgfile.ET.Element('path', { 'd': d }), 'path')
+        except ValueError:
+            pass
+        else:
+            raise Exception('Malformed path data accepted: {}'.format(d))
+
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
+    newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
+
+def testGlyphSprite():
+    targetFile = 'shape_to_path.svg'
+
+    document = svgfile.parseDocument(os.path.join(TEST_FOLDER, targetFile))
+    root = document.getroot()
+    glyphAttrib = { 'viewBox': root.get('viewBox') }
+
+    glyphs = (('glyph{}'.format(i), [shape]) for i, (_, shape) in enumerate(svgfile.iterShapes(os.path.join(TEST_FOLDER, targetFile))))
+    fasing.writeGlyphSprite(glyphs, os.path.join(TEST_OVER_FOLDER, 'glyph_sprite.svgz'), root.attrib, root.tag, MAIN_PATH_STYLE, glyphAttrib, document.namespaces())
+
+    with gzip.open(os.path.join(TEST_OVER_FOLDER, 'glyph_sprite.svgz')) as f:
+        glyphs = (('glyph{}'.format(i), [shape]) for i, (_, shape) in enumerate(svgfile.iterShapes(f)))
+        fasing.writeGlyphSprite(glyphs, pathlib.Path(TEST_OVER_FOLDER, 'glyph_sprite.svg'), root.attrib, root.tag, MAIN_PATH_STYLE, glyphAttrib, document.namespaces())
+
+    stream = io.StringIO()
+    glyphs = (('glyph{}'.format(i), [shape]) for i, (_, shape) in enumerate(svgfile.iterShapes(os.path.join(TEST_OVER_FOLDER, 'glyph_sprite.svg'))))
+    fasing.writeGlyphSprite(glyphs, stream, root.attrib, root.tag, MAIN_PATH_STYLE, glyphAttrib, document.namespaces())
+    with open(os.path.join(TEST_OVER_FOLDER, 'glyph_sprite.svg'), encoding='utf-8') as f:
+        assert stream.getvalue() == f.read()
+
+    elem = svgfile.ET.Element('{http://example.com/a}item', { '{http://example.com/a}key': 'value' })
+    for prefix in ('first', 'second'):
+        stream = io.BytesIO()
+        svgfile.SvgDocument(svgfile.ET.ElementTree(elem), { prefix: 'http://example.com/a' }).write(stream)
+        assert '<{0}:item xmlns:{0}="http://example.com/a" {0}:key="value" />'.format(prefix) in stream.getvalue().decode()
+
+def testSvgDocument():
+    def sameTree(a, b):
+        return a.tag == b.tag and a.attrib == b.attrib and (a.text or '') == (b.text or '') and len(a) == len(b) and all(sameTree(x, y) for x, y in zip(a, b))
+
+    A = 'http://example.com/a'
+    B = 'http://example.com/b'
+    C = 'http://example.com/c'
+    root = svgfile.ET.Element('{%s}root' % A, { '{%s}key' % A: 'a', 'plain': '"<&>"', '{%s}key' % C: 'c' })
+    svgfile.ET.SubElement(root, '{%s}item' % B, { '{%s}key' % B: 'b' }).text = 'text & more'
+    svgfile.ET.SubElement(root, '{%s}item' % C)
+    document = svgfile.SvgDocument(svgfile.ET.ElementTree(root), { '': A, 'ns0': B })
+
+    stream = io.BytesIO()
+    document.write(stream)
+    text = stream.getvalue().decode()
+    assert 'xmlns="http://example.com/a"' in text and 'xmlns:ns0="http://example.com/b"' in text
+    assert sameTree(svgfile.ET.fromstring(stream.getvalue()), root)
+
+    stream = io.StringIO()
+    document.write(stream, encoding='unicode')
+    assert sameTree(svgfile.ET.fromstring(stream.getvalue()), root)
+    document.write(os.path.join(TEST_OVER_FOLDER, 'document.xml'), encoding='unicode')
+    assert sameTree(svgfile.ET.parse(os.path.join(TEST_OVER_FOLDER, 'document.xml')).getroot(), root)
+
+    tree = svgfile.parse(os.path.join(TEST_FOLDER, 'shape_to_path.svg'))
+    stream = io.BytesIO()
+    svgfile.ET.ElementTree(svgfile.ET.Element(tree.getroot().tag)).write(stream)
+    assert stream.getvalue().startswith(b'<ns0:svg ')
+    stream = io.BytesIO()
+    tree.write(stream)
+    assert stream.getvalue().startswith(b"<?xml version='1.0' encoding='utf-8'?>\n<svg ")
+    assert sameTree(svgfile.ET.fromstring(stream.getvalue()), tree.getroot())
+
+def testBatchProcess():
+    folder = os.path.join(TEST_OVER_FOLDER, 'batch')
+    if not os.path.exists(folder):
+        os.mkdir(folder)
+
+    strokes = [
+        [[[100, 200], [800, 200]], [[450, 100], [450, 900]]],
+        [[[200, 100], [200, 800], [800, 800]], [[100, 450], [900, 450]]],
+        [[[100, 100], [900, 100], [900, 900], [100, 900], [100, 100]]],
+    ]
+    for i, paths in enumerate(strokes):
+        data = {
+            'info': { 'scale': 1 },
+            'comb': { 'key_paths': [{ 'points': [{ 'p_type': 'Line', 'point': p } for p in points] } for points in paths] }
+        }
+        with open(os.path.join(folder, 'char{}.json'.format(i)), 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+    with open(os.path.join(folder, 'char3.json'), 'w', encoding='utf-8') as f:
+        f.write('{}')
+
+    database = { os.path.splitext(name)[0]: fasing.loadJson(os.path.join(folder, name)) for name in sorted(os.listdir(folder)) if name.endswith('.json') }
+    with open(os.path.join(folder, 'database.db'), 'w', encoding='utf-8') as f:
+        json.dump(database, f, indent=1)
+    with fasing.IndexedJson(os.path.join(folder, 'database.db')) as chars:
+        assert list(chars) == list(database)
+        assert chars['char1'] == database['char1']
+        assert dict(chars.items()) == database
+
+    with open(os.path.join(folder, 'values.db'), 'w', encoding='utf-8') as f:
+        json.dump({ 'a': 'hello', 'b': { 'c': 'd' }, 'e': ['f', 'g'] }, f)
+    with fasing.IndexedJson(os.path.join(folder, 'values.db')) as values:
+        assert list(values) == ['a', 'b', 'e']
+        assert values['a'] == 'hello'
+        assert values.get('b') == { 'c': 'd' }
+
+    cache = fasing.CharDataCache(os.path.join(folder, 'cache'))
+    cache.clear()
+    for i in range(2):
+        results = fasing.batchProcess(pathlib.Path(folder), workers=2, scale=1, strokeWidth=36, folder=folder, attrib={ 'viewBox': '0 0 1000 1000' }, cache=cache)
+        assert [os.path.basename(r.file) for r in results] == ['char0.json', 'char1.json', 'char2.json', 'char3.json']
+        assert [r.ok() for r in results] == [True, True, True, False]
+    assert len(os.listdir(os.path.join(folder, 'cache'))) == 3
+
+    data = fasing.loadJson(os.path.join(folder, 'char0.json'))
+    legacy = fasing.genCharData(data, 1)['view']
+    view = fasing.genCharData(data, 1, compact=True)['view']
+    assert isinstance(legacy, list) and legacy == view.toList()
+    assert fasing.genCharData(data, 1, cache)['view'] == legacy
+    assert all(isinstance(item['indexes'], list) for row in legacy for cell in row for item in cell)
+    assert view.records()['path'].dtype == 'int32'
+    y, x = next((y, x) for y in range(len(view)) for x in range(len(view[y])) if view[y][x])
+    assert [dict(item) for item in view[y][x]] == [dict(item, indexes=tuple(item['indexes'])) for item in view.toList()[y][x]]
+    for write in (lambda cell: cell[0].update(symbol='v'), lambda cell: cell.append({}), lambda cell: cell[0]['indexes'].append(0)):
+        try:
+            write(view[y][x])
+        except (TypeError, AttributeError):
+            pass
+        else:
+            raise Exception('StrucView cell is writable')
+
+    key = cache.key(data, 1)
+    for content in (b'PK\x03\x04garbage', open(cache._file(key), 'rb').read()[:200]):
+        with open(cache._file(key), 'wb') as f:
+            f.write(content)
+        assert cache.get(key) is None
+        assert not os.path.exists(cache._file(key))
+        fasing.genCharData(data, 1, cache)
+        assert cache.get(key) is not None
+
+    os.remove(cache._file(key))
+    os.mkdir(cache._file(key))
+    assert cache.get(key) is None
+    assert os.path.isdir(cache._file(key))
+    os.rmdir(cache._file(key))
+
 def testCasteljau():
     targetFile = 'casteljau.svg'
     
@@ -73,7 +299,7 @@ def testCasteljau():
                     newRoot.append(svgfile.createCircleElem(ctrlPosList['n1'], 4, {'fill': 'green'}))
                     pos += bCtrl.pos
 
-    newTree = svgfile.ET.ElementTree(newRoot)
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
     newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
 
 def testSimplified():
@@ -104,7 +330,7 @@ def testSimplified():
                         newRoot.append(svgfile.createLineElem(startPos, endPos, { 'stroke-width': '4', 'stroke': "rgb(255,150,150)" }))
                         startPos = endPos
 
-    newTree = svgfile.ET.ElementTree(newRoot)
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
     newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
 
 def testSplitting():
@@ -135,7 +361,7 @@ def testSplitting():
             pathElem.set('class', 'st0')
             newRoot.append(pathElem)
 
-    newTree = svgfile.ET.ElementTree(newRoot)
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
     newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
 
 def testTangentsAndNormals():
@@ -171,7 +397,126 @@ def testTangentsAndNormals():
                         t += .2
                     startPos += bCtrl.pos
 
-    newTree = svgfile.ET.ElementTree(newRoot)
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
+    newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
+
+def testArrayPath():
+    targetFile = 'tangents_and_normals.svg'
+
+    tree = svgfile.parse(os.path.join(TEST_FOLDER, targetFile))
+    root = tree.getroot()
+
+    newRoot = svgfile.ET.Element(root.tag, root.attrib)
+    newRoot.text = '\n'
+    styleElem = svgfile.ET.Element('style', { 'type': 'text/css' })
+    styleElem.text = '.st0{fill:none;stroke:#aaaaaa;stroke-width:1;}'
+    styleElem.tail = '\n'
+    newRoot.append(styleElem)
+
+    ts = [0, .2, .4, .6, .8, 1]
+    for child in root:
+        tag = svgfile.unPrefix(child.tag)
+        if tag != 'style':
+            path = bezierShape.createPathfromSvgElem(child, tag)
+            pathElem = path.toSvgElement()
+            pathElem.set('class', 'st0')
+            newRoot.append(pathElem)
+            for bPath in path:
+                array = bPath.toArray()
+                values = array.valueAt(ts)
+                tangents = values + array.tangents(ts, length=24)
+                normals = values + array.normals(ts, length=24)
+                assert not array.ctrls.flags.writeable and (bPath.toArray().ctrls == array.ctrls).all()
+                assert (bPath.transformed(bezierShape.Transform.scaling(2)).toArray().ctrls == array.ctrls * 2).all()
+                for i in range(len(array)):
+                    for j in range(len(ts)):
+                        p = bezierShape.Point(*values[i, j])
+                        newRoot.append(svgfile.createLineElem(p, bezierShape.Point(*tangents[i, j]), { 'stroke-width': '2', 'stroke': "blue" }))
+                        newRoot.append(svgfile.createLineElem(p, bezierShape.Point(*normals[i, j]), { 'stroke-width': '2', 'stroke': "green" }))
+                        newRoot.append(svgfile.createCircleElem(p, 4, {'fill': 'red'}))
+
+                end = bPath.endPos()
+                copyPath = bPath.clone()
+                copyPath[-1].pos = copyPath[-1].pos + bezierShape.Point(5, 5)
+                assert copyPath.endPos().distance(end + bezierShape.Point(5, 5)) < 1e-9
+                move = copyPath[0].pos
+                copyPath[0].scale(bezierShape.Point(2, 2))
+                assert copyPath.endPos().distance(end + bezierShape.Point(5, 5) + move) < 1e-9
+                assert (copyPath.vertices()[-1] == (copyPath.endPos().x, copyPath.endPos().y)).all()
+                assert bPath.endPos() == end
+
+                cache = bPath._vertexCache
+                copyPath[0].p1 = bezierShape.Point(1, 1)
+                bezierShape.BezierCtrl(bezierShape.Point(1, 1)).pos = bezierShape.Point(2, 2)
+                assert bPath._vertexCache is cache
+
+                joined = bezierShape.BezierPath()
+                joined.start(bPath.endPos())
+                joined.connectPath(copyPath)
+                copyPath[-1].pos = copyPath[-1].pos + bezierShape.Point(1, 1)
+                assert copyPath.endPos().distance(end + bezierShape.Point(6, 6) + move) < 1e-9
+                assert joined.endPos().distance(end + copyPath.endPos() - copyPath.startPos()) < 1e-9
+
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
+    newTree.write(os.path.join(TEST_OVER_FOLDER, 'array_path.svg'), encoding = "utf-8", xml_declaration = True)
+
+def testShapeUnion():
+    targetFile = 'shape_union.svg'
+
+    tree = svgfile.parse(os.path.join(TEST_FOLDER, targetFile))
+    root = tree.getroot()
+
+    newRoot = svgfile.ET.Element(root.tag, root.attrib)
+    newRoot.text = '\n'
+    styleElem = svgfile.ET.Element('style', { 'type': 'text/css' })
+    styleElem.text = '.st0{fill:none;stroke:#aaaaaa;stroke-width:1;} .st1{fill:#ff000055;stroke:#ff0000;stroke-width:2;}'
+    styleElem.tail = '\n'
+    newRoot.append(styleElem)
+
+    shape = bezierShape.BezierShape()
+    for child in root:
+        tag = svgfile.unPrefix(child.tag)
+        if tag != 'style':
+            path = bezierShape.createPathfromSvgElem(child, tag)
+            newRoot.append(path.toSvgElement({ 'class': 'st0' }))
+            shape.extend(path)
+
+    pathData = shape.toPathData()
+    union = shape.union()
+    newRoot.append(union.toSvgElement({ 'class': 'st1' }))
+    rect = shape.boundingBox()
+    points = [bezierShape.Point(rect.left + x * 10, rect.bottom + y * 10) for x in range(int(rect.width / 10)) for y in range(int(rect.height / 10))]
+    points = [p for p, d in zip(points, zip(*[path.distances(points) for path in shape])) if min(d) > 1]
+    before = sum(path.windingNumbers(points, .1) for path in shape) != 0
+    after = sum(path.windingNumbers(points, .1) for path in union) != 0
+    for path in shape:
+        assert [path.windingNumber(p) != 0 for p in points[::40]] == path.containsPoints(points[::40], fillRule='nonzero').tolist()
+    assert (before == after).all()
+    for path in union:
+        assert path.isClose()
+        line = path.polyline()
+        x, y, dx, dy = line[:-1, 0], line[:-1, 1], line[1:, 0] - line[:-1, 0], line[1:, 1] - line[:-1, 1]
+        assert abs((x * dy - y * dx).sum()) / 2 > ((dx**2 + dy**2)**.5).sum()
+    union.transform(bezierShape.Point(2, 2), bezierShape.Point(10, 10))
+    for path in shape.clone():
+        path[0].scale(bezierShape.Point(2, 2))
+        path[-1].pos = path[-1].pos + bezierShape.Point(5, 5)
+    assert shape.toPathData() == pathData
+
+    for d, count, area in (
+        ('M0 0h100v100h-100z M0 0h100v100h-100z', 1, 10000),
+        ('M0 0h100v100h-100z M100 0h100v100h-100z', 1, 20000),
+        ('M0 0h100v100h-100z M100 0v100h100v-100z', 1, 20000),
+        ('M0 0h100v100h-100z M20 20h50v50h-50z', 1, 10000),
+        ('M0 0h100v100h-100z M0 0h50v50h-50z', 1, 10000),
+        ('M0 0h100v100h-100z M100 50h100v100h-100z', 1, 20000),
+        ('M0 0h100v100h-100z M0 0v100h100v-100z', 0, 0)):
+        coincident = bezierShape.createPathfromSvgElem(svgfile.ET.Element('path', { 'd': d }), 'path').union()
+        assert len(coincident) == count
+        lines = [path.polyline() for path in coincident]
+        assert abs(sum((line[:-1, 0] * line[1:, 1] - line[1:, 0] * line[:-1, 1]).sum() / 2 for line in lines) - area) < 1
+
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
     newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
 
 def testExtermesFinding():
@@ -217,7 +562,7 @@ def testExtermesFinding():
 
                     startPos += bCtrl.pos
 
-    newTree = svgfile.ET.ElementTree(newRoot)
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
     newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
 
 def testBoundingBox():
@@ -241,7 +586,7 @@ def testBoundingBox():
             rect = path.boundingBox()
             newRoot.append(svgfile.createRectElem(rect, { 'fill': 'none', 'stroke-width': '1', 'stroke': "grey" }))
 
-    newTree = svgfile.ET.ElementTree(newRoot)
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
     newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
 
 def testPathToOutline():
@@ -270,7 +615,7 @@ def testPathToOutline():
                     newShape.add(path)
                 newRoot.append(newShape.toSvgElement({ 'class': 'st1' }))
 
-    newTree = svgfile.ET.ElementTree(newRoot)
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
     newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
 
 def testCurveAndLineIntersections():
@@ -315,7 +660,7 @@ def testCurveAndLineIntersections():
                             newRoot.append(svgfile.createCircleElem(ctrl.valueAt(t, startP), 4, {'fill': 'red'}))
                     startP += ctrl.pos
 
-    newTree = svgfile.ET.ElementTree(newRoot)
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
     newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
 
 def testPathIntersections():
@@ -350,8 +695,16 @@ def testPathIntersections():
                         newRoot.append(svgfile.createCircleElem(ctl2.valueAt(t, pos2), 4, {'fill': 'green'}))
                     pos2 += ctl2.pos
                 pos1 += ctl1.pos
+    assert len(newRoot.findall('circle')) == 18
+
+    curve = [bezierShape.Point(0, 0), bezierShape.Point(30, 100), bezierShape.Point(70, -100), bezierShape.Point(100, 0)]
+    for radian in (2e-5, 5e-6):
+        pairs, overlaps = bezierShape.clipBezier3Bezier3(*curve, *[p.rotate(radian, bezierShape.Point(50, 0)) for p in curve])
+        assert not overlaps and len(pairs) <= 3
+        assert any(abs(s - .5) < 1e-3 and abs(u - .5) < 1e-3 for s, u in pairs)
+    assert len(bezierShape.clipBezier3Bezier3(*curve, *[p.rotate(3e-5, bezierShape.Point(50, 0)) for p in curve])[0]) == 1
 
-    newTree = svgfile.ET.ElementTree(newRoot)
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
     newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
 
 def testRadianSegmentation():
@@ -377,7 +730,7 @@ def testRadianSegmentation():
 
             newRoot.append(shape.toSvgElement({ 'class': 'st0' }))
 
-    newTree = svgfile.ET.ElementTree(newRoot)
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
     newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
 
 def test():
@@ -404,7 +757,7 @@ def test():
 
     newRoot.append(g.toShape().toSvgElement({ 'class': 'st1' }))
 
-    newTree = svgfile.ET.ElementTree(newRoot)
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
     newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
 
 def testTowPointCurve():
@@ -455,7 +808,7 @@ def testTowPointCurve():
                 newRoot.append(shape.toSvgElement({ 'class': 'st0' }))
                 distance = -distance
 
-    newTree = svgfile.ET.ElementTree(newRoot)
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
     newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
 
 def testTowLineOnePointCurve():
@@ -507,7 +860,7 @@ def testTowLineOnePointCurve():
                 newRoot.append(shape.toSvgElement({ 'class': 'st0' }))
                 distance = -distance
 
-    newTree = svgfile.ET.ElementTree(newRoot)
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
     newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
 
 def testArcLength():
@@ -544,11 +897,16 @@ def testArcLength():
                             t = bCtrl.inDistance(z)
                             dir = -1
                             color = 'red'
+                        for offset in (1, .1):
+                            assert abs(bCtrl.lengthAt(bCtrl.inDistance(z, offset)) - bCtrl.lengthAt(1) * min(z, 1)) < offset
+                        t = bCtrl.inDistance(z, .1, [.25, .75])
+                        assert .25 <= t <= .75
+                        assert abs(bCtrl.lengthAt(t) - min(max(bCtrl.lengthAt(1) * min(z, 1), bCtrl.lengthAt(.25)), bCtrl.lengthAt(.75))) < .1
                         
                         z += .1
                     startPos += bCtrl.pos
 
-    newTree = svgfile.ET.ElementTree(newRoot)
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
     newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
 
 def testControlComp():
@@ -595,7 +953,7 @@ def testControlComp():
                     shape.add(newPath)
                     newRoot.append(shape.toSvgElement({ 'class': 'st0' }))
 
-    newTree = svgfile.ET.ElementTree(newRoot)
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
     newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
 
 def testThreePointCurve():
@@ -628,7 +986,7 @@ def testThreePointCurve():
                 shape.add(newPath)
                 newRoot.append(shape.toSvgElement({ 'class': 'st0' }))
 
-    newTree = svgfile.ET.ElementTree(newRoot)
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
     newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
 
 def testPointTangentCurve():
@@ -664,7 +1022,7 @@ def testPointTangentCurve():
                 shape.add(newPath)
                 newRoot.append(shape.toSvgElement({ 'class': 'st0' }))
 
-    newTree = svgfile.ET.ElementTree(newRoot)
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
     newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
 
 def testPointAndTangent():
@@ -719,7 +1077,7 @@ def testPointAndTangent():
         newRoot.append(shape.toSvgElement({ 'class': 'st0' }))
         newRoot.append(svgfile.createCircleElem(p+startP[i], 4, {'fill': 'red'}))
 
-    newTree = svgfile.ET.ElementTree(newRoot)
+    newTree = svgfile.SvgDocument(svgfile.ET.ElementTree(newRoot), tree.namespaces())
     newTree.write(os.path.join(TEST_OVER_FOLDER, targetFile), encoding = "utf-8", xml_declaration = True)
 
 if __name__ == '__main__':
@@ -727,7 +1085,7 @@ if __name__ == '__main__':
         os.mkdir(TEST_OVER_FOLDER)
 
     # test()
-    # testPathToOutline()
+    testPathToOutline()
 
     testBoundingBox()
     testCasteljau()
@@ -736,8 +1094,15 @@ if __name__ == '__main__':
     testPathIntersections()
     testSimplified()
     testShapeToPath()
+    testGlyphSprite()
+    testSvgDocument()
+    testBatchProcess()
+    testPathData()
+    testShapeTransform()
     testSplitting()
     testTangentsAndNormals()
+    testArrayPath()
+    testShapeUnion()
     testRadianSegmentation()
     testTowPointCurve()
     testTowLineOnePointCurve()